@@ -0,0 +1,50 @@
+"""Compare loading a binary snapshot against re-parsing the JSON text.
+
+Usage: python benchmarks/bench_binary.py [--scale N ...]
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.lexer import lex
+from src.parser import Parser
+from src.binary import dump_binary, load_binary
+
+ROOT = os.path.join(os.path.dirname(__file__), '..')
+
+def best_of(func, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+def corpus(scale):
+    with open(os.path.join(ROOT, '128KB.json'), encoding='utf-8') as f:
+        records = json.load(f)
+    return json.dumps(records * scale, indent=2)
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    arg_parser.add_argument('--scale', type=int, nargs='+', default=[1, 4, 16],
+                            help='How many copies of 128KB.json records to load')
+    arg_parser.add_argument('--repeat', type=int, default=3)
+    args = arg_parser.parse_args()
+
+    print(f"{'input':>10} {'snapshot':>10} {'reparse':>10} {'load':>10} {'load+eval':>10}")
+    for scale in args.scale:
+        text = corpus(scale)
+        snapshot = dump_binary(Parser(lex(text)).parse())
+        reparse = best_of(lambda: Parser(lex(text)).parse().evaluate(), args.repeat)
+        load = best_of(lambda: load_binary(snapshot), args.repeat)
+        load_eval = best_of(lambda: load_binary(snapshot).evaluate(), args.repeat)
+        print(f"{len(text) // 1024:>8}KB {len(snapshot) // 1024:>8}KB "
+              f"{reparse * 1000:>8.1f}ms {load * 1000:>8.3f}ms {load_eval * 1000:>8.1f}ms")
+
+if __name__ == '__main__':
+    main()
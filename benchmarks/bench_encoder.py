@@ -0,0 +1,53 @@
+"""Encoding throughput of src.encoder against stdlib json.
+
+Usage: python benchmarks/bench_encoder.py [--size 1MB] [--repeat 7] [--profile NAME ...]
+
+For each workload profile this times encoding the evaluated Python value
+and the AST (no evaluate step) with src.encoder.dumps, plus json.dumps on
+the value with the C accelerator and with the pure-Python encoder.
+"""
+import argparse
+import json
+import json.encoder
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from benchmarks.corpus import build, parse_size
+from benchmarks.suite import summarize, time_call
+from src.encoder import dumps
+from src.lexer import lex
+from src.parser import Parser
+
+def _pure_python_dumps(value):
+    encoder = json.encoder.JSONEncoder()
+    return ''.join(encoder.iterencode(value, _one_shot=False))
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    arg_parser.add_argument('--size', default='1MB')
+    arg_parser.add_argument('--repeat', type=int, default=7)
+    arg_parser.add_argument('--profile', action='append', choices=['128KB.json', 'records', 'numbers', 'strings', 'wide'])
+    args = arg_parser.parse_args()
+
+    print(f"{'corpus':<12}{'encoder':<22}{'median ms':>11}{'MB/s':>9}")
+    for name in args.profile or ['128KB.json', 'records', 'numbers', 'strings', 'wide']:
+        text = build(name, parse_size(args.size))
+        root = Parser(lex(text)).parse()
+        value = root.evaluate()
+        size = len(json.dumps(value).encode('utf-8'))
+        runs = {
+            'src.encoder (value)': (dumps, value),
+            'src.encoder (AST)': (dumps, root),
+            'json.dumps (C)': (json.dumps, value),
+            'json.dumps (Python)': (_pure_python_dumps, value),
+        }
+        for label, (func, arg) in runs.items():
+            output, samples = time_call(func, arg, warmup=1, repeat=args.repeat)
+            assert output == json.dumps(value), label
+            stats = summarize(samples, size)
+            print(f"{name:<12}{label:<22}{stats['median'] * 1000:>11.2f}{stats['mb_per_s']:>9.2f}")
+
+if __name__ == '__main__':
+    main()
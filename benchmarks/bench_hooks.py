@@ -0,0 +1,79 @@
+"""Decoding hooks applied inline by Parser.decode() against a second pass.
+
+Usage: python benchmarks/bench_hooks.py [--corpus 128KB.json] [--size 1MB] [--repeat 7]
+
+The two-pass path is what callers did before decode(): parse, evaluate,
+then walk the result applying object_hook and converting floats. All
+paths start from the same token list; json.loads with the same hooks is
+shown for reference.
+"""
+import argparse
+import json
+import os
+import sys
+from decimal import Decimal
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from benchmarks.corpus import CORPORA, build, parse_size
+from benchmarks.suite import summarize, time_call
+from src.lexer import lex
+from src.parser import Parser
+
+def _object_hook(pairs):
+    return SimpleNamespace(**pairs)
+
+def _apply_hooks(value):
+    # Iterative post-order walk, so containers are converted after their children
+    stack = [(value, None, None)]
+    result = []
+    while stack:
+        node, parent, key = stack.pop()
+        if isinstance(node, dict):
+            for child_key, child in node.items():
+                stack.append((child, node, child_key))
+            result.append((node, parent, key))
+        elif isinstance(node, list):
+            for index, child in enumerate(node):
+                stack.append((child, node, index))
+            result.append((node, parent, key))
+        elif isinstance(node, float) and parent is not None:
+            parent[key] = Decimal(repr(node))
+    converted = value
+    for node, parent, key in reversed(result):
+        if isinstance(node, dict):
+            hooked = _object_hook(node)
+            if parent is None:
+                converted = hooked
+            else:
+                parent[key] = hooked
+    return converted
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    arg_parser.add_argument('--corpus', default='128KB.json', choices=['128KB.json'] + CORPORA)
+    arg_parser.add_argument('--size', default='1MB', help='Size of synthetic corpora')
+    arg_parser.add_argument('--repeat', type=int, default=7)
+    args = arg_parser.parse_args()
+
+    text = build(args.corpus, parse_size(args.size))
+    size = len(text.encode('utf-8'))
+    tokens = lex(text)
+    runs = {
+        'parse + evaluate': lambda t: Parser(t).parse().evaluate(),
+        'decode': lambda t: Parser(t).decode(),
+        'two-pass hooks': lambda t: _apply_hooks(Parser(t).parse().evaluate()),
+        'decode hooks': lambda t: Parser(t, object_hook=_object_hook, parse_float=Decimal).decode(),
+    }
+    print(f"{'path':<24}{'median ms':>11}{'MB/s':>9}")
+    for label, func in runs.items():
+        _, samples = time_call(func, tokens, warmup=1, repeat=args.repeat)
+        stats = summarize(samples, size)
+        print(f"{label:<24}{stats['median'] * 1000:>11.2f}{stats['mb_per_s']:>9.2f}")
+    _, samples = time_call(lambda t: json.loads(t, object_hook=_object_hook, parse_float=Decimal), text, 1, args.repeat)
+    stats = summarize(samples, size)
+    print(f"{'json.loads hooks':<24}{stats['median'] * 1000:>11.2f}{stats['mb_per_s']:>9.2f}")
+
+if __name__ == '__main__':
+    main()
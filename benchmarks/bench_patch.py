@@ -0,0 +1,75 @@
+"""Small JSON Patch updates to a cached document, in place against re-evaluating.
+
+Usage: python benchmarks/bench_patch.py [--corpus 128KB.json] [--size 1MB] [--repeat 7]
+
+The re-evaluate path is what callers did before src.patch: evaluate()
+the whole tree, then change the resulting dicts. The in-place path
+applies the same patch to the AST and refreshes evaluate_cached(),
+which rebuilds only the containers along the touched paths.
+"""
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from benchmarks.corpus import CORPORA, build, parse_size
+from benchmarks.suite import summarize, time_call
+from src.lexer import lex
+from src.parser import Parser
+from src.patch import apply_patch, parse_pointer
+
+def _patch(root):
+    # Idempotent, so every timed run does the same work
+    count = len(root.elements) if hasattr(root, 'elements') else 1
+    return [
+        {'op': 'replace', 'path': f'/{count // 2}', 'value': {'updated': True}},
+        {'op': 'add', 'path': f'/{count // 3}', 'value': 'inserted'},
+        {'op': 'remove', 'path': f'/{count // 3}'},
+    ] if count > 1 else [{'op': 'add', 'path': '/patched', 'value': True}]
+
+def _apply_to_value(value, patch):
+    for operation in patch:
+        *parents, key = parse_pointer(operation['path'])
+        for token in parents:
+            value = value[int(token) if isinstance(value, list) else token]
+        if isinstance(value, list):
+            key = int(key)
+        if operation['op'] == 'remove':
+            del value[key]
+        elif operation['op'] == 'add' and isinstance(value, list):
+            value.insert(key, operation['value'])
+        else:
+            value[key] = operation['value']
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    arg_parser.add_argument('--corpus', default='128KB.json', choices=['128KB.json'] + CORPORA)
+    arg_parser.add_argument('--size', default='1MB', help='Size of synthetic corpora')
+    arg_parser.add_argument('--repeat', type=int, default=7)
+    args = arg_parser.parse_args()
+
+    text = build(args.corpus, parse_size(args.size))
+    size = len(text.encode('utf-8'))
+    root = Parser(lex(text)).parse()
+    patch = _patch(root)
+    root.evaluate_cached()
+
+    def reevaluate(root):
+        value = root.evaluate()
+        _apply_to_value(value, patch)
+        return value
+
+    def in_place(root):
+        apply_patch(root, patch)
+        return root.evaluate_cached()
+
+    runs = {'evaluate + mutate': reevaluate, 'apply_patch + cached': in_place}
+    print(f"{'path':<24}{'median ms':>11}")
+    for label, func in runs.items():
+        _, samples = time_call(func, root, warmup=1, repeat=args.repeat)
+        stats = summarize(samples, size)
+        print(f"{label:<24}{stats['median'] * 1000:>11.3f}")
+
+if __name__ == '__main__':
+    main()
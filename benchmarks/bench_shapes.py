@@ -0,0 +1,45 @@
+"""Parse time and memory per record with and without the shape cache.
+
+Usage: python benchmarks/bench_shapes.py [--scale N] [--repeat N]
+"""
+import argparse
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.lexer import lex
+from src.parser import Parser
+
+ROOT = os.path.join(os.path.dirname(__file__), '..')
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    arg_parser.add_argument('--scale', type=int, default=8,
+                            help='How many copies of 128KB.json records to parse')
+    arg_parser.add_argument('--repeat', type=int, default=5)
+    args = arg_parser.parse_args()
+
+    with open(os.path.join(ROOT, '128KB.json'), encoding='utf-8') as f:
+        records = json.load(f) * args.scale
+    tokens = lex(json.dumps(records))
+
+    for shapes in (False, True):
+        times = []
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            Parser(tokens, shapes=shapes).parse()
+            times.append(time.perf_counter() - start)
+        tracemalloc.start()
+        ast = Parser(tokens, shapes=shapes).parse()
+        size, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        del ast
+        print(f"shapes={shapes!s:<5} {min(times) / len(records) * 1e6:8.2f}us/record "
+              f"{size / len(records):8.0f}B/record")
+
+if __name__ == '__main__':
+    main()
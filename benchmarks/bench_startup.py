@@ -0,0 +1,92 @@
+"""Import time and CLI cold-start latency, checked against a stored budget.
+
+Usage: python benchmarks/bench_startup.py [--repeat N] [--update]
+
+Import times come from `python -X importtime` (cumulative microseconds for
+the named module). Cold start is the median wall time of a `--validate`
+run on a tiny input minus that of a bare `python -c pass`.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+BUDGET_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'startup_budget.json')
+
+# What `import <module>` must not pull in
+FORBIDDEN = {
+    'src': ['argparse', 'json', 'typing', 're', 'src.lexer', 'src.parser', 'src.ast'],
+    'src.parser': ['argparse', 'json', 'typing', 're'],
+}
+
+def import_time(module: str) -> int:
+    """Cumulative import time of `module` in microseconds, from a fresh interpreter."""
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+                            cwd=ROOT, capture_output=True, text=True, check=True)
+    for line in result.stderr.splitlines():
+        parts = [part.strip() for part in line.split('|')]
+        if len(parts) == 3 and parts[2] == module:
+            return int(parts[1])
+    raise RuntimeError(f"{module} does not appear in the -X importtime output")
+
+def loaded_modules(module: str) -> set:
+    code = f'import sys; before = set(sys.modules); import {module}; print(" ".join(set(sys.modules) - before))'
+    result = subprocess.run([sys.executable, '-c', code], cwd=ROOT, capture_output=True, text=True, check=True)
+    return set(result.stdout.split())
+
+def _wall(args, stdin: str = '') -> float:
+    start = time.perf_counter()
+    subprocess.run(args, cwd=ROOT, input=stdin, capture_output=True, text=True, check=True)
+    return time.perf_counter() - start
+
+def cold_start_ms(repeat: int = 9) -> float:
+    cli = [sys.executable, '-c', 'from src.cli import main; main()', '--validate']
+    bare = [sys.executable, '-c', 'pass']
+    cli_times = [_wall(cli, '[1]') for _ in range(repeat)]
+    bare_times = [_wall(bare) for _ in range(repeat)]
+    return (statistics.median(cli_times) - statistics.median(bare_times)) * 1000
+
+def measure(repeat: int = 9) -> dict:
+    return {
+        'import_src_us': statistics.median(import_time('src') for _ in range(repeat)),
+        'import_parser_us': statistics.median(import_time('src.parser') for _ in range(repeat)),
+        'cli_validate_ms': round(cold_start_ms(repeat), 2),
+    }
+
+def load_budget() -> dict:
+    with open(BUDGET_PATH, encoding='utf-8') as f:
+        return json.load(f)
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    arg_parser.add_argument('--repeat', type=int, default=9)
+    arg_parser.add_argument('--update', action='store_true',
+                            help='Store three times the measured values as the new budget')
+    args = arg_parser.parse_args()
+
+    results = measure(args.repeat)
+    if args.update:
+        with open(BUDGET_PATH, 'w', encoding='utf-8') as f:
+            json.dump({name: round(value * 3, 2) for name, value in results.items()}, f, indent=2)
+            f.write('\n')
+        print(f"budget written to {BUDGET_PATH}")
+
+    budget = load_budget()
+    failed = False
+    for name, value in results.items():
+        status = 'ok' if value <= budget[name] else 'OVER BUDGET'
+        failed = failed or value > budget[name]
+        print(f"{name:<18} {value:10.1f}  budget {budget[name]:10.1f}  {status}")
+    for module, forbidden in FORBIDDEN.items():
+        unwanted = sorted(loaded_modules(module) & set(forbidden))
+        if unwanted:
+            failed = True
+            print(f"import {module} loads {', '.join(unwanted)}")
+    sys.exit(1 if failed else 0)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,71 @@
+"""Typed decoding with parse_as against parse, evaluate, then construct.
+
+Usage: python benchmarks/bench_typed.py [--corpus 128KB.json] [--size 1MB] [--repeat 7]
+
+Both paths start from the same token list, so the numbers compare the
+decoding step alone; lexing is timed separately.
+"""
+import argparse
+import dataclasses
+import os
+import sys
+from typing import List
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from benchmarks.corpus import build, parse_size
+from benchmarks.suite import summarize, time_call
+from src.parser import Parser
+from src.stream import StreamLexer
+from src.typed import decode_tokens
+
+@dataclasses.dataclass
+class Record:
+    name: str
+    language: str
+    id: str
+    bio: str
+    version: float
+
+@dataclasses.dataclass
+class SlottedRecord:
+    # dataclass(slots=True) needs Python 3.10
+    __slots__ = ('name', 'language', 'id', 'bio', 'version')
+    name: str
+    language: str
+    id: str
+    bio: str
+    version: float
+
+def _lex(text):
+    lexer = StreamLexer()
+    return lexer.feed(text) + lexer.close()
+
+def _construct(cls):
+    def run(tokens):
+        return [cls(**item) for item in Parser(tokens).parse().evaluate()]
+    return run
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    arg_parser.add_argument('--corpus', default='128KB.json', choices=['128KB.json', 'records'])
+    arg_parser.add_argument('--size', default='1MB', help='Size of the records corpus')
+    arg_parser.add_argument('--repeat', type=int, default=7)
+    args = arg_parser.parse_args()
+
+    text = build(args.corpus, parse_size(args.size))
+    size = len(text.encode('utf-8'))
+    tokens, samples = time_call(_lex, text, warmup=1, repeat=args.repeat)
+    runs = {'lex': samples}
+    for cls in (Record, SlottedRecord):
+        expected, runs[f'construct {cls.__name__}'] = time_call(_construct(cls), tokens, 1, args.repeat)
+        result, runs[f'parse_as {cls.__name__}'] = time_call(lambda t: decode_tokens(t, List[cls]), tokens, 1, args.repeat)
+        assert result == expected
+
+    print(f"{'path':<28}{'median ms':>11}{'MB/s':>9}")
+    for label, samples in runs.items():
+        stats = summarize(samples, size)
+        print(f"{label:<28}{stats['median'] * 1000:>11.2f}{stats['mb_per_s']:>9.2f}")
+
+if __name__ == '__main__':
+    main()
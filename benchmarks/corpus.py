@@ -0,0 +1,25 @@
+"""Benchmark corpora: the bundled 128KB.json plus synthetic documents of any size.
+
+The synthetic corpora are the single-document profiles of
+benchmarks/workload.py, built in memory.
+"""
+import os
+from benchmarks.workload import PROFILES, build as build_workload
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+
+CORPORA = [name for name in PROFILES if name != 'ndjson']
+
+def parse_size(text: str) -> int:
+    """'128KB', '1MB', '1GB' or a plain byte count."""
+    text = text.strip().upper()
+    for suffix, factor in (('GB', 1 << 30), ('MB', 1 << 20), ('KB', 1 << 10), ('B', 1)):
+        if text.endswith(suffix):
+            return int(float(text[:-len(suffix)]) * factor)
+    return int(text)
+
+def build(name: str, size: int, seed: int = 0) -> str:
+    if name == '128KB.json':
+        with open(os.path.join(ROOT, '128KB.json'), encoding='utf-8') as f:
+            return f.read()
+    return build_workload(name, size, seed)
@@ -0,0 +1,147 @@
+"""Throughput of lex, parse, evaluate and serialize over the benchmark corpora.
+
+Usage:
+    python benchmarks/suite.py [--corpus NAME ...] [--size 1MB] [--repeat 7]
+    python benchmarks/suite.py --save-baseline benchmarks/baseline.json
+    python benchmarks/suite.py --baseline benchmarks/baseline.json --threshold 0.1
+
+Each phase is run `--warmup` times untimed and then `--repeat` times; the
+median, p10 and p90 are reported along with MB/s at the median and the
+stdlib json equivalent (json.loads for lex+parse+evaluate, json.dumps for
+serialize). With --baseline the run fails (exit status 1) if any phase's
+throughput dropped by more than --threshold. The pure-Python lexer keeps
+every token in memory, so sizes in the GB range need a lot of RAM.
+"""
+import argparse
+import gc
+import json
+import os
+import platform
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from benchmarks.corpus import CORPORA, build, parse_size
+from src.lexer import lex
+from src.parser import Parser
+from src.ast import ast_to_json
+
+PHASES = ('lex', 'parse', 'evaluate', 'serialize')
+
+def percentile(samples, q: float) -> float:
+    """Linearly interpolated percentile, q in [0, 100]."""
+    ordered = sorted(samples)
+    position = (len(ordered) - 1) * q / 100
+    low = int(position)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (position - low)
+
+def time_call(func, arg, warmup: int, repeat: int):
+    for _ in range(warmup):
+        func(arg)
+    samples = []
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        result = func(arg)
+        samples.append(time.perf_counter() - start)
+    return result, samples
+
+def summarize(samples, size: int) -> dict:
+    median = percentile(samples, 50)
+    return {
+        'median': median,
+        'p10': percentile(samples, 10),
+        'p90': percentile(samples, 90),
+        'mb_per_s': size / 1e6 / median if median else 0.0,
+    }
+
+def run_corpus(text: str, warmup: int, repeat: int) -> dict:
+    size = len(text.encode('utf-8'))
+    phases = {}
+    tokens, samples = time_call(lex, text, warmup, repeat)
+    phases['lex'] = summarize(samples, size)
+    root, samples = time_call(lambda t: Parser(t).parse(), tokens, warmup, repeat)
+    phases['parse'] = summarize(samples, size)
+    del tokens
+    value, samples = time_call(lambda node: node.evaluate(), root, warmup, repeat)
+    phases['evaluate'] = summarize(samples, size)
+    _, samples = time_call(ast_to_json, root, warmup, repeat)
+    phases['serialize'] = summarize(samples, size)
+    del root
+    stdlib = {}
+    _, samples = time_call(json.loads, text, warmup, repeat)
+    stdlib['loads'] = summarize(samples, size)
+    _, samples = time_call(lambda v: json.dumps(v, indent=2), value, warmup, repeat)
+    stdlib['dumps'] = summarize(samples, size)
+    return {'bytes': size, 'phases': phases, 'stdlib': stdlib}
+
+def run(corpora, size: int, warmup: int, repeat: int, seed: int = 0) -> dict:
+    results = {
+        'python': platform.python_version(),
+        'implementation': platform.python_implementation(),
+        'size': size,
+        'corpora': {},
+    }
+    for name in corpora:
+        results['corpora'][name] = run_corpus(build(name, size, seed), warmup, repeat)
+    return results
+
+def compare(results: dict, baseline: dict, threshold: float) -> list:
+    """Return a message for every phase whose MB/s fell more than `threshold` below the baseline."""
+    regressions = []
+    for name, corpus in results['corpora'].items():
+        expected = baseline.get('corpora', {}).get(name)
+        if expected is None:
+            continue
+        for phase, stats in corpus['phases'].items():
+            before = expected['phases'].get(phase, {}).get('mb_per_s')
+            if before and stats['mb_per_s'] < before * (1 - threshold):
+                change = (stats['mb_per_s'] / before - 1) * 100
+                regressions.append(f"{name}/{phase}: {stats['mb_per_s']:.2f} MB/s vs "
+                                   f"{before:.2f} MB/s baseline ({change:+.1f}%)")
+    return regressions
+
+def report(results: dict) -> str:
+    lines = [f"{'corpus':<12}{'phase':<11}{'median ms':>11}{'p10 ms':>10}{'p90 ms':>10}{'MB/s':>9}"]
+    for name, corpus in results['corpora'].items():
+        for phase, stats in list(corpus['phases'].items()) + [('json.' + k, v) for k, v in corpus['stdlib'].items()]:
+            lines.append(f"{name:<12}{phase:<11}{stats['median'] * 1000:>11.2f}{stats['p10'] * 1000:>10.2f}"
+                         f"{stats['p90'] * 1000:>10.2f}{stats['mb_per_s']:>9.2f}")
+        ours = sum(corpus['phases'][phase]['median'] for phase in ('lex', 'parse', 'evaluate'))
+        lines.append(f"{name:<12}{'vs loads':<11}{ours / corpus['stdlib']['loads']['median']:>10.1f}x slower")
+    return '\n'.join(lines)
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    arg_parser.add_argument('--corpus', action='append', choices=['128KB.json'] + CORPORA,
+                            help='Corpus to run (repeatable; default: all)')
+    arg_parser.add_argument('--size', default='1MB', help='Size of synthetic corpora, e.g. 256KB, 1MB, 1GB')
+    arg_parser.add_argument('--warmup', type=int, default=1)
+    arg_parser.add_argument('--repeat', type=int, default=7)
+    arg_parser.add_argument('--seed', type=int, default=0)
+    arg_parser.add_argument('--output', help='Write the full results as JSON to this path')
+    arg_parser.add_argument('--save-baseline', metavar='PATH', help='Store the results as a baseline')
+    arg_parser.add_argument('--baseline', metavar='PATH', help='Fail if throughput regressed against this baseline')
+    arg_parser.add_argument('--threshold', type=float, default=0.10,
+                            help='Allowed throughput drop before --baseline fails (fraction, default 0.10)')
+    args = arg_parser.parse_args()
+
+    corpora = args.corpus or ['128KB.json'] + CORPORA
+    results = run(corpora, parse_size(args.size), args.warmup, args.repeat, args.seed)
+    print(report(results))
+    for path in filter(None, (args.output, args.save_baseline)):
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+            f.write('\n')
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            regressions = compare(results, json.load(f), args.threshold)
+        for message in regressions:
+            print('REGRESSION ' + message)
+        if regressions:
+            sys.exit(1)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,136 @@
+"""Seeded synthetic JSON workloads of a target size, streamed to disk.
+
+Usage: python benchmarks/workload.py PROFILE SIZE -o PATH [--seed N]
+
+Profiles:
+    records   array of objects shaped like 128KB.json
+    numbers   array of big ints, floats and exponents
+    strings   array of long strings with escapes and non-ASCII text
+    nested    array of deeply nested objects/arrays
+    wide      array of objects with 1000 keys each
+    ndjson    one record per line (not a single JSON document)
+
+The same profile, size and seed always give the same bytes. Output is
+produced item by item, so memory use does not depend on the size.
+"""
+import argparse
+import json
+import os
+import random
+import sys
+from typing import Callable, Dict, Iterator
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+# Nesting stays well below the recursion limit of the recursive Parser
+NESTED_DEPTH = 200
+
+_FIRST = ['Adeel', 'Afzal', 'Aftab', 'Ajay', 'Alisha', 'Chen', 'Dana', 'Emeka', 'Ines', 'Jonas', 'Kaveh',
+          'Lerato', 'Mateo', 'Noor', 'Olga', 'Priya', 'Ren', 'Sione', 'Tariq', 'Yuki']
+_LAST = ['Solangi', 'Ghaffar', 'Shahzad', 'Jain', 'Kumari', 'Wei', 'Levi', 'Okafor', 'Duarte', 'Berg',
+         'Rahimi', 'Mokoena', 'Rojas', 'Haddad', 'Petrova', 'Iyer', 'Sato', 'Taufa', 'Aziz', 'Tanaka']
+_LANGUAGES = ['Sindhi', 'Uyghur', 'Galician', 'Maltese', 'Sesotho sa Leboa', 'isiZulu', 'Icelandic', 'Hindi']
+_WORDS = ('lorem ipsum dolor sit amet consectetur adipiscing elit donec lobortis eleifend condimentum '
+          'cras dictum lacinia lectus vehicula rutrum maecenas quis nisi nunc nam tristique feugiat').split()
+_ID_CHARS = 'ABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789'
+_TEXT = ['plain text ', 'quote " ', 'backslash \\ ', 'newline\n', 'tab\t', 'bell\x07', 'café ', 'naïve ',
+         'Ωμέγα ', '日本語 ', '😀 ', '𝄞 ', 'slash / ']
+
+def _record(rng: random.Random, i: int) -> str:
+    return json.dumps({
+        'name': f'{rng.choice(_FIRST)} {rng.choice(_LAST)}',
+        'language': rng.choice(_LANGUAGES),
+        'id': ''.join(rng.choice(_ID_CHARS) for _ in range(16)),
+        'bio': ' '.join(rng.choice(_WORDS) for _ in range(rng.randint(8, 30))).capitalize() + '.',
+        'version': round(rng.uniform(1, 10), 2),
+    }, ensure_ascii=False)
+
+def _number(rng: random.Random, i: int) -> str:
+    kind = i % 4
+    if kind == 0:
+        return str(rng.randint(-2 ** 63, 2 ** 63))
+    if kind == 1:
+        return str(rng.randint(10 ** 20, 10 ** 30))  # beyond 64 bits
+    if kind == 2:
+        return repr(rng.uniform(-1e6, 1e6))
+    return f'{rng.uniform(1, 10):.6f}e{rng.randint(-300, 300)}'
+
+def _string(rng: random.Random, i: int) -> str:
+    text = ''.join(rng.choice(_TEXT) for _ in range(rng.randint(10, 80)))
+    return json.dumps(text, ensure_ascii=rng.random() < 0.5)
+
+def _nested(rng: random.Random, i: int) -> str:
+    depth = rng.randint(NESTED_DEPTH // 2, NESTED_DEPTH)
+    opening = ''.join('{"k": [' if level % 2 == 0 else '[' for level in range(depth))
+    closing = ''.join(']}' if level % 2 == 0 else ']' for level in reversed(range(depth)))
+    return opening + str(i) + closing
+
+def _wide(rng: random.Random, i: int) -> str:
+    values = ['1', 'true', 'null', '"v"', '2.5']
+    return '{' + ', '.join(f'"field_{i}_{j}": {rng.choice(values)}' for j in range(1000)) + '}'
+
+PROFILES: Dict[str, Callable[[random.Random, int], str]] = {
+    'records': _record,
+    'numbers': _number,
+    'strings': _string,
+    'nested': _nested,
+    'wide': _wide,
+    'ndjson': _record,
+}
+
+def iter_workload(profile: str, size: int, seed: int = 0) -> Iterator[str]:
+    """Yield the text of a document of at least `size` UTF-8 bytes, piece by piece.
+
+    The document stops after the first item that reaches `size`, so it
+    overshoots by at most one item (and always has at least one).
+    """
+    make_item = PROFILES[profile]
+    rng = random.Random(f'{profile}:{seed}')
+    ndjson = profile == 'ndjson'
+    total = 0 if ndjson else 2
+    if not ndjson:
+        yield '['
+    i = 0
+    while i == 0 or total < size:
+        item = make_item(rng, i)
+        if ndjson:
+            piece = item + '\n'
+        else:
+            piece = item if i == 0 else ',\n' + item
+        total += len(piece.encode('utf-8'))
+        yield piece
+        i += 1
+    if not ndjson:
+        yield ']'
+
+def write_workload(path: str, profile: str, size: int, seed: int = 0, buffer_size: int = 1 << 20) -> int:
+    """Stream a workload into `path` and return the number of bytes written."""
+    pending = []
+    pending_size = 0
+    with open(path, 'w', encoding='utf-8', newline='') as f:
+        for piece in iter_workload(profile, size, seed):
+            pending.append(piece)
+            pending_size += len(piece)
+            if pending_size >= buffer_size:
+                f.write(''.join(pending))
+                pending.clear()
+                pending_size = 0
+        f.write(''.join(pending))
+    return os.path.getsize(path)
+
+def build(profile: str, size: int, seed: int = 0) -> str:
+    return ''.join(iter_workload(profile, size, seed))
+
+def main():
+    from benchmarks.corpus import parse_size
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    arg_parser.add_argument('profile', choices=list(PROFILES))
+    arg_parser.add_argument('size', help='Target size, e.g. 64KB, 10MB, 2GB')
+    arg_parser.add_argument('-o', '--output', required=True)
+    arg_parser.add_argument('--seed', type=int, default=0)
+    args = arg_parser.parse_args()
+    size = write_workload(args.output, args.profile, parse_size(args.size), args.seed)
+    print(f"wrote {size} bytes to {args.output}")
+
+if __name__ == '__main__':
+    main()
@@ -6,10 +6,10 @@ setup(
     packages=find_packages(),
     entry_points={
         'console_scripts': [
-            'jsonparse=src:main',
+            'jsonparse=src.cli:main',
         ],
     },
-    python_requires='>=3.7',
+    python_requires='>=3.9',
     description="A CLI tool for parsing JSON files.",
     author="Nathan Agbomedarho",
     author_email="your.email@example.com"
@@ -1,32 +1,28 @@
-import argparse
-import sys
-from .lexer import lex
-from .parser import Parser
-from .ast import ASTNode
+"""JSON lexer, parser and AST.
 
-def main():
-    import json
-    arg_parser = argparse.ArgumentParser(description='JSON Parser CLI Tool')
-    arg_parser.add_argument('file', nargs='?', type=argparse.FileType('r'), default=sys.stdin,
-                           help='JSON file to parse (or stdin if not specified)')
-    arg_parser.add_argument('--pretty', action='store_true', help='Pretty print the output')
-    args = arg_parser.parse_args()
+Submodules are imported on first use, so `import src` stays cheap and the
+CLI only loads what the selected mode needs.
+"""
 
-    try:
-        input_text = args.file.read()
-        tokens = lex(input_text)
-        parser = Parser(tokens)
-        ast = parser.parse()
-        result = ast.evaluate()
-        
-        if args.pretty:
-            print(json.dumps(result, indent=2))
-        else:
-            print(json.dumps(result))
-            
-    except Exception as e:
-        print(f"Error: {str(e)}", file=sys.stderr)
-        sys.exit(1)
+_EXPORTS = {
+    'lex': 'src.lexer',
+    'Token': 'src.lexer',
+    'LexerError': 'src.lexer',
+    'Parser': 'src.parser',
+    'ASTNode': 'src.ast',
+    'main': 'src.cli',
+}
 
-if __name__ == '__main__':
-    main()
+__all__ = list(_EXPORTS)
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    import importlib
+    value = getattr(importlib.import_module(module), name)
+    globals()[name] = value
+    return value
+
+def __dir__():
+    return sorted(set(globals()) | set(_EXPORTS))
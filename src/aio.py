@@ -0,0 +1,94 @@
+import asyncio
+import codecs
+from concurrent.futures import Executor
+from typing import Any, AsyncIterator, List, Optional
+from src.ast import ASTNode
+from src.lexer import LexerError
+from src.stream import StreamLexer, StreamParser
+
+class _Feeder:
+    def __init__(self, prefix: Optional[str]):
+        self.decoder = codecs.getincrementaldecoder('utf-8')()
+        self.lexer = StreamLexer()
+        self.parser = StreamParser(prefix)
+        self._error: Optional[LexerError] = None
+
+    def feed(self, data: bytes) -> List[ASTNode]:
+        if self._error is not None:
+            raise self._error
+        try:
+            tokens = self.lexer.feed(self.decoder.decode(data))
+        except LexerError as e:
+            return self._salvage(e)
+        return self.parser.feed(tokens)
+
+    def close(self) -> List[ASTNode]:
+        if self._error is not None:
+            raise self._error
+        try:
+            tokens = self.lexer.feed(self.decoder.decode(b'', final=True)) + self.lexer.close()
+        except LexerError as e:
+            return self._salvage(e)
+        return self.parser.feed(tokens)
+
+    def finish(self) -> None:
+        # After the last items are handed out: raise what was held back, or check the end
+        if self._error is not None:
+            raise self._error
+        self.parser.close()
+
+    def _salvage(self, error: LexerError) -> List[ASTNode]:
+        # Like StreamParser: hand out the items completed before the bad token, raise next time
+        items = self.parser.feed(error.tokens)
+        if not items:
+            raise error
+        self._error = error
+        return items
+
+async def _chunks(reader: Any, feeder: _Feeder, chunk_size: int, offload_size: Optional[int],
+                  executor: Optional[Executor]) -> AsyncIterator[List[ASTNode]]:
+    loop = asyncio.get_running_loop()
+    while True:
+        data = await reader.read(chunk_size)
+        if not data:
+            break
+        if offload_size is not None and len(data) >= offload_size:
+            items = await loop.run_in_executor(executor, feeder.feed, data)
+        else:
+            items = feeder.feed(data)
+            # Let other tasks run between chunks even when data is already buffered
+            await asyncio.sleep(0)
+        if items:
+            yield items
+    items = feeder.close()
+    if items:
+        yield items
+    feeder.finish()
+
+async def parse_stream(reader: Any, chunk_size: int = 65536, offload_size: Optional[int] = None,
+                       executor: Optional[Executor] = None) -> ASTNode:
+    """Parse one JSON document from an asyncio StreamReader (or anything with `async read(n)`).
+
+    Bytes are decoded, lexed and parsed one chunk at a time, and control
+    goes back to the event loop after every chunk. Chunks of at least
+    `offload_size` bytes are processed on `executor` (the loop's default
+    thread pool if None) instead of on the loop itself.
+    """
+    feeder = _Feeder(None)
+    async for _ in _chunks(reader, feeder, chunk_size, offload_size, executor):
+        pass
+    return feeder.parser.root
+
+async def aiter_items(reader: Any, prefix: str = 'item', chunk_size: int = 65536,
+                      offload_size: Optional[int] = None,
+                      executor: Optional[Executor] = None) -> AsyncIterator[ASTNode]:
+    """Yield each value found at `prefix` (see StreamParser) as soon as it is complete.
+
+    Only the item being built is held in memory. Errors in the document
+    are raised when they are reached, after the items before them have
+    been yielded.
+    """
+    feeder = _Feeder(prefix)
+    async for items in _chunks(reader, feeder, chunk_size, offload_size, executor):
+        for item in items:
+            yield item
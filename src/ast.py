@@ -1,11 +1,251 @@
 
-import json
-from typing import Any, Dict, List, Union
+from __future__ import annotations
+from collections.abc import Mapping, Sequence
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Any, Dict, List, Optional, Tuple, Union
+
+_MISSING = object()
 
 class ASTNode:
+    # Source span of the node (input[start:end]); set by Parser when the
+    # tokens carry offsets, None for nodes built by hand or by parse_json.
+    start = None
+    end = None
+    # Memoized result of evaluate_cached() and the container holding this
+    # node; both are only filled in once evaluate_cached() has seen the node.
+    _cached = _MISSING
+    _parent = None
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # The memo and parent link are rebuilt by evaluate_cached() on demand
+        state = self.__dict__.copy()
+        state.pop('_cached', None)
+        state.pop('_parent', None)
+        return state
+
     def evaluate(self) -> Any:
         raise NotImplementedError
 
+    def evaluate_cached(self) -> Any:
+        """Evaluate iteratively, memoizing the result of every container.
+
+        Repeated calls return the same dicts and lists to every caller.
+        They are shared, not copies: never mutate them, since nothing
+        notices and every later caller would see the change. Use
+        evaluate() for a private copy, or view() for a read-only wrapper.
+        The first call switches the node's pairs/elements to
+        tracking containers, so mutating them later (assigning, deleting,
+        appending, ...) drops the cache of that container and its
+        ancestors. Reassigning a scalar's `value` or a container's whole
+        `pairs`/`elements` is not tracked: call invalidate() afterwards.
+        """
+        if self._cached is not _MISSING:
+            return self._cached
+        stack = [(self, False)]
+        while stack:
+            node, ready = stack.pop()
+            if isinstance(node, ObjectNode):
+                if ready:
+                    node._cached = {key: _cached_value(value) for key, value in node.pairs.items()}
+                    continue
+                if type(node.pairs) is not _TrackedDict:
+                    node.pairs = _TrackedDict(node, node.pairs)
+                children = node.pairs.values()
+            elif isinstance(node, ArrayNode):
+                if ready:
+                    node._cached = [_cached_value(element) for element in node.elements]
+                    continue
+                if type(node.elements) is not _TrackedList:
+                    node.elements = _TrackedList(node, node.elements)
+                children = node.elements
+            else:
+                continue
+            stack.append((node, True))
+            for child in children:
+                child._parent = node
+                if child._cached is _MISSING:
+                    stack.append((child, False))
+        return self._cached if isinstance(self, (ObjectNode, ArrayNode)) else self.evaluate()
+
+    def invalidate(self) -> None:
+        # A cached container implies cached descendants, so once an
+        # uncached ancestor is reached the rest of the chain is clean too
+        node = self
+        while node is not None:
+            if node is not self and node._cached is _MISSING:
+                break
+            node._cached = _MISSING
+            node = node._parent
+
+    def view(self) -> Any:
+        """Return a live read-only Mapping/Sequence view, without copying."""
+        return _view(self)
+
+def _cached_value(node: ASTNode) -> Any:
+    return node._cached if isinstance(node, (ObjectNode, ArrayNode)) else node.evaluate()
+
+def _view(node: ASTNode) -> Any:
+    if isinstance(node, ObjectNode):
+        return ObjectView(node)
+    if isinstance(node, ArrayNode):
+        return ArrayView(node)
+    return node.evaluate()
+
+class ObjectView(Mapping):
+    __slots__ = ('_node',)
+
+    def __init__(self, node: 'ObjectNode'):
+        self._node = node
+
+    def __getitem__(self, key: str) -> Any:
+        return _view(self._node.pairs[key])
+
+    def __iter__(self):
+        return iter(self._node.pairs)
+
+    def __len__(self) -> int:
+        return len(self._node.pairs)
+
+    def __repr__(self):
+        return f"ObjectView({dict(self.items())!r})"
+
+class ArrayView(Sequence):
+    __slots__ = ('_node',)
+
+    def __init__(self, node: 'ArrayNode'):
+        self._node = node
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return tuple(_view(element) for element in self._node.elements[index])
+        return _view(self._node.elements[index])
+
+    def __len__(self) -> int:
+        return len(self._node.elements)
+
+    def __eq__(self, other):
+        if not isinstance(other, (list, tuple, ArrayView)):
+            return NotImplemented
+        return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+
+    def __repr__(self):
+        return f"ArrayView({list(self)!r})"
+
+class _TrackedDict(dict):
+    # dict that invalidates its owner's cached value on every mutation
+    def __init__(self, owner: ASTNode, pairs: Dict[str, ASTNode]):
+        super().__init__(pairs)
+        self.owner = owner
+
+    def __reduce__(self):
+        # Pickle as a plain dict: tracking is reinstalled by evaluate_cached()
+        return dict, (dict(self),)
+
+    def _changed(self) -> None:
+        for value in dict.values(self):
+            value._parent = self.owner
+        self.owner.invalidate()
+
+    def __setitem__(self, key, value):
+        super().__setitem__(key, value)
+        value._parent = self.owner
+        self.owner.invalidate()
+
+    def __delitem__(self, key):
+        value = dict.__getitem__(self, key)
+        super().__delitem__(key)
+        value._parent = None
+        self.owner.invalidate()
+
+    def pop(self, key, *default):
+        if not dict.__contains__(self, key):
+            return super().pop(key, *default)  # KeyError or the default, nothing changes
+        value = super().pop(key)
+        value._parent = None
+        self.owner.invalidate()
+        return value
+
+    def _wrap(name):
+        def method(self, *args, **kwargs):
+            result = getattr(dict, name)(self, *args, **kwargs)
+            self._changed()
+            return result
+        method.__name__ = name
+        return method
+
+    popitem = _wrap('popitem')
+    setdefault = _wrap('setdefault')
+    update = _wrap('update')
+    clear = _wrap('clear')
+    __ior__ = _wrap('__ior__')
+    del _wrap
+
+class _TrackedList(list):
+    # list that invalidates its owner's cached value on every mutation
+    def __init__(self, owner: ASTNode, elements: List[ASTNode]):
+        super().__init__(elements)
+        self.owner = owner
+
+    def __reduce__(self):
+        return list, (list(self),)
+
+    def _changed(self) -> None:
+        for element in list.__iter__(self):
+            element._parent = self.owner
+        self.owner.invalidate()
+
+    def __setitem__(self, index, value):
+        super().__setitem__(index, value)
+        if isinstance(index, slice):
+            self._changed()
+        else:
+            value._parent = self.owner
+            self.owner.invalidate()
+
+    def append(self, element):
+        super().append(element)
+        element._parent = self.owner
+        self.owner.invalidate()
+
+    def insert(self, index, element):
+        super().insert(index, element)
+        element._parent = self.owner
+        self.owner.invalidate()
+
+    def pop(self, index=-1):
+        element = super().pop(index)
+        element._parent = None
+        self.owner.invalidate()
+        return element
+
+    def __delitem__(self, index):
+        if isinstance(index, slice):
+            super().__delitem__(index)
+            self._changed()
+            return
+        element = list.__getitem__(self, index)
+        super().__delitem__(index)
+        element._parent = None
+        self.owner.invalidate()
+
+    def _wrap(name):
+        def method(self, *args, **kwargs):
+            result = getattr(list, name)(self, *args, **kwargs)
+            self._changed()
+            return result
+        method.__name__ = name
+        return method
+
+    __iadd__ = _wrap('__iadd__')
+    __imul__ = _wrap('__imul__')
+    extend = _wrap('extend')
+    remove = _wrap('remove')
+    clear = _wrap('clear')
+    sort = _wrap('sort')
+    reverse = _wrap('reverse')
+    del _wrap
+
 class ObjectNode(ASTNode):
     def __init__(self, pairs: Dict[str, ASTNode]):
         self.pairs = pairs
@@ -13,6 +253,65 @@ class ObjectNode(ASTNode):
     def evaluate(self) -> Dict:
         return {key: value.evaluate() for key, value in self.pairs.items()}
 
+class Shape:
+    """Key sequence shared by every record object that has it.
+
+    `children` holds the shape last seen for the value in each slot, so
+    nested records can be predicted too.
+    """
+    __slots__ = ('keys', 'children', '_record_class')
+
+    def __init__(self, keys: Tuple[str, ...]):
+        self.keys = keys
+        self.children: List[Optional['Shape']] = [None] * len(keys)
+        self._record_class = None
+
+    @property
+    def record_class(self) -> type:
+        # A namedtuple: tuple storage plus the shared key table
+        if self._record_class is None:
+            from collections import namedtuple
+            self._record_class = namedtuple('Record', self.keys, rename=True)
+        return self._record_class
+
+    def __repr__(self):
+        return f"Shape({self.keys!r})"
+
+class RecordNode(ObjectNode):
+    """Object whose values are stored positionally against a shared Shape.
+
+    `pairs` is built on first access and is authoritative from then on.
+    """
+    _pairs = None
+
+    def __init__(self, shape: Shape, values: List[ASTNode]):
+        self.shape = shape
+        self.values = values
+
+    @property
+    def pairs(self) -> Dict[str, ASTNode]:
+        if self._pairs is None:
+            self._pairs = dict(zip(self.shape.keys, self.values))
+            self.values = None
+        return self._pairs
+
+    @pairs.setter
+    def pairs(self, value: Dict[str, ASTNode]) -> None:
+        self._pairs = value
+        self.values = None
+
+    def evaluate(self) -> Dict:
+        if self._pairs is None:
+            return dict(zip(self.shape.keys, [value.evaluate() for value in self.values]))
+        return super().evaluate()
+
+    def evaluate_record(self) -> tuple:
+        if self._pairs is None:
+            return self.shape.record_class._make([value.evaluate() for value in self.values])
+        if tuple(self._pairs) != self.shape.keys:
+            self.shape = Shape(tuple(self._pairs))
+        return self.shape.record_class._make([value.evaluate() for value in self._pairs.values()])
+
 class ArrayNode(ASTNode):
     def __init__(self, elements: List[ASTNode]):
         self.elements = elements
@@ -62,24 +361,10 @@ def parse_json(json_string: str) -> ASTNode:
         else:
             raise ValueError(f"Unsupported JSON value: {value}")
 
+    import json
     parsed_json = json.loads(json_string)
     return parse_value(parsed_json)
 
 def ast_to_json(node: ASTNode) -> str:
-    def to_json_value(node: ASTNode) -> Any:
-        if isinstance(node, ObjectNode):
-            return {k: to_json_value(v) for k, v in node.pairs.items()}
-        elif isinstance(node, ArrayNode):
-            return [to_json_value(item) for item in node.elements]
-        elif isinstance(node, StringNode):
-            return node.value
-        elif isinstance(node, NumberNode):
-            return node.value
-        elif isinstance(node, BooleanNode):
-            return node.value
-        elif isinstance(node, NullNode):
-            return None
-        else:
-            raise ValueError(f"Unsupported AST node: {node}")
-
-    return json.dumps(to_json_value(node), indent=2)
+    import json
+    return json.dumps(node.evaluate(), indent=2)
@@ -0,0 +1,228 @@
+from __future__ import annotations
+import glob
+import io
+import os
+import sys
+import time
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from concurrent.futures import Executor
+    from typing import Any, Callable, Dict, IO, Iterable, Iterator, List, Optional, Union
+
+def convert(source: IO[str], write: Callable[[str], object], mode: str = 'parse',
+            indent: Optional[int] = None, chunk_size: int = 65536) -> None:
+    """Run one CLI mode over `source`, sending the output to `write`.
+
+    `mode` is one of 'parse', 'stream', 'validate', 'minify' or 'reformat';
+    `indent` pretty-prints in the modes that produce output.
+    """
+    if mode == 'parse':
+        # json's C encoder beats src.encoder even counting the evaluate() pass
+        import json
+        if getattr(source, 'decompressed', False):
+            # Lex as the text is decompressed instead of holding all of it
+            from src.stream import parse_stream
+            root = parse_stream(source, chunk_size)
+        else:
+            from src.lexer import lex
+            from src.parser import Parser
+            root = Parser(lex(source.read())).parse()
+        write(json.dumps(root.evaluate(), indent=indent))
+        write('\n')
+        return
+
+    from src.stream import reformat_stream, validate_stream
+    if mode == 'validate':
+        validate_stream(source, chunk_size=chunk_size)
+    elif mode == 'minify':
+        reformat_stream(source, write, chunk_size=chunk_size, raw=True, separators=(',', ':'))
+        write('\n')
+    elif mode == 'reformat':
+        reformat_stream(source, write, indent=indent, chunk_size=chunk_size, raw=True)
+        write('\n')
+    elif mode == 'stream':
+        reformat_stream(source, write, indent=indent, chunk_size=chunk_size)
+        write('\n')
+    else:
+        raise ValueError(f"Unknown mode: {mode}")
+
+class FileResult:
+    def __init__(self, path: str, size: int = 0, output: str = '', error: Optional[str] = None):
+        self.path = path
+        self.size = size
+        self.output = output
+        self.error = error
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+    def __repr__(self):
+        status = 'ok' if self.ok else f'error={self.error!r}'
+        return f"FileResult({self.path!r}, size={self.size}, {status})"
+
+def convert_file(path: str, mode: str = 'parse', indent: Optional[int] = None,
+                 chunk_size: int = 65536) -> FileResult:
+    # Runs in the worker processes, so it must stay a picklable module-level function
+    from src.compression import open_input
+    out = io.StringIO()
+    size = 0
+    try:
+        size = os.path.getsize(path)
+        with open_input(path, chunk_size) as source:
+            convert(source, out.write, mode, indent, chunk_size)
+    except Exception as e:
+        return FileResult(path, size, error=str(e))
+    return FileResult(path, size, out.getvalue())
+
+def expand_paths(patterns: List[str]) -> List[str]:
+    """Expand glob patterns (including `**`) in order; plain paths pass through."""
+    paths = []
+    for pattern in patterns:
+        if glob.has_magic(pattern):
+            matches = sorted(glob.glob(pattern, recursive=True))
+            files = [match for match in matches if not os.path.isdir(match)]
+            # Keep a pattern that matched nothing so it is reported as a failure
+            paths.extend(files or [pattern])
+        else:
+            paths.append(pattern)
+    return paths
+
+def run_batch(paths: List[str], jobs: int = 1, ordered: bool = True, **options) -> Iterator[FileResult]:
+    """Convert every file in `paths`, yielding one FileResult per file.
+
+    With jobs > 1 the files are spread over a process pool. Results come
+    back in input order, or as soon as each finishes with ordered=False.
+    `options` are passed to convert().
+    """
+    if jobs <= 1 or len(paths) <= 1:
+        for path in paths:
+            yield convert_file(path, **options)
+        return
+
+    from concurrent.futures import ProcessPoolExecutor, as_completed
+    with ProcessPoolExecutor(max_workers=min(jobs, len(paths))) as executor:
+        futures = [executor.submit(convert_file, path, **options) for path in paths]
+        if ordered:
+            for future in futures:
+                yield future.result()
+        else:
+            for future in as_completed(futures):
+                yield future.result()
+
+class DocumentResult:
+    def __init__(self, value: Any = None, error: Optional[str] = None):
+        self.value = value
+        self.error = error
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+    def __repr__(self):
+        return f"DocumentResult(value={self.value!r})" if self.ok else f"DocumentResult(error={self.error!r})"
+
+def gil_enabled() -> bool:
+    """False on a free-threaded CPython build running without the GIL."""
+    is_gil_enabled = getattr(sys, '_is_gil_enabled', None)
+    return True if is_gil_enabled is None else is_gil_enabled()
+
+def _parse_chunk(documents: List[Union[str, bytes]], evaluate: bool) -> List[DocumentResult]:
+    # Runs on pool threads and in worker processes: everything it touches is local
+    from src.lexer import lex
+    from src.parser import Parser
+    results = []
+    for document in documents:
+        try:
+            if isinstance(document, (bytes, bytearray, memoryview)):
+                document = bytes(document).decode('utf-8')
+            root = Parser(lex(document)).parse()
+            results.append(DocumentResult(root.evaluate() if evaluate else root))
+        except Exception as e:
+            results.append(DocumentResult(error=str(e)))
+    return results
+
+def _chunks(documents: List[Union[str, bytes]], chunk_bytes: int) -> Iterator[List[Union[str, bytes]]]:
+    chunk = []
+    size = 0
+    for document in documents:
+        chunk.append(document)
+        size += len(document)
+        if size >= chunk_bytes:
+            yield chunk
+            chunk = []
+            size = 0
+    if chunk:
+        yield chunk
+
+PROCESS_THRESHOLD = 1 << 20  # total bytes before 'auto' pays for worker processes
+
+def parse_many(documents: Iterable[Union[str, bytes]], executor: Union[str, Executor] = 'auto',
+               jobs: Optional[int] = None, chunk_bytes: int = 64 * 1024,
+               evaluate: bool = False) -> List[DocumentResult]:
+    """Parse many documents concurrently, returning one DocumentResult each, in order.
+
+    `executor` is 'thread', 'process', 'auto' or an Executor instance.
+    'auto' uses threads on a free-threaded build, where the GIL does not
+    serialize them, and otherwise a process pool once the batch holds at
+    least PROCESS_THRESHOLD bytes; smaller batches are parsed inline.
+    Documents are grouped into chunks of about `chunk_bytes` per task so
+    small documents do not each pay the dispatch cost. A document that
+    fails to parse gets a result with `error` set instead of raising. With
+    evaluate=True results hold Python values instead of ASTs, which are
+    much cheaper to send back from worker processes.
+    """
+    documents = list(documents)
+    if executor == 'auto':
+        if not gil_enabled():
+            executor = 'thread'
+        elif sum(map(len, documents)) >= PROCESS_THRESHOLD and (os.cpu_count() or 1) > 1:
+            executor = 'process'
+        else:
+            return _parse_chunk(documents, evaluate)
+    if not documents:
+        return []
+
+    chunks = list(_chunks(documents, chunk_bytes))
+    if not isinstance(executor, str):
+        futures = [executor.submit(_parse_chunk, chunk, evaluate) for chunk in chunks]
+        return [result for future in futures for result in future.result()]
+
+    from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+    if executor == 'thread':
+        pool_class = ThreadPoolExecutor
+    elif executor == 'process':
+        pool_class = ProcessPoolExecutor
+    else:
+        raise ValueError(f"Unknown executor: {executor!r}")
+    with pool_class(max_workers=min(jobs or os.cpu_count() or 1, len(chunks))) as pool:
+        return [result for results in pool.map(_parse_chunk, chunks, [evaluate] * len(chunks))
+                for result in results]
+
+class BatchSummary:
+    def __init__(self):
+        self.files = 0
+        self.failed = 0
+        self.bytes = 0
+        self._started = time.perf_counter()
+        self.seconds = 0.0
+
+    def add(self, result: FileResult) -> None:
+        self.files += 1
+        self.bytes += result.size
+        if not result.ok:
+            self.failed += 1
+        self.seconds = time.perf_counter() - self._started
+
+    @property
+    def throughput(self) -> float:
+        # MB/s over the wall time of the whole batch
+        return self.bytes / 1e6 / self.seconds if self.seconds else 0.0
+
+    def as_dict(self) -> Dict[str, float]:
+        return {'files': self.files, 'failed': self.failed, 'bytes': self.bytes,
+                'seconds': self.seconds, 'mb_per_s': self.throughput}
+
+    def __str__(self):
+        return (f"{self.files} files ({self.failed} failed), {self.bytes} bytes "
+                f"in {self.seconds:.3f}s, {self.throughput:.2f} MB/s")
@@ -0,0 +1,257 @@
+import mmap
+import struct
+from typing import Any, Dict, List, Tuple, Union
+from src.ast import ASTNode, ObjectNode, ArrayNode, StringNode, NumberNode, BooleanNode, NullNode
+
+# Snapshot layout (all integers little endian):
+#   magic | u32 string count | u32 offsets[count + 1] | utf-8 string blob | root value
+# Values are a tag byte followed by a payload:
+#   NULL/FALSE/TRUE: none      INT: zigzag varint      FLOAT: 8 byte double
+#   STRING: varint index into the string table
+#   ARRAY:  varint count, varint body length, values
+#   OBJECT: varint count, varint body length, (varint key index, value) pairs
+# The body length lets a reader skip a container without decoding it.
+MAGIC = b'JPB\x01'
+
+TAG_NULL = 0
+TAG_FALSE = 1
+TAG_TRUE = 2
+TAG_INT = 3
+TAG_FLOAT = 4
+TAG_STRING = 5
+TAG_ARRAY = 6
+TAG_OBJECT = 7
+
+_U32 = struct.Struct('<I')
+_DOUBLE = struct.Struct('<d')
+
+Buffer = Union[bytes, bytearray, memoryview, mmap.mmap]
+
+def _write_varint(out: bytearray, value: int) -> None:
+    while value > 0x7F:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+def _read_varint(buf: memoryview, pos: int) -> Tuple[int, int]:
+    result = 0
+    shift = 0
+    while True:
+        byte = buf[pos]
+        pos += 1
+        result |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return result, pos
+        shift += 7
+
+def dump_binary(node: ASTNode) -> bytes:
+    strings: Dict[str, int] = {}
+
+    def intern(value: str) -> int:
+        index = strings.get(value)
+        if index is None:
+            index = strings[value] = len(strings)
+        return index
+
+    def encode(node: ASTNode, out: bytearray) -> None:
+        if isinstance(node, ObjectNode):
+            body = bytearray()
+            for key, value in node.pairs.items():
+                _write_varint(body, intern(key))
+                encode(value, body)
+            out.append(TAG_OBJECT)
+            _write_varint(out, len(node.pairs))
+            _write_varint(out, len(body))
+            out += body
+        elif isinstance(node, ArrayNode):
+            body = bytearray()
+            for element in node.elements:
+                encode(element, body)
+            out.append(TAG_ARRAY)
+            _write_varint(out, len(node.elements))
+            _write_varint(out, len(body))
+            out += body
+        elif isinstance(node, StringNode):
+            out.append(TAG_STRING)
+            _write_varint(out, intern(node.value))
+        elif isinstance(node, NullNode):
+            out.append(TAG_NULL)
+        elif isinstance(node, BooleanNode) or isinstance(getattr(node, 'value', None), bool):
+            out.append(TAG_TRUE if node.value else TAG_FALSE)
+        elif isinstance(node, NumberNode):
+            value = node.value
+            if isinstance(value, int):
+                out.append(TAG_INT)
+                _write_varint(out, (value << 1) if value >= 0 else ((-value << 1) - 1))
+            else:
+                out.append(TAG_FLOAT)
+                out += _DOUBLE.pack(value)
+        else:
+            raise ValueError(f"Unsupported AST node: {node}")
+
+    tape = bytearray()
+    encode(node, tape)
+
+    blob = bytearray()
+    offsets = bytearray(_U32.pack(0))
+    for value in strings:
+        blob += value.encode('utf-8')
+        offsets += _U32.pack(len(blob))
+    return b''.join([MAGIC, _U32.pack(len(strings)), bytes(offsets), bytes(blob), bytes(tape)])
+
+class _Snapshot:
+    """Shared state of a loaded snapshot: the buffer and the string table."""
+
+    def __init__(self, data: Buffer):
+        self.buf = memoryview(data)
+        if self.buf.format != 'B':
+            self.buf = self.buf.cast('B')
+        if bytes(self.buf[:4]) != MAGIC:
+            raise ValueError("Not a binary snapshot")
+        self.count = _U32.unpack_from(self.buf, 4)[0]
+        self.blob_start = 8 + 4 * (self.count + 1)
+        blob_len = _U32.unpack_from(self.buf, 8 + 4 * self.count)[0]
+        self.tape_start = self.blob_start + blob_len
+        self.strings: List[Any] = [None] * self.count
+
+    def string(self, index: int) -> str:
+        value = self.strings[index]
+        if value is None:
+            start, end = struct.unpack_from('<II', self.buf, 8 + 4 * index)
+            value = self.strings[index] = str(self.buf[self.blob_start + start:self.blob_start + end], 'utf-8')
+        return value
+
+    def node(self, pos: int) -> Tuple[ASTNode, int]:
+        buf = self.buf
+        tag = buf[pos]
+        pos += 1
+        if tag == TAG_STRING:
+            index, pos = _read_varint(buf, pos)
+            return StringNode(self.string(index)), pos
+        if tag == TAG_OBJECT or tag == TAG_ARRAY:
+            count, pos = _read_varint(buf, pos)
+            length, pos = _read_varint(buf, pos)
+            cls = _LazyObjectNode if tag == TAG_OBJECT else _LazyArrayNode
+            return cls(self, pos, count), pos + length
+        if tag == TAG_INT:
+            value, pos = _read_varint(buf, pos)
+            return NumberNode((value >> 1) ^ -(value & 1)), pos
+        if tag == TAG_FLOAT:
+            return NumberNode(_DOUBLE.unpack_from(buf, pos)[0]), pos + 8
+        if tag == TAG_TRUE or tag == TAG_FALSE:
+            return BooleanNode(tag == TAG_TRUE), pos
+        if tag == TAG_NULL:
+            return NullNode(), pos
+        raise ValueError(f"Invalid tag {tag} at offset {pos - 1}")
+
+    def value(self, pos: int) -> Tuple[Any, int]:
+        # Decode straight to Python values, without building nodes
+        buf = self.buf
+        tag = buf[pos]
+        pos += 1
+        if tag == TAG_STRING:
+            index, pos = _read_varint(buf, pos)
+            return self.string(index), pos
+        if tag == TAG_OBJECT or tag == TAG_ARRAY:
+            count, pos = _read_varint(buf, pos)
+            _, pos = _read_varint(buf, pos)
+            if tag == TAG_OBJECT:
+                return self.object_value(pos, count)
+            return self.array_value(pos, count)
+        if tag == TAG_INT:
+            value, pos = _read_varint(buf, pos)
+            return (value >> 1) ^ -(value & 1), pos
+        if tag == TAG_FLOAT:
+            return _DOUBLE.unpack_from(buf, pos)[0], pos + 8
+        if tag == TAG_TRUE or tag == TAG_FALSE:
+            return tag == TAG_TRUE, pos
+        if tag == TAG_NULL:
+            return None, pos
+        raise ValueError(f"Invalid tag {tag} at offset {pos - 1}")
+
+    def object_value(self, pos: int, count: int) -> Tuple[Dict, int]:
+        result = {}
+        for _ in range(count):
+            index, pos = _read_varint(self.buf, pos)
+            result[self.string(index)], pos = self.value(pos)
+        return result, pos
+
+    def array_value(self, pos: int, count: int) -> Tuple[List, int]:
+        result = []
+        for _ in range(count):
+            item, pos = self.value(pos)
+            result.append(item)
+        return result, pos
+
+class _LazyObjectNode(ObjectNode):
+    # Children are only decoded when `pairs` is first touched
+    def __init__(self, snapshot: _Snapshot, pos: int, count: int):
+        self._snapshot = snapshot
+        self._pos = pos
+        self._count = count
+        self._pairs = None
+
+    @property
+    def pairs(self) -> Dict[str, ASTNode]:
+        if self._pairs is None:
+            snapshot = self._snapshot
+            pairs = {}
+            pos = self._pos
+            for _ in range(self._count):
+                index, pos = _read_varint(snapshot.buf, pos)
+                pairs[snapshot.string(index)], pos = snapshot.node(pos)
+            self._pairs = pairs
+        return self._pairs
+
+    @pairs.setter
+    def pairs(self, value: Dict[str, ASTNode]) -> None:
+        self._pairs = value
+
+    def evaluate(self) -> Dict:
+        if self._pairs is None:
+            return self._snapshot.object_value(self._pos, self._count)[0]
+        return super().evaluate()
+
+class _LazyArrayNode(ArrayNode):
+    def __init__(self, snapshot: _Snapshot, pos: int, count: int):
+        self._snapshot = snapshot
+        self._pos = pos
+        self._count = count
+        self._elements = None
+
+    @property
+    def elements(self) -> List[ASTNode]:
+        if self._elements is None:
+            snapshot = self._snapshot
+            elements = []
+            pos = self._pos
+            for _ in range(self._count):
+                element, pos = snapshot.node(pos)
+                elements.append(element)
+            self._elements = elements
+        return self._elements
+
+    @elements.setter
+    def elements(self, value: List[ASTNode]) -> None:
+        self._elements = value
+
+    def evaluate(self) -> List:
+        if self._elements is None:
+            return self._snapshot.array_value(self._pos, self._count)[0]
+        return super().evaluate()
+
+def load_binary(data: Buffer) -> ASTNode:
+    """Load a snapshot written by dump_binary without copying the buffer.
+
+    Containers are decoded lazily on first access to `pairs`/`elements`,
+    and evaluate() on an untouched container reads the buffer directly.
+    Strings are decoded from the shared table once, on first use.
+    """
+    snapshot = _Snapshot(data)
+    return snapshot.node(snapshot.tape_start)[0]
+
+def load_binary_file(path: str) -> ASTNode:
+    # The mapping stays alive for as long as any lazy node references it
+    with open(path, 'rb') as f:
+        data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    return load_binary(data)
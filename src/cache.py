@@ -0,0 +1,139 @@
+import hashlib
+import os
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Union
+from src.lexer import lex
+from src.parser import Parser
+from src.ast import ASTNode
+from src.binary import dump_binary, load_binary
+
+class CacheStats:
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.disk_hits = 0
+        self.disk_writes = 0
+
+    def as_dict(self) -> Dict[str, int]:
+        return dict(vars(self))
+
+    def __repr__(self):
+        return (f"CacheStats(hits={self.hits}, misses={self.misses}, evictions={self.evictions}, "
+                f"disk_hits={self.disk_hits}, disk_writes={self.disk_writes})")
+
+class ParseCache:
+    """Content-addressed cache of parse results.
+
+    Entries are keyed by a BLAKE2 hash of the input bytes and the parser
+    options, and stored as binary snapshots (see src.binary). Every lookup
+    loads a fresh tree from the snapshot, so callers may mutate what they
+    get back without affecting the cache. The in-memory tier is an LRU
+    bounded by entry count and total snapshot bytes; when `directory` is
+    given, snapshots are also written there next to an `index` file and
+    survive across processes.
+    """
+
+    INDEX_NAME = 'index'
+
+    def __init__(self, max_entries: int = 128, max_bytes: int = 64 * 1024 * 1024,
+                 directory: Optional[str] = None):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.directory = directory
+        self.stats = CacheStats()
+        self.bytes_used = 0
+        self._entries: 'OrderedDict[str, bytes]' = OrderedDict()
+        self._index: Dict[str, int] = {}
+        if directory is not None:
+            os.makedirs(directory, exist_ok=True)
+            self._load_index()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._entries or key in self._index
+
+    @staticmethod
+    def key(data: Union[str, bytes], **options: Any) -> str:
+        if isinstance(data, str):
+            data = data.encode('utf-8')
+        digest = hashlib.blake2b(data, digest_size=16)
+        if options:
+            digest.update(repr(sorted(options.items())).encode('utf-8'))
+        return digest.hexdigest()
+
+    def parse(self, data: Union[str, bytes], **options: Any) -> ASTNode:
+        key = self.key(data, **options)
+        snapshot = self._entries.get(key)
+        if snapshot is not None:
+            self._entries.move_to_end(key)
+            self.stats.hits += 1
+            return load_binary(snapshot)
+
+        snapshot = self._read_disk(key)
+        if snapshot is not None:
+            self.stats.disk_hits += 1
+        else:
+            self.stats.misses += 1
+            text = data.decode('utf-8') if isinstance(data, bytes) else data
+            snapshot = dump_binary(Parser(lex(text), **options).parse())
+            self._write_disk(key, snapshot)
+        self._store(key, snapshot)
+        return load_binary(snapshot)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self.bytes_used = 0
+
+    def _store(self, key: str, snapshot: bytes) -> None:
+        if len(snapshot) > self.max_bytes:
+            return
+        self._entries[key] = snapshot
+        self.bytes_used += len(snapshot)
+        while len(self._entries) > self.max_entries or self.bytes_used > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self.bytes_used -= len(evicted)
+            self.stats.evictions += 1
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key + '.jpb')
+
+    def _load_index(self) -> None:
+        path = os.path.join(self.directory, self.INDEX_NAME)
+        if not os.path.exists(path):
+            return
+        with open(path, encoding='ascii') as f:
+            for line in f:
+                key, _, size = line.strip().partition(' ')
+                if size.isdigit():
+                    self._index[key] = int(size)
+
+    def _read_disk(self, key: str) -> Optional[bytes]:
+        size = self._index.get(key)
+        if size is None:
+            return None
+        try:
+            with open(self._path(key), 'rb') as f:
+                snapshot = f.read()
+        except OSError:
+            snapshot = b''
+        if len(snapshot) != size:
+            # Missing or truncated file: forget it and parse again
+            del self._index[key]
+            return None
+        return snapshot
+
+    def _write_disk(self, key: str, snapshot: bytes) -> None:
+        if self.directory is None:
+            return
+        # Write then rename so a concurrent reader never sees a partial file
+        tmp_path = self._path(key) + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            f.write(snapshot)
+        os.replace(tmp_path, self._path(key))
+        with open(os.path.join(self.directory, self.INDEX_NAME), 'a', encoding='ascii') as f:
+            f.write(f"{key} {len(snapshot)}\n")
+        self._index[key] = len(snapshot)
+        self.stats.disk_writes += 1
@@ -0,0 +1,161 @@
+import argparse
+import sys
+
+def main():
+    arg_parser = argparse.ArgumentParser(description='JSON Parser CLI Tool')
+    arg_parser.add_argument('files', nargs='*', metavar='file',
+                            help='JSON files or glob patterns to parse (or stdin if not specified)')
+    arg_parser.add_argument('--pretty', action='store_true', help='Pretty print the output')
+    arg_parser.add_argument('--stream', action='store_true',
+                            help='Reformat chunk by chunk with memory bounded by nesting depth')
+    arg_parser.add_argument('--chunk-size', type=int, default=65536,
+                            help='Characters read per chunk in --stream and token-level modes')
+    token_modes = arg_parser.add_mutually_exclusive_group()
+    token_modes.add_argument('--validate', action='store_true',
+                             help='Only check that the input is valid JSON (exit status 0 or 1)')
+    token_modes.add_argument('--minify', action='store_true',
+                             help='Strip all insignificant whitespace, copying tokens verbatim')
+    token_modes.add_argument('--reformat', action='store_true',
+                             help='Re-indent the input, copying tokens verbatim')
+    arg_parser.add_argument('--indent', type=int, default=2, help='Indent width for --reformat and --pretty')
+    arg_parser.add_argument('-j', '--jobs', type=int,
+                            help='Worker processes used when several files are given (and by --serve)')
+    arg_parser.add_argument('--unordered', action='store_true',
+                            help='Report each file as soon as it finishes instead of in input order')
+    arg_parser.add_argument('--stats', action='store_true',
+                            help='Print per-phase timing and memory statistics to stderr')
+    arg_parser.add_argument('--stats-format', choices=('text', 'json'), default='text',
+                            help='Format of the --stats report')
+    daemon = arg_parser.add_mutually_exclusive_group()
+    daemon.add_argument('--serve', action='store_true',
+                        help='Run a parse daemon on a Unix socket until it has been idle for --idle-timeout')
+    daemon.add_argument('--client', action='store_true',
+                        help='Send the inputs to a running --serve daemon (falls back to parsing locally)')
+    arg_parser.add_argument('--socket', help='Unix socket path for --serve and --client')
+    arg_parser.add_argument('--idle-timeout', type=float, default=300.0,
+                            help='Seconds without requests before the --serve daemon exits')
+    arg_parser.add_argument('--follow', action='store_true',
+                            help='Follow an append-only NDJSON file, printing each new record as it is written')
+    arg_parser.add_argument('--checkpoint', help='File recording the --follow position, to resume after a restart')
+    arg_parser.add_argument('--poll-interval', type=float, default=0.5,
+                            help='Seconds between checks for new data in --follow mode')
+    args = arg_parser.parse_args()
+
+    if args.serve:
+        from src.server import serve
+        serve(args.socket, jobs=args.jobs, idle_timeout=args.idle_timeout)
+        return
+
+    if args.follow:
+        if len(args.files) != 1:
+            arg_parser.error('--follow needs exactly one file')
+        _run_follow(args.files[0], args.checkpoint, args.poll_interval, args.indent if args.pretty else None)
+        return
+
+    from src.batch import convert, expand_paths
+    if args.validate:
+        mode = 'validate'
+    elif args.minify:
+        mode = 'minify'
+    elif args.reformat:
+        mode = 'reformat'
+    elif args.stream:
+        mode = 'stream'
+    else:
+        mode = 'parse'
+    indent = args.indent if args.pretty or args.reformat else None
+    paths = expand_paths(args.files)
+    batch = len(paths) > 1 or paths != args.files
+    if args.stats and (batch or mode != 'parse' or args.client):
+        arg_parser.error('--stats needs a single local input in the default parse mode')
+
+    from src.compression import open_input
+    stdin = None
+    if args.client:
+        from src.client import request_many
+        body = b'' if paths else sys.stdin.buffer.read()
+        items = [(path, b'') for path in paths] or [(None, body)]
+        try:
+            responses = request_many(items, args.socket, mode=mode, indent=indent, chunk_size=args.chunk_size)
+        except OSError:
+            # No daemon listening: do the work here instead
+            import io
+            stdin = open_input(io.BytesIO(body))
+        else:
+            _report_responses(paths, responses)
+            return
+
+    if batch:
+        _run_batch(paths, args.jobs or 1, args.unordered, mode=mode, indent=indent, chunk_size=args.chunk_size)
+        return
+
+    try:
+        if args.stats:
+            _run_stats(paths, args.stats_format, indent)
+        elif paths:
+            with open_input(paths[0], args.chunk_size) as source:
+                convert(source, sys.stdout.write, mode, indent, args.chunk_size)
+        else:
+            convert(stdin or open_input(sys.stdin.buffer, args.chunk_size), sys.stdout.write, mode, indent,
+                    args.chunk_size)
+    except Exception as e:
+        print(f"Error: {str(e)}", file=sys.stderr)
+        sys.exit(1)
+
+def _run_stats(paths, output_format, indent):
+    import json
+    from src.compression import open_input
+    from src.stats import collect_stats
+    with open_input(paths[0] if paths else sys.stdin.buffer) as source:
+        text = source.read()
+    output, stats = collect_stats(text, encode=lambda value: json.dumps(value, indent=indent))
+    print(output)
+    print(stats.to_json() if output_format == 'json' else stats.format_text(), file=sys.stderr)
+
+def _run_follow(path, checkpoint_path, poll_interval, indent):
+    import json
+    from src.follow import Checkpoint, follow
+    try:
+        for result in follow(path, Checkpoint(checkpoint_path), poll_interval=poll_interval):
+            if result.ok:
+                sys.stdout.write(json.dumps(result.value.evaluate(), indent=indent))
+                sys.stdout.write('\n')
+                sys.stdout.flush()
+            else:
+                print(f"Error: {result.error}", file=sys.stderr)
+    except KeyboardInterrupt:
+        pass
+
+def _report_responses(paths, responses):
+    failed = False
+    try:
+        for index, (ok, output) in enumerate(responses):
+            if ok:
+                sys.stdout.write(output)
+                sys.stdout.flush()
+            else:
+                failed = True
+                prefix = f"{paths[index]}: " if len(paths) > 1 else ''
+                print(f"Error: {prefix}{output}", file=sys.stderr)
+    except OSError as e:
+        print(f"Error: lost connection to the server: {e}", file=sys.stderr)
+        failed = True
+    if failed:
+        sys.exit(1)
+
+def _run_batch(paths, jobs, unordered, **options):
+    from src.batch import BatchSummary, run_batch
+    summary = BatchSummary()
+    for result in run_batch(paths, jobs=jobs, ordered=not unordered, **options):
+        summary.add(result)
+        if result.ok:
+            sys.stdout.write(result.output)
+            sys.stdout.flush()
+        else:
+            print(f"Error: {result.path}: {result.error}", file=sys.stderr)
+    print(summary, file=sys.stderr)
+    if summary.failed:
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,84 @@
+from __future__ import annotations
+import os
+import socket
+import stat
+import struct
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Iterable, Iterator, Optional, Tuple
+
+# Wire format: every frame is a 4-byte big-endian length followed by that
+# many bytes. A request is two frames: a header of NUL-separated fields
+# (mode, indent, chunk size, path) and a body holding the document, empty
+# when the server should read `path` itself. The response is one frame: a
+# status byte (0 ok, 1 error) and then the output or the error message.
+#
+# This module is all a client needs, and imports nothing heavier than
+# socket, so talking to a running daemon costs less than parsing locally.
+_LENGTH = struct.Struct('>I')
+_OK, _ERROR = b'\x00', b'\x01'
+
+def default_socket_path() -> str:
+    """Per-user socket path: in $XDG_RUNTIME_DIR, or else a private directory under the temp dir."""
+    runtime = os.environ.get('XDG_RUNTIME_DIR')
+    if runtime and os.path.isdir(runtime):
+        return os.path.join(runtime, 'jsonparse.sock')
+    import tempfile
+    return os.path.join(tempfile.gettempdir(), f'jsonparse-{os.getuid()}', 'jsonparse.sock')
+
+def _check_owner(socket_path: str) -> None:
+    # Never hand paths and documents to a server some other user started
+    info = os.lstat(socket_path)
+    if not stat.S_ISSOCK(info.st_mode) or info.st_uid != os.getuid():
+        raise PermissionError(f"{socket_path} is not a socket owned by this user")
+
+def _encode_header(mode: str, indent: Optional[int], chunk_size: int, path: Optional[str]) -> bytes:
+    fields = (mode, '' if indent is None else str(indent), str(chunk_size), path or '')
+    return '\0'.join(fields).encode('utf-8')
+
+def _recv_exactly(conn: socket.socket, size: int) -> bytes:
+    data = bytearray()
+    while len(data) < size:
+        chunk = conn.recv(size - len(data))
+        if not chunk:
+            raise ConnectionError("Server closed the connection")
+        data += chunk
+    return bytes(data)
+
+def request_many(items: Iterable[Tuple[Optional[str], bytes]], socket_path: Optional[str] = None,
+                 mode: str = 'parse', indent: Optional[int] = None,
+                 chunk_size: int = 65536) -> Iterator[Tuple[bool, str]]:
+    """Send (path, body) requests over one connection and yield (ok, output) for each, in order.
+
+    Give either a path the server can read (made absolute here) or the
+    document itself as body. Raises OSError right away if no server is
+    listening, or PermissionError if the socket belongs to another user.
+    """
+    socket_path = socket_path or default_socket_path()
+    _check_owner(socket_path)
+    conn = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        conn.connect(socket_path)
+    except OSError:
+        conn.close()
+        raise
+    return _exchange(conn, items, mode, indent, chunk_size)
+
+def _exchange(conn: socket.socket, items: Iterable[Tuple[Optional[str], bytes]], mode: str,
+              indent: Optional[int], chunk_size: int) -> Iterator[Tuple[bool, str]]:
+    try:
+        count = 0
+        for path, body in items:
+            header = _encode_header(mode, indent, chunk_size, os.path.abspath(path) if path else None)
+            conn.sendall(_LENGTH.pack(len(header)) + header + _LENGTH.pack(len(body)) + body)
+            count += 1
+        conn.shutdown(socket.SHUT_WR)
+        for _ in range(count):
+            size, = _LENGTH.unpack(_recv_exactly(conn, _LENGTH.size))
+            payload = _recv_exactly(conn, size)
+            yield payload[:1] == _OK, payload[1:].decode('utf-8')
+    finally:
+        conn.close()
+
+def request(body: bytes = b'', path: Optional[str] = None, **options) -> Tuple[bool, str]:
+    return next(request_many([(path, body)], **options))
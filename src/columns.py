@@ -0,0 +1,193 @@
+from array import array
+from typing import Any, Dict, List
+from src.lexer import Token, lex
+from src.parser import Parser, is_integer_literal
+
+# Column kinds, in the order a column can be promoted through them
+_TYPECODES = {'bool': 'b', 'int': 'q', 'float': 'd'}
+_DEFAULTS = {'bool': False, 'int': 0, 'float': 0.0, 'str': '', 'object': None}
+
+def _kind_of(value: Any) -> str:
+    if isinstance(value, bool):
+        return 'bool'
+    if isinstance(value, int):
+        return 'int'
+    if isinstance(value, float):
+        return 'float'
+    if isinstance(value, str):
+        return 'str'
+    return 'object'
+
+class Column:
+    """One field of a record array.
+
+    Numbers and booleans live in typed `array`s, strings and anything else
+    in a list. `mask` has a 1 for every row holding a value and a 0 for
+    rows where the field was null or missing (those rows hold a default
+    in `data`). The kind is promoted as values arrive: int -> float, and
+    anything mixed -> object.
+    """
+
+    def __init__(self, name: str, rows: int = 0):
+        self.name = name
+        self.kind = 'null'
+        self.data: Any = [None] * rows
+        self.mask = bytearray(rows)
+
+    def __len__(self) -> int:
+        return len(self.mask)
+
+    def __getitem__(self, row: int) -> Any:
+        return self.data[row] if self.mask[row] else None
+
+    def __repr__(self):
+        return f"Column({self.name!r}, kind={self.kind!r}, rows={len(self)})"
+
+    def to_list(self) -> List[Any]:
+        return [value if present else None for value, present in zip(self.data, self.mask)]
+
+    def append(self, value: Any) -> None:
+        if value is None:
+            self.data.append(_DEFAULTS.get(self.kind))
+            self.mask.append(0)
+            return
+        kind = _kind_of(value)
+        if kind != self.kind:
+            self._promote(kind)
+        try:
+            if self.kind == 'float' and kind == 'int':
+                value = float(value)
+            self.data.append(value)
+        except OverflowError:
+            # Integer beyond 64 bits, or beyond a float's range in a float column
+            self._promote('object')
+            self.data.append(value)
+        self.mask.append(1)
+
+    def replace_last(self, value: Any) -> None:
+        # Duplicate key within one record: the last value wins
+        self.data.pop()
+        self.mask.pop()
+        self.append(value)
+
+    def _promote(self, kind: str) -> None:
+        current = self.kind
+        if current == 'null':
+            target = kind
+        elif {current, kind} == {'int', 'float'}:
+            target = 'float'
+        else:
+            target = 'object'
+        if target == current:
+            return
+        if current == 'null':
+            default = _DEFAULTS[target]
+            values = [default] * len(self.data)
+        elif target == 'object':
+            values = self.to_list()
+        else:
+            values = self.data
+        self.kind = target
+        typecode = _TYPECODES.get(target)
+        self.data = array(typecode, values) if typecode else list(values)
+
+    def to_numpy(self):
+        """Return a NumPy array, masked where the column has nulls.
+
+        Numeric and boolean columns share memory with `data`.
+        """
+        try:
+            import numpy
+        except ImportError:
+            raise ImportError("Column.to_numpy() requires numpy to be installed")
+        if self.kind in _TYPECODES:
+            dtype = {'bool': numpy.bool_, 'int': numpy.int64, 'float': numpy.float64}[self.kind]
+            values = numpy.frombuffer(self.data, dtype=numpy.int8 if self.kind == 'bool' else dtype)
+            values = values.astype(dtype, copy=False)
+        else:
+            values = numpy.empty(len(self.data), dtype=object)
+            values[:] = self.data
+        if all(self.mask):
+            return values
+        missing = numpy.frombuffer(self.mask, dtype=numpy.uint8) == 0
+        return numpy.ma.array(values, mask=missing)
+
+def _number(lexeme: str) -> Any:
+    return int(lexeme) if is_integer_literal(lexeme) else float(lexeme)
+
+def columns_from_tokens(tokens: List[Token]) -> Dict[str, Column]:
+    columns: Dict[str, Column] = {}
+    parser = Parser(tokens)
+    parser.prepare_decode()
+    rows = 0
+
+    def expect(index: int, expected_type: str) -> None:
+        if tokens[index].type != expected_type:
+            raise ValueError(f"Expected {expected_type}, but got {tokens[index].type}")
+
+    expect(0, 'LEFT_BRACKET')
+    i = 1
+    if tokens[i].type == 'RIGHT_BRACKET':
+        i += 1
+    else:
+        while True:
+            if tokens[i].type != 'LEFT_BRACE':
+                raise ValueError(f"Expected object record, but got {tokens[i].type}")
+            i += 1
+            if tokens[i].type != 'RIGHT_BRACE':
+                while True:
+                    key = tokens[i]
+                    if key.type != 'STRING':
+                        raise ValueError("Expected string key in object")
+                    expect(i + 1, 'COLON')
+                    token = tokens[i + 2]
+                    i += 3
+                    kind = token.type
+                    if kind == 'STRING':
+                        value = token.value
+                    elif kind == 'NUMBER':
+                        value = _number(token.value)
+                    elif kind == 'BOOLEAN':
+                        value = token.value == 'true'
+                    elif kind == 'NULL':
+                        value = None
+                    else:
+                        # Nested container: decode it like json.loads, so its numbers match the columns'
+                        parser.current = i - 1
+                        value = parser.decode_value()
+                        i = parser.current
+
+                    column = columns.get(key.value)
+                    if column is None:
+                        column = columns[key.value] = Column(key.value, rows)
+                    if len(column) > rows:
+                        column.replace_last(value)
+                    else:
+                        column.append(value)
+
+                    if tokens[i].type == 'RIGHT_BRACE':
+                        break
+                    expect(i, 'COMMA')
+                    i += 1
+            i += 1
+            rows += 1
+            for column in columns.values():
+                if len(column) < rows:
+                    column.append(None)
+
+            if tokens[i].type == 'RIGHT_BRACKET':
+                i += 1
+                break
+            expect(i, 'COMMA')
+            i += 1
+    if tokens[i].type != 'EOF':
+        raise ValueError("Unexpected tokens after parsing completed")
+    return columns
+
+def parse_columns(json_string: str) -> Dict[str, Column]:
+    """Parse a top-level array of objects straight into per-field columns.
+
+    No per-record dict is built; nested values inside a field are decoded
+    with Parser.decode_value() and stored in an object column.
+    """
+    return columns_from_tokens(lex(json_string))
@@ -0,0 +1,201 @@
+from __future__ import annotations
+import io
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import BinaryIO, IO, Optional, Tuple, Union
+    from src.ast import ASTNode
+
+# Leading bytes of each supported container format
+MAGIC = {
+    'gzip': b'\x1f\x8b',
+    'bz2': b'BZh',
+    'xz': b'\xfd7zXZ\x00',
+}
+
+def detect_compression(prefix: bytes) -> Optional[str]:
+    """Name the compression format `prefix` starts with, or None for plain data."""
+    for name, magic in MAGIC.items():
+        if prefix.startswith(magic):
+            return name
+    return None
+
+def _open_compressed(name: str, raw: BinaryIO) -> BinaryIO:
+    if name == 'gzip':
+        import gzip
+        return gzip.GzipFile(fileobj=raw, mode='rb')
+    if name == 'bz2':
+        import bz2
+        return bz2.BZ2File(raw, mode='rb')
+    import lzma
+    return lzma.LZMAFile(raw, mode='rb')
+
+CLOSE_TIMEOUT = 0.5  # seconds close() waits for the decompression thread
+
+class _Prefixed(io.RawIOBase):
+    # Serves bytes already read for sniffing before the rest of `raw`
+    def __init__(self, prefix: bytes, raw: BinaryIO):
+        self._prefix = prefix
+        self._raw = raw
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        if self._prefix:
+            size = min(len(buffer), len(self._prefix))
+            buffer[:size] = self._prefix[:size]
+            self._prefix = self._prefix[size:]
+            return size
+        data = self._raw.read(len(buffer))
+        buffer[:len(data)] = data
+        return len(data)
+
+    def close(self) -> None:
+        if not self.closed:
+            self._raw.close()
+        super().close()
+
+def _sniff(raw: BinaryIO) -> Tuple[bytes, BinaryIO]:
+    # A pipe or socket may have fewer than six bytes ready; read until it does or ends
+    peek = getattr(raw, 'peek', None)
+    if peek is not None:
+        prefix = peek(6)[:6]
+        if len(prefix) == 6:
+            return prefix, raw
+    prefix = b''
+    while len(prefix) < 6:
+        data = raw.read(6 - len(prefix))
+        if not data:
+            break
+        prefix += data
+    return prefix, io.BufferedReader(_Prefixed(prefix, raw))
+
+class DecompressingReader(io.TextIOBase):
+    """Text reader over a compressed byte stream, decompressed on a background thread.
+
+    The thread decompresses and decodes `chunk_size` bytes at a time into
+    a queue holding at most `queue_size` chunks, so decompression overlaps
+    with whatever consumes the text (zlib, bz2 and lzma release the GIL
+    while they work) and memory stays bounded by the queue. read(n) may
+    return fewer than n characters; it returns '' only at the end.
+    """
+
+    decompressed = True
+
+    def __init__(self, raw: BinaryIO, name: str, chunk_size: int = 65536, queue_size: int = 8):
+        import queue
+        import threading
+        self.compression = name
+        self._raw = raw
+        self._chunk_size = chunk_size
+        self._queue: queue.Queue = queue.Queue(maxsize=queue_size)
+        self._pending = ''
+        self._done = False
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._produce, name=f'{name}-decompress', daemon=True)
+        self._thread.start()
+
+    def _put(self, item) -> None:
+        # Gives up once the reader is closed, so a full queue cannot strand the thread
+        import queue
+        while not self._stop.is_set():
+            try:
+                self._queue.put(item, timeout=0.05)
+                return
+            except queue.Full:
+                pass
+
+    def _produce(self) -> None:
+        import codecs
+        decoder = codecs.getincrementaldecoder('utf-8')()
+        put = self._put
+        try:
+            with _open_compressed(self.compression, self._raw) as stream:
+                while not self._stop.is_set():
+                    data = stream.read(self._chunk_size)
+                    text = decoder.decode(data, final=not data)
+                    if text:
+                        put(text)
+                    if not data:
+                        break
+            put(None)
+        except BaseException as e:
+            put(e)
+        finally:
+            if self._stop.is_set():
+                # close() may have given up waiting while a read was blocked
+                self._raw.close()
+
+    def _next_chunk(self) -> str:
+        if self._done:
+            return ''
+        item = self._queue.get()
+        if item is None:
+            self._done = True
+            return ''
+        if isinstance(item, BaseException):
+            self._done = True
+            raise item
+        return item
+
+    def readable(self) -> bool:
+        return True
+
+    def read(self, size: Optional[int] = -1) -> str:
+        if size is None or size < 0:
+            parts = [self._pending]
+            self._pending = ''
+            while True:
+                chunk = self._next_chunk()
+                if not chunk:
+                    return ''.join(parts)
+                parts.append(chunk)
+        text = self._pending or self._next_chunk()
+        self._pending = text[size:]
+        return text[:size]
+
+    def readline(self, size: Optional[int] = -1) -> str:
+        parts = []
+        while True:
+            text = self._pending or self._next_chunk()
+            if not text:
+                break
+            end = text.find('\n') + 1
+            if end:
+                parts.append(text[:end])
+                self._pending = text[end:]
+                break
+            parts.append(text)
+            self._pending = ''
+        return ''.join(parts)
+
+    def close(self) -> None:
+        if not self.closed:
+            self._stop.set()
+            self._thread.join(CLOSE_TIMEOUT)
+            if not self._thread.is_alive():
+                self._raw.close()
+            # Otherwise the producer is blocked reading a pipe or socket; closing
+            # a buffered stream mid-read would block here too, so the thread
+            # closes `raw` itself once that read returns
+        super().close()
+
+def open_input(source: Union[str, BinaryIO], chunk_size: int = 65536, queue_size: int = 8) -> IO[str]:
+    """Open a path or binary stream as text, decompressing gzip, bz2 or xz on the fly.
+
+    The format is detected from the magic bytes, not the file name. Plain
+    input is returned as an ordinary UTF-8 text stream. As with
+    io.TextIOWrapper, closing the returned reader closes `source`.
+    """
+    raw = open(source, 'rb') if isinstance(source, str) else source
+    prefix, raw = _sniff(raw)
+    name = detect_compression(prefix)
+    if name is None:
+        return io.TextIOWrapper(raw, encoding='utf-8')
+    return DecompressingReader(raw, name, chunk_size, queue_size)
+
+def parse_file(source: Union[str, BinaryIO], chunk_size: int = 65536) -> ASTNode:
+    """Parse a possibly compressed file without holding all of its text in memory."""
+    from src.stream import parse_stream
+    with open_input(source, chunk_size) as text:
+        return parse_stream(text, chunk_size)
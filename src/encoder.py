@@ -0,0 +1,281 @@
+from __future__ import annotations
+import re
+from src.ast import ASTNode, ObjectNode, ArrayNode, StringNode, NumberNode, BooleanNode, NullNode, RecordNode
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Any, Callable, Dict, IO, Iterator, List, Optional, Tuple
+
+# Anything json.dumps would escape, with and without ensure_ascii
+_NEEDS_ESCAPE = re.compile(r'[\x00-\x1f"\\]')
+_NEEDS_ESCAPE_ASCII = re.compile(r'[^ !#-\[\]-~]')
+_ESCAPES = {code: f'\\u{code:04x}' for code in range(0x20)}
+_ESCAPES.update({ord('"'): '\\"', ord('\\'): '\\\\', ord('\b'): '\\b', ord('\f'): '\\f',
+                 ord('\n'): '\\n', ord('\r'): '\\r', ord('\t'): '\\t'})
+
+def _escape_code_point(code: int) -> str:
+    if code < 0x10000:
+        return f'\\u{code:04x}'
+    code -= 0x10000
+    return f'\\u{0xd800 | (code >> 10):04x}\\u{0xdc00 | (code & 0x3ff):04x}'
+
+_TRANSLATE = dict(_ESCAPES)
+# str.translate table for ensure_ascii. Non-ASCII code points are added the
+# first time they are seen; a plain dict translates much faster than one
+# with __missing__, and entries never change once written.
+_TRANSLATE_ASCII = {code: chr(code) for code in range(0x7f)}
+_TRANSLATE_ASCII.update(_ESCAPES)
+_TRANSLATE_ASCII[0x7f] = '\\u007f'
+
+def _encode_ascii(value: str) -> str:
+    if _NEEDS_ESCAPE_ASCII.search(value) is None:
+        return '"' + value + '"'
+    encoded = value.translate(_TRANSLATE_ASCII)
+    if not encoded.isascii():
+        for char in set(encoded):
+            if not char.isascii():
+                _TRANSLATE_ASCII[ord(char)] = _escape_code_point(ord(char))
+        encoded = value.translate(_TRANSLATE_ASCII)
+    return '"' + encoded + '"'
+
+def _encode_unicode(value: str) -> str:
+    if _NEEDS_ESCAPE.search(value) is None:
+        return '"' + value + '"'
+    return '"' + value.translate(_TRANSLATE) + '"'
+
+def encode_string(value: str, ensure_ascii: bool = True) -> str:
+    """Quote and escape `value` exactly like json.dumps."""
+    return _encode_ascii(value) if ensure_ascii else _encode_unicode(value)
+
+_float_repr = float.__repr__
+_int_repr = int.__repr__
+_END = object()
+_INFINITY = float('inf')
+
+class Encoder:
+    """JSON encoder for Python values and AST nodes.
+
+    Output matches json.dumps with the same options. AST nodes are encoded
+    directly, without evaluate(); untouched lazy nodes from load_binary()
+    are decoded straight from their snapshot. Encoded keys are cached per
+    encoder, so reusing one encoder for similar documents saves work.
+    Nesting is handled with an explicit stack, not recursion.
+    """
+
+    KEY_CACHE_SIZE = 4096
+
+    def __init__(self, indent: Optional[int] = None, separators: Optional[Tuple[str, str]] = None,
+                 ensure_ascii: bool = True, sort_keys: bool = False, allow_nan: bool = True,
+                 check_circular: bool = True, default: Optional[Callable[[Any], Any]] = None):
+        self.indent = indent
+        if separators is None:
+            separators = (',', ': ') if indent is not None else (', ', ': ')
+        self.item_separator, self.key_separator = separators
+        self.ensure_ascii = ensure_ascii
+        self.sort_keys = sort_keys
+        self.allow_nan = allow_nan
+        self.check_circular = check_circular
+        self.default = default
+        self._keys: Dict[str, str] = {}
+
+    def encode(self, obj: Any) -> str:
+        return ''.join(self.iterencode(obj, chunk_size=1 << 30))
+
+    def iterencode(self, obj: Any, chunk_size: int = 8192) -> Iterator[str]:
+        """Yield the encoding of `obj` in pieces of roughly `chunk_size` parts."""
+        parts: List[str] = []
+        append = parts.append
+        string = _encode_ascii if self.ensure_ascii else _encode_unicode
+        special_float = self._float
+        keys = self._keys
+        key_of = self._key
+        indent = self.indent
+        item_separator = self.item_separator
+        # Frames of open containers: [children iterator, is_object, closing text, marker]
+        stack: List[list] = []
+        markers = {} if self.check_circular else None
+        newlines = ['\n']
+        value = obj
+
+        while True:
+            kind = type(value)
+            children = None
+            if kind is str:
+                append(string(value))
+            elif kind is float:
+                append(_float_repr(value) if value - value == 0.0 else special_float(value))
+            elif kind is int:
+                append(_int_repr(value))
+            elif value is None:
+                append('null')
+            elif value is True:
+                append('true')
+            elif value is False:
+                append('false')
+            elif kind is dict:
+                children, is_object = self._items(value), True
+            elif kind is list or kind is tuple:
+                children, is_object = value, False
+            elif isinstance(value, ASTNode):
+                if isinstance(value, StringNode):
+                    append(string(value.value))
+                elif isinstance(value, (NumberNode, BooleanNode, NullNode)):
+                    value = value.evaluate()
+                    continue
+                elif isinstance(value, ObjectNode):
+                    if type(value) is RecordNode and value.values is not None:
+                        pairs = zip(value.shape.keys, value.values)
+                        children = sorted(pairs) if self.sort_keys else pairs
+                        is_object = True
+                    elif getattr(value, '_snapshot', None) is not None and value._pairs is None:
+                        value = value.evaluate()  # untouched lazy node: decode the tape directly
+                        continue
+                    else:
+                        children, is_object = self._items(value.pairs), True
+                elif isinstance(value, ArrayNode):
+                    if getattr(value, '_snapshot', None) is not None and value._elements is None:
+                        value = value.evaluate()
+                        continue
+                    children, is_object = value.elements, False
+                else:
+                    raise TypeError(f"Object of type {kind.__name__} is not JSON serializable")
+            elif isinstance(value, str):
+                append(string(str(value)))
+            elif isinstance(value, int):  # bool was handled above
+                append(_int_repr(value))
+            elif isinstance(value, float):
+                append(self._float(value))
+            elif isinstance(value, dict):
+                children, is_object = self._items(value), True
+            elif isinstance(value, (list, tuple)):
+                children, is_object = value, False
+            else:
+                if self.default is None:
+                    raise TypeError(f"Object of type {kind.__name__} is not JSON serializable")
+                converted = self.default(value)
+                if markers is not None and converted is value:
+                    raise ValueError("Circular reference detected")
+                value = converted
+                continue
+
+            if children is not None:
+                if markers is not None:
+                    marker = id(value)
+                    if marker in markers:
+                        raise ValueError("Circular reference detected")
+                    markers[marker] = value
+                else:
+                    marker = None
+                depth = len(stack) + 1
+                if indent is not None:
+                    while len(newlines) <= depth:
+                        newlines.append('\n' + ' ' * (indent * len(newlines)))
+                iterator = iter(children)
+                first = next(iterator, _END)
+                if first is _END:
+                    append('{}' if is_object else '[]')
+                    if marker is not None:
+                        del markers[marker]
+                else:
+                    append('{' if is_object else '[')
+                    if indent is not None:
+                        append(newlines[depth])
+                    closing = (newlines[depth - 1] if indent is not None else '') + ('}' if is_object else ']')
+                    stack.append([iterator, is_object, closing, marker])
+                    if is_object:
+                        key, value = first
+                        encoded = keys.get(key)
+                        append(encoded if encoded is not None else key_of(key))
+                    else:
+                        value = first
+                    continue
+
+            # The value is written: continue with its siblings. Scalars are
+            # written here directly; containers and anything unusual go back
+            # to the top of the outer loop.
+            descend = False
+            while stack:
+                frame = stack[-1]
+                is_object = frame[1]
+                separator = item_separator if indent is None else item_separator + newlines[len(stack)]
+                for child in frame[0]:
+                    append(separator)
+                    if is_object:
+                        key, child = child
+                        encoded = keys.get(key)
+                        append(encoded if encoded is not None else key_of(key))
+                    kind = type(child)
+                    if kind is str:
+                        append(string(child))
+                    elif kind is StringNode:
+                        append(string(child.value))
+                    elif kind is NumberNode and type(child.value) is float:
+                        number = child.value
+                        append(_float_repr(number) if number - number == 0.0 else special_float(number))
+                    elif kind is float:
+                        append(_float_repr(child) if child - child == 0.0 else special_float(child))
+                    elif kind is int:
+                        append(_int_repr(child))
+                    elif child is None:
+                        append('null')
+                    elif child is True:
+                        append('true')
+                    elif child is False:
+                        append('false')
+                    else:
+                        value = child
+                        descend = True
+                        break
+                    if len(parts) >= chunk_size:
+                        yield ''.join(parts)
+                        parts.clear()
+                if descend:
+                    break
+                append(frame[2])
+                if frame[3] is not None:
+                    del markers[frame[3]]
+                stack.pop()
+            if not descend:
+                break
+            if len(parts) >= chunk_size:
+                yield ''.join(parts)
+                parts.clear()
+        if parts:
+            yield ''.join(parts)
+
+    def _float(self, value: float) -> str:
+        if value != value or value in (_INFINITY, -_INFINITY):
+            if not self.allow_nan:
+                raise ValueError(f"Out of range float values are not JSON compliant: {value!r}")
+            return 'NaN' if value != value else ('Infinity' if value > 0 else '-Infinity')
+        return _float_repr(value)
+
+    def _items(self, mapping: Dict) -> Any:
+        return sorted(mapping.items()) if self.sort_keys else mapping.items()
+
+    def _key(self, key: Any) -> str:
+        if isinstance(key, str):
+            text = key
+        elif key is True or key is False or key is None:
+            text = {True: 'true', False: 'false', None: 'null'}[key]
+        elif isinstance(key, float):
+            text = self._float(key)
+        elif isinstance(key, int):
+            text = _int_repr(key)
+        else:
+            raise TypeError(f"keys must be str, int, float, bool or None, not {type(key).__name__}")
+        encoded = encode_string(text, self.ensure_ascii) + self.key_separator
+        # Only str keys are cached: 1, 1.0 and True are equal as dict keys but encode differently
+        if type(key) is str and len(self._keys) < self.KEY_CACHE_SIZE:
+            self._keys[key] = encoded
+        return encoded
+
+def dumps(obj: Any, **options: Any) -> str:
+    """Encode a Python value or AST node; options are those of json.dumps."""
+    return Encoder(**options).encode(obj)
+
+def dump(obj: Any, fp: IO[str], chunk_size: int = 8192, **options: Any) -> None:
+    for chunk in Encoder(**options).iterencode(obj, chunk_size):
+        fp.write(chunk)
+
+def iterencode(obj: Any, chunk_size: int = 8192, **options: Any) -> Iterator[str]:
+    return Encoder(**options).iterencode(obj, chunk_size)
@@ -0,0 +1,157 @@
+from __future__ import annotations
+import os
+import time
+from src.batch import DocumentResult
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import BinaryIO, Iterator, List, Optional
+
+class Checkpoint:
+    """Position reached in a followed file: its device/inode and a byte offset.
+
+    The offset always sits just after a complete line. With a `path` the
+    checkpoint is loaded from and saved to that file (write then rename,
+    so a crash never leaves a torn checkpoint); without one it lives in
+    memory only.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path
+        self.device = 0
+        self.inode = 0
+        self.offset = 0
+        if path is not None:
+            self.load()
+
+    def load(self) -> bool:
+        import json
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                data = json.load(f)
+            self.device, self.inode, self.offset = int(data['device']), int(data['inode']), int(data['offset'])
+        except (OSError, ValueError, KeyError, TypeError):
+            # Missing or unreadable: start from scratch
+            return False
+        return True
+
+    def save(self) -> None:
+        if self.path is None:
+            return
+        from src.encoder import dumps
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(dumps({'device': self.device, 'inode': self.inode, 'offset': self.offset}))
+        os.replace(tmp_path, self.path)
+
+    def matches(self, stat: os.stat_result) -> bool:
+        return (self.device, self.inode) == (stat.st_dev, stat.st_ino)
+
+    def __repr__(self):
+        return f"Checkpoint(device={self.device}, inode={self.inode}, offset={self.offset})"
+
+def _parse_line(line: bytes) -> DocumentResult:
+    from src.lexer import lex
+    from src.parser import Parser
+    try:
+        return DocumentResult(Parser(lex(line.decode('utf-8'))).parse())
+    except Exception as e:
+        return DocumentResult(error=str(e))
+
+def _open(path: str) -> Optional[BinaryIO]:
+    try:
+        return open(path, 'rb')
+    except FileNotFoundError:
+        return None
+
+def _stat(path: str) -> Optional[os.stat_result]:
+    try:
+        return os.stat(path)
+    except FileNotFoundError:
+        return None
+
+def _records(lines: bytes) -> List[DocumentResult]:
+    results = []
+    for line in lines.split(b'\n'):
+        if line.strip():
+            results.append(_parse_line(line))
+    return results
+
+def follow(path: str, checkpoint: Optional[Checkpoint] = None, poll_interval: float = 0.5,
+           idle_timeout: Optional[float] = None, chunk_size: int = 65536) -> Iterator[DocumentResult]:
+    """Yield one DocumentResult per NDJSON record appended to `path`, like tail -F.
+
+    Reading resumes from `checkpoint` when it still names the same file
+    and the file has not shrunk below its offset; otherwise it starts at
+    the beginning. An unterminated last line is held back until its
+    newline arrives. Blank lines are skipped. A malformed record gives a
+    result with `error` set and the stream goes on. Each record is parsed
+    on its own with lex() and Parser.
+
+    When the path is renamed away or replaced (rotation), the rest of the
+    old file is read and then the new file is followed from its start. A
+    file that shrinks (truncation) is re-read from the start. The
+    checkpoint is saved after each batch of records has been consumed, so
+    records are delivered at least once across restarts. With
+    `idle_timeout` the iterator ends after that many seconds without new
+    data; otherwise it polls every `poll_interval` seconds forever.
+    """
+    if checkpoint is None:
+        checkpoint = Checkpoint()
+    f = None
+    pending = b''
+    last_data = time.monotonic()
+    try:
+        while True:
+            if f is None:
+                f = _open(path)
+                if f is not None:
+                    stat = os.fstat(f.fileno())
+                    if not checkpoint.matches(stat) or stat.st_size < checkpoint.offset:
+                        checkpoint.device, checkpoint.inode, checkpoint.offset = stat.st_dev, stat.st_ino, 0
+                    f.seek(checkpoint.offset)
+                    pending = b''
+
+            data = f.read(chunk_size) if f is not None else b''
+            if data:
+                last_data = time.monotonic()
+                pending += data
+                end = pending.rfind(b'\n') + 1
+                if end:
+                    lines, pending = pending[:end], pending[end:]
+                    yield from _records(lines)
+                    # Only reached once the consumer asked for more, i.e. took every record above
+                    checkpoint.offset += end
+                    checkpoint.save()
+                continue
+
+            if f is not None:
+                stat = os.fstat(f.fileno())
+                if stat.st_size < checkpoint.offset + len(pending):
+                    # Truncated in place: start over from the top
+                    f.seek(0)
+                    checkpoint.offset = 0
+                    pending = b''
+                    checkpoint.save()
+                    continue
+                current = _stat(path)
+                if current is None or (current.st_dev, current.st_ino) != (stat.st_dev, stat.st_ino):
+                    # Rotated: the old file is drained, so finish its last line and switch
+                    if f.read(1):
+                        f.seek(-1, os.SEEK_CUR)
+                        continue
+                    if pending.strip():
+                        yield from _records(pending)
+                    f.close()
+                    f = None
+                    checkpoint.offset = 0
+                    if current is not None:
+                        checkpoint.device, checkpoint.inode = current.st_dev, current.st_ino
+                    checkpoint.save()
+                    continue
+
+            if idle_timeout is not None and time.monotonic() - last_data >= idle_timeout:
+                return
+            time.sleep(poll_interval)
+    finally:
+        if f is not None:
+            f.close()
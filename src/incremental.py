@@ -0,0 +1,151 @@
+from typing import List, Optional, Tuple, Union
+from src.lexer import lex, LexerError
+from src.parser import Parser
+from src.ast import ASTNode, ObjectNode, ArrayNode, NullNode
+
+Path = Tuple[Union[str, int], ...]
+
+def _children(node: ASTNode) -> List[Tuple[Union[str, int], ASTNode]]:
+    if isinstance(node, ObjectNode):
+        return list(node.pairs.items())
+    if isinstance(node, ArrayNode):
+        return list(enumerate(node.elements))
+    return []
+
+def _encloses(node: ASTNode, offset: int, end: int) -> bool:
+    # The edit must lie strictly between the opening and closing bracket
+    return (isinstance(node, (ObjectNode, ArrayNode)) and node.start is not None
+            and node.start < offset and end < node.end)
+
+def _find_child(node: ASTNode, offset: int, end: int) -> Optional[Tuple[Union[str, int], ASTNode]]:
+    if isinstance(node, ArrayNode):
+        # Elements are ordered by position, so binary search on their start
+        elements = node.elements
+        lo, hi = 0, len(elements)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if elements[mid].start <= offset:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo and _encloses(elements[lo - 1], offset, end):
+            return lo - 1, elements[lo - 1]
+        return None
+    for key, child in node.pairs.items():
+        if _encloses(child, offset, end):
+            return key, child
+    return None
+
+def _shift(node: ASTNode, delta: int) -> None:
+    stack = [node]
+    while stack:
+        current = stack.pop()
+        current.start += delta
+        current.end += delta
+        if isinstance(current, ObjectNode):
+            stack.extend(current.pairs.values())
+        elif isinstance(current, ArrayNode):
+            stack.extend(current.elements)
+
+def _parse(text: str) -> ASTNode:
+    return Parser(lex(text)).parse()
+
+def reparse(source: str, root: ASTNode, offset: int, deleted: int,
+            inserted: str) -> Tuple[str, ASTNode]:
+    """Apply a text edit and re-parse only the smallest enclosing container.
+
+    If that container's new text is no longer a single value (the edit
+    split or merged containers), the next enclosing container is tried,
+    and finally the whole of the new source.
+
+    `root` must have been parsed from `source` by Parser (so it carries
+    spans). The re-parsed container is spliced into the tree in place and
+    the spans of everything after the edit are shifted. Returns the new
+    source and the (possibly new) root. On a syntax error the tree is left
+    untouched and the LexerError/ValueError propagates.
+    """
+    if offset < 0 or deleted < 0 or offset + deleted > len(source):
+        raise ValueError("Edit range out of bounds")
+    new_source = source[:offset] + inserted + source[offset + deleted:]
+    edit_end = offset + deleted
+    delta = len(inserted) - deleted
+
+    if root.start is None or not _encloses(root, offset, edit_end):
+        return new_source, _parse(new_source)
+
+    ancestors = [(None, root)]
+    while True:
+        found = _find_child(ancestors[-1][1], offset, edit_end)
+        if found is None:
+            break
+        ancestors.append(found)
+
+    # An edit can split or merge containers, so the innermost slice may no
+    # longer be one value; widen to each enclosing ancestor in turn
+    for depth in range(len(ancestors) - 1, -1, -1):
+        target = ancestors[depth][1]
+        try:
+            replacement = _parse(new_source[target.start:target.end + delta])
+        except (LexerError, ValueError):
+            continue
+        break
+    else:
+        return new_source, _parse(new_source)
+    del ancestors[depth + 1:]
+    key = ancestors[-1][0]
+    _shift(replacement, target.start)
+
+    if len(ancestors) == 1:
+        # Only the root's brackets enclose the edit; nothing to splice into
+        return new_source, replacement
+
+    parent = ancestors[-2][1]
+    if isinstance(parent, ObjectNode):
+        parent.pairs[key] = replacement
+    else:
+        parent.elements[key] = replacement
+
+    # Everything that starts after the edit moves by delta, and every
+    # ancestor of the spliced container grows or shrinks by delta
+    for _, ancestor in ancestors[:-1]:
+        ancestor.end += delta
+        for _, child in _children(ancestor):
+            if child.start >= edit_end and child is not replacement:
+                _shift(child, delta)
+    return new_source, root
+
+def diff(old: ASTNode, new: ASTNode) -> List[Tuple[Path, str]]:
+    """Report the paths that differ between two ASTs, without evaluating.
+
+    Each entry is (path, kind) with kind one of 'added', 'removed' or
+    'changed'. Subtrees shared by identity are skipped outright.
+    """
+    changes = []
+    stack = [((), old, new)]
+    while stack:
+        path, a, b = stack.pop()
+        if a is b:
+            continue
+        if type(a) is not type(b):
+            changes.append((path, 'changed'))
+        elif isinstance(a, ObjectNode):
+            for key in a.pairs:
+                if key not in b.pairs:
+                    changes.append((path + (key,), 'removed'))
+            for key, value in b.pairs.items():
+                if key in a.pairs:
+                    stack.append((path + (key,), a.pairs[key], value))
+                else:
+                    changes.append((path + (key,), 'added'))
+        elif isinstance(a, ArrayNode):
+            common = min(len(a.elements), len(b.elements))
+            for index in range(common):
+                stack.append((path + (index,), a.elements[index], b.elements[index]))
+            for index in range(common, len(a.elements)):
+                changes.append((path + (index,), 'removed'))
+            for index in range(common, len(b.elements)):
+                changes.append((path + (index,), 'added'))
+        elif not isinstance(a, NullNode) and a.value != b.value:
+            changes.append((path, 'changed'))
+    changes.sort(key=lambda change: [(isinstance(part, str), part) for part in change[0]])
+    return changes
@@ -0,0 +1,177 @@
+import json
+import mmap
+import os
+import re
+from array import array
+from typing import Dict, Iterator, List, Optional, Union
+from src.lexer import lex
+from src.parser import Parser
+from src.ast import ASTNode
+
+# Strings (so brackets inside them are ignored) and structural characters
+_STRUCTURE = re.compile(rb'"[^"\\]*(?:\\.[^"\\]*)*"|[\[\]{},:]')
+_INDEX_MAGIC = b'JPIX1\n'
+_WHITESPACE = b' \t\r\n'
+
+class IndexedDocument:
+    """Random access to the top-level elements of a JSON file.
+
+    The file is memory-mapped and scanned once for the byte span of each
+    top-level array element or object member. The spans are saved to a
+    sidecar index (`<path>.idx` by default) that is reused as long as the
+    file's size and mtime still match. `doc[i]` and `doc["key"]` parse just
+    that element with Parser and return its AST.
+    """
+
+    def __init__(self, path: str, index_path: Optional[str] = None, persist: bool = True):
+        self.path = path
+        self.index_path = index_path or path + '.idx'
+        with open(path, 'rb') as f:
+            stat = os.fstat(f.fileno())
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) if stat.st_size else b''
+        self._stamp = {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+        self.kind = None
+        self._starts = array('q')
+        self._ends = array('q')
+        self._keys: List[str] = []
+        self._positions: Dict[str, int] = {}
+        if not self._load_index():
+            self._build_index()
+            if persist:
+                self._save_index()
+
+    def __len__(self) -> int:
+        return len(self._starts)
+
+    def __getitem__(self, item: Union[int, str]) -> ASTNode:
+        if isinstance(item, str):
+            if self.kind != 'object':
+                raise TypeError("String keys require a top-level object")
+            position = self._positions[item]
+        else:
+            if self.kind != 'array':
+                raise TypeError("Integer indexes require a top-level array")
+            position = range(len(self._starts))[item]
+        text = str(self._map[self._starts[position]:self._ends[position]], 'utf-8')
+        return Parser(lex(text)).parse()
+
+    def __iter__(self) -> Iterator:
+        if self.kind == 'object':
+            return iter(self._keys)
+        return (self[i] for i in range(len(self)))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def keys(self) -> List[str]:
+        return list(self._keys)
+
+    def close(self) -> None:
+        if isinstance(self._map, mmap.mmap):
+            self._map.close()
+
+    def _build_index(self) -> None:
+        depth = 0
+        # Position inside a top-level object member: 'key', 'colon' or 'value'
+        expect = None
+        start = None
+        key = None
+        value_end = 0
+        for match in _STRUCTURE.finditer(self._map):
+            char = match.group()
+            if len(char) > 1 or char == b'"':
+                if depth == 1 and expect == 'key':
+                    key = lex(str(char, 'utf-8'))[0].value
+                    expect = 'colon'
+                elif depth == 1 and expect == 'colon':
+                    raise ValueError("Expected COLON after key in top-level object")
+                continue
+            if char in b'[{':
+                if depth == 1 and expect == 'colon':
+                    raise ValueError("Expected COLON after key in top-level object")
+                depth += 1
+                if depth == 1:
+                    if self.kind is not None or self._map[:match.start()].strip(_WHITESPACE):
+                        raise ValueError("Unexpected tokens after parsing completed")
+                    self.kind = 'array' if char == b'[' else 'object'
+                    start = match.end()
+                    expect = 'key' if self.kind == 'object' else None
+            elif char in b']}':
+                if depth == 1:
+                    if expect == 'colon':
+                        raise ValueError("Expected COLON after key in top-level object")
+                    self._add(start, match.start(), key, closing=True)
+                    value_end = match.end()
+                depth -= 1
+                if depth < 0:
+                    raise ValueError("Unbalanced brackets in document")
+            elif depth == 1 and char == b':':
+                if expect != 'colon':
+                    raise ValueError("Unexpected ':' without a key in top-level container")
+                start = match.end()
+                expect = 'value'
+            elif depth == 1 and char == b',':
+                if expect == 'colon':
+                    raise ValueError("Expected COLON after key in top-level object")
+                self._add(start, match.start(), key)
+                start = match.end()
+                key = None
+                expect = 'key' if self.kind == 'object' else None
+        if self.kind is None or depth != 0:
+            raise ValueError("Document must be a complete top-level array or object")
+        # Scalars are invisible to the structure scan, so check the tail like Parser.parse does
+        if self._map[value_end:].strip(_WHITESPACE):
+            raise ValueError("Unexpected tokens after parsing completed")
+
+    def _add(self, start: int, end: int, key: Optional[str], closing: bool = False) -> None:
+        if not self._map[start:end].strip():
+            # Only '[]' or '{}' may have nothing between separators
+            if not closing or self._starts or key is not None:
+                raise ValueError("Empty element in top-level container")
+            return
+        if self.kind == 'object':
+            if key is None:
+                raise ValueError("Expected key in top-level object")
+            position = self._positions.get(key)
+            if position is not None:
+                # Duplicate key: last value wins
+                self._starts[position], self._ends[position] = start, end
+                return
+            self._positions[key] = len(self._keys)
+            self._keys.append(key)
+        self._starts.append(start)
+        self._ends.append(end)
+
+    def _load_index(self) -> bool:
+        try:
+            with open(self.index_path, 'rb') as f:
+                if f.readline() != _INDEX_MAGIC:
+                    return False
+                header = json.loads(f.readline())
+                if header['size'] != self._stamp['size'] or header['mtime_ns'] != self._stamp['mtime_ns']:
+                    return False
+                starts, ends = array('q'), array('q')
+                starts.fromfile(f, header['count'])
+                ends.fromfile(f, header['count'])
+        except (OSError, ValueError, KeyError, EOFError):
+            return False
+        self.kind = header['kind']
+        self._keys = header['keys']
+        self._positions = {key: i for i, key in enumerate(self._keys)}
+        self._starts, self._ends = starts, ends
+        return True
+
+    def _save_index(self) -> None:
+        header = dict(self._stamp, kind=self.kind, count=len(self._starts), keys=self._keys)
+        try:
+            with open(self.index_path, 'wb') as f:
+                f.write(_INDEX_MAGIC)
+                f.write(json.dumps(header).encode('utf-8') + b'\n')
+                self._starts.tofile(f)
+                self._ends.tofile(f)
+        except OSError:
+            # A read-only directory only costs us the rescan next time
+            pass
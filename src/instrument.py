@@ -0,0 +1,122 @@
+import re
+import time
+from collections import Counter, defaultdict
+from typing import Any, Dict, List, Optional
+from src.lexer import Token, lex
+from src.parser import Parser
+from src.ast import ASTNode, ObjectNode, ArrayNode, Shape
+
+_ESCAPE = re.compile(r'\\(?:u[0-9a-fA-F]{4}|.)')
+
+class Hooks:
+    """Callback interface for instrumentation.
+
+    Subclass and override `count` and `span` to forward events to a metrics
+    system. Spans around individual containers are only reported when
+    `timing` is true; the phase spans ('lex', 'parse', 'evaluate') always are.
+    """
+
+    timing = False
+
+    def count(self, name: str, n: int = 1) -> None:
+        pass
+
+    def span(self, name: str, seconds: float) -> None:
+        pass
+
+class Counters(Hooks):
+    """Hooks that keep running totals in memory."""
+
+    def __init__(self, timing: bool = False):
+        self.timing = timing
+        self.counts: Counter = Counter()
+        self.seconds: Dict[str, float] = defaultdict(float)
+        self.calls: Counter = Counter()
+
+    def count(self, name: str, n: int = 1) -> None:
+        self.counts[name] += n
+
+    def span(self, name: str, seconds: float) -> None:
+        self.seconds[name] += seconds
+        self.calls[name] += 1
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {'counts': dict(self.counts), 'seconds': dict(self.seconds), 'calls': dict(self.calls)}
+
+class InstrumentedParser(Parser):
+    """Parser that reports values, containers and numbers to `hooks`."""
+
+    def __init__(self, tokens: List[Token], hooks: Hooks, shapes: bool = False):
+        super().__init__(tokens, shapes)
+        self.hooks = hooks
+
+    def parse_value(self, shape: Optional[Shape] = None) -> ASTNode:
+        kind = self.current_token().type
+        self.hooks.count('parser.values')
+        if kind == 'NUMBER':
+            self.hooks.count('parser.numbers')
+        return super().parse_value(shape)
+
+    def parse_object(self, shape: Optional[Shape] = None) -> ObjectNode:
+        self.hooks.count('parser.objects')
+        if not self.hooks.timing:
+            return super().parse_object(shape)
+        started = time.perf_counter()
+        node = super().parse_object(shape)
+        self.hooks.span('parser.object', time.perf_counter() - started)
+        return node
+
+    def parse_array(self) -> ArrayNode:
+        self.hooks.count('parser.arrays')
+        if not self.hooks.timing:
+            return super().parse_array()
+        started = time.perf_counter()
+        node = super().parse_array()
+        self.hooks.span('parser.array', time.perf_counter() - started)
+        return node
+
+def lex_instrumented(text: str, hooks: Hooks) -> List[Token]:
+    # Counts are derived from the finished token list so lex() itself is untouched
+    started = time.perf_counter()
+    tokens = lex(text)
+    hooks.span('lex', time.perf_counter() - started)
+    for kind, n in Counter(token.type for token in tokens).items():
+        hooks.count('tokens.' + kind, n)
+    escapes = 0
+    for token in tokens:
+        if token.type == 'STRING' and '\\' in text[token.start:token.end]:
+            escapes += len(_ESCAPE.findall(text, token.start, token.end))
+    if escapes:
+        hooks.count('lexer.escapes', escapes)
+    return tokens
+
+def make_parser(tokens: List[Token], hooks: Optional[Hooks] = None, shapes: bool = False) -> Parser:
+    """Return a plain Parser when no hooks are given, else an InstrumentedParser."""
+    if hooks is None:
+        return Parser(tokens, shapes)
+    return InstrumentedParser(tokens, hooks, shapes)
+
+def parse(text: str, hooks: Optional[Hooks] = None, shapes: bool = False) -> ASTNode:
+    """Lex and parse `text`, reporting to `hooks` if given.
+
+    Without hooks this is exactly Parser(lex(text)).parse(); the choice is
+    made once here, not per token or per node.
+    """
+    if hooks is None:
+        return Parser(lex(text), shapes).parse()
+    tokens = lex_instrumented(text, hooks)
+    started = time.perf_counter()
+    node = InstrumentedParser(tokens, hooks, shapes).parse()
+    hooks.span('parse', time.perf_counter() - started)
+    return node
+
+def evaluate(node: ASTNode, hooks: Optional[Hooks] = None) -> Any:
+    if hooks is None:
+        return node.evaluate()
+    started = time.perf_counter()
+    value = node.evaluate()
+    hooks.span('evaluate', time.perf_counter() - started)
+    # Every node is visited exactly once by evaluate()
+    from src.stats import count_nodes
+    hooks.count('evaluate.nodes', sum(count_nodes(node)[0].values()))
+    return value
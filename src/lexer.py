@@ -1,12 +1,24 @@
-import re
-from typing import List
+from __future__ import annotations
+# Annotations are never evaluated, so typing need not be imported at run time
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import List, Optional
+
+# JSON's own sets, not str.isspace()/isdigit(), which also accept other
+# Unicode characters that StreamLexer and json.loads reject
+_WHITESPACE = frozenset(' \t\n\r')
+_DIGITS = frozenset('0123456789')
 
 class Token:
-    def __init__(self, type_: str, value: str, line: int, column: int):
+    def __init__(self, type_: str, value: str, line: int, column: int,
+                 start: Optional[int] = None, end: Optional[int] = None):
         self.type = type_
         self.value = value
         self.line = line
         self.column = column
+        # Source offsets of the lexeme: input_string[start:end]
+        self.start = start
+        self.end = end
 
     def __repr__(self):
         return f"Token(type={self.type}, value={self.value}, line={self.line}, column={self.column})"
@@ -102,7 +114,7 @@ def lex(input_string: str) -> List[Token]:
         char = peek()
 
         # Skip whitespace
-        if char.isspace():
+        if char in _WHITESPACE:
             advance()
             continue
 
@@ -116,13 +128,13 @@ def lex(input_string: str) -> List[Token]:
                 ',': 'COMMA',
                 ':': 'COLON'
             }[char]
-            tokens.append(Token(token_type, char, line, column))
+            tokens.append(Token(token_type, char, line, column, i, i + 1))
             advance()
             continue
 
         # Strings
         if char == '"':
-            start_line, start_column = line, column
+            start_line, start_column, start = line, column, i
             string_value = ''
             advance()  # Skip opening quote
             
@@ -167,52 +179,52 @@ def lex(input_string: str) -> List[Token]:
             if i >= length:
                 raise LexerError("Unterminated string", start_line, start_column)
             advance()  # Skip closing quote
-            tokens.append(Token('STRING', string_value, start_line, start_column))
+            tokens.append(Token('STRING', string_value, start_line, start_column, start, i))
             continue
 
         # Numbers
-        if char == '-' or char.isdigit():
-            start_line, start_column = line, column
+        if char == '-' or char in _DIGITS:
+            start_line, start_column, start = line, column, i
             num_str = ''
             
             if char == '-':
                 num_str += char
                 advance()
-                if not peek().isdigit():
+                if peek() not in _DIGITS:
                     raise LexerError("Invalid number format", start_line, start_column)
             
             if peek() == '0':
                 num_str += peek()
                 advance()
-                if peek().isdigit():
+                if peek() in _DIGITS:
                     raise LexerError("Numbers cannot have leading zeros", start_line, start_column)
             else:
-                while i < length and peek().isdigit():
+                while i < length and peek() in _DIGITS:
                     num_str += peek()
                     advance()
             
             if peek() == '.':
                 num_str += peek()
                 advance()
-                if not peek().isdigit():
+                if peek() not in _DIGITS:
                     raise LexerError("Invalid number format", start_line, start_column)
-                while i < length and peek().isdigit():
+                while i < length and peek() in _DIGITS:
                     num_str += peek()
                     advance()
             
-            if peek() in 'eE':
+            if peek() and peek() in 'eE':
                 num_str += peek()
                 advance()
-                if peek() in '+-':
+                if peek() and peek() in '+-':
                     num_str += peek()
                     advance()
-                if not peek().isdigit():
+                if peek() not in _DIGITS:
                     raise LexerError("Invalid number format", start_line, start_column)
-                while i < length and peek().isdigit():
+                while i < length and peek() in _DIGITS:
                     num_str += peek()
                     advance()
             
-            tokens.append(Token('NUMBER', num_str, start_line, start_column))
+            tokens.append(Token('NUMBER', num_str, start_line, start_column, start, i))
             continue
 
         # Literals
@@ -225,7 +237,7 @@ def lex(input_string: str) -> List[Token]:
         matched = False
         for literal, token_type in literals.items():
             if input_string[i:].startswith(literal):
-                tokens.append(Token(token_type, literal, line, column))
+                tokens.append(Token(token_type, literal, line, column, i, i + len(literal)))
                 for _ in range(len(literal)):
                     advance()
                 matched = True
@@ -236,7 +248,7 @@ def lex(input_string: str) -> List[Token]:
 
         raise LexerError(f"Unexpected character: {char}", line, column)
 
-    tokens.append(Token('EOF', '', line, column))
+    tokens.append(Token('EOF', '', line, column, i, i))
     return tokens
 
 
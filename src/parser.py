@@ -1,12 +1,35 @@
 
-from typing import List
+from __future__ import annotations
 from src.lexer import Token, lex
-from src.ast import ASTNode, ObjectNode, ArrayNode, StringNode, NumberNode, BooleanNode, NullNode
+from src.ast import (ASTNode, ObjectNode, ArrayNode, StringNode, NumberNode, BooleanNode, NullNode,
+                     RecordNode, Shape)
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Any, Callable, Dict, List, Optional, Tuple
+
+def is_integer_literal(text: str) -> bool:
+    """True if a NUMBER lexeme decodes to int rather than float, as in json.loads."""
+    return not ('.' in text or 'e' in text or 'E' in text)
 
 class Parser:
-    def __init__(self, tokens: List[Token]):
+    def __init__(self, tokens: List[Token], shapes: bool = False,
+                 object_hook: Optional[Callable[[Dict[str, Any]], Any]] = None,
+                 object_pairs_hook: Optional[Callable[[List[Tuple[str, Any]]], Any]] = None,
+                 parse_float: Optional[Callable[[str], Any]] = None,
+                 parse_int: Optional[Callable[[str], Any]] = None,
+                 parse_constant: Optional[Callable[[str], Any]] = None):
         self.tokens = tokens
         self.current = 0
+        # With shapes enabled, objects become RecordNodes and each array
+        # predicts that its next object has the same keys as the last one
+        self.shapes: Optional[Dict[Tuple[str, ...], Shape]] = {} if shapes else None
+        # json.loads hooks, used by decode(). The lexer never produces NaN or
+        # Infinity, so parse_constant is accepted for compatibility but never called.
+        self.object_hook = object_hook
+        self.object_pairs_hook = object_pairs_hook
+        self.parse_float = parse_float
+        self.parse_int = parse_int
+        self.parse_constant = parse_constant
 
     def parse(self) -> ASTNode:
         value = self.parse_value()
@@ -14,33 +37,38 @@ class Parser:
             raise ValueError("Unexpected tokens after parsing completed")
         return value
 
-    def parse_value(self) -> ASTNode:
+    def parse_value(self, shape: Optional[Shape] = None) -> ASTNode:
         token = self.current_token()
         
         if token.type == 'LEFT_BRACE':
-            return self.parse_object()
+            return self.parse_object(shape)
         elif token.type == 'LEFT_BRACKET':
             return self.parse_array()
         elif token.type == 'STRING':
             self.advance()
-            return StringNode(token.value)
+            node = StringNode(token.value)
         elif token.type == 'NUMBER':
             self.advance()
             try:
-                return NumberNode(float(token.value))
+                node = NumberNode(float(token.value))
             except ValueError:
                 raise ValueError(f"Invalid number format: {token.value}")
         elif token.type == 'BOOLEAN':
             self.advance()
-            return BooleanNode(token.value == 'true')
+            node = BooleanNode(token.value == 'true')
         elif token.type == 'NULL':
             self.advance()
-            return NullNode()
+            node = NullNode()
         else:
             raise ValueError(f"Unexpected token: {token.type}")
+        node.start = token.start
+        node.end = token.end
+        return node
 
-    def parse_object(self) -> ObjectNode:
-        self.consume('LEFT_BRACE')
+    def parse_object(self, shape: Optional[Shape] = None) -> ObjectNode:
+        if self.shapes is not None:
+            return self.parse_record(shape)
+        start = self.consume('LEFT_BRACE').start
         pairs = {}
         
         if self.current_token().type != 'RIGHT_BRACE':
@@ -61,27 +89,188 @@ class Parser:
                     
                 self.consume('COMMA')
         
-        self.consume('RIGHT_BRACE')
-        return ObjectNode(pairs)
+        node = ObjectNode(pairs)
+        node.start = start
+        node.end = self.consume('RIGHT_BRACE').end
+        return node
+
+    def parse_record(self, shape: Optional[Shape] = None) -> ObjectNode:
+        start = self.consume('LEFT_BRACE').start
+        keys = []
+        values = []
+        expect_key = True
+
+        if shape is not None:
+            # Fast path: walk the predicted keys straight off the token list
+            tokens = self.tokens
+            last = len(shape.keys) - 1
+            for index, key in enumerate(shape.keys):
+                token = tokens[self.current]
+                if token.type != 'STRING' or token.value != key or tokens[self.current + 1].type != 'COLON':
+                    break
+                self.current += 2
+                keys.append(key)
+                values.append(self.parse_value(shape.children[index]))
+                separator = tokens[self.current].type
+                if separator == 'RIGHT_BRACE' and index == last:
+                    return self._make_record(shape, values, start)
+                if separator != 'COMMA' or index == last:
+                    expect_key = False
+                    break
+                self.current += 1
+
+        if keys or self.current_token().type != 'RIGHT_BRACE':
+            while True:
+                if not expect_key:
+                    if self.current_token().type == 'RIGHT_BRACE':
+                        break
+                    self.consume('COMMA')
+
+                token = self.current_token()
+                if token.type == 'EOF':
+                    raise ValueError("Unclosed object: expected '}'")
+
+                if token.type != 'STRING':
+                    raise ValueError("Expected string key in object")
+
+                self.advance()
+                self.consume('COLON')
+                keys.append(token.value)
+                values.append(self.parse_value())
+                expect_key = False
+
+        key_tuple = tuple(keys)
+        if len(set(key_tuple)) != len(key_tuple):
+            # Duplicate keys: last value wins, as in parse_object
+            node = ObjectNode(dict(zip(keys, values)))
+            node.start = start
+            node.end = self.consume('RIGHT_BRACE').end
+            return node
+        return self._make_record(self._shape(key_tuple), values, start)
+
+    def _shape(self, keys: Tuple[str, ...]) -> Shape:
+        shape = self.shapes.get(keys)
+        if shape is None:
+            shape = self.shapes[keys] = Shape(keys)
+        return shape
+
+    def _make_record(self, shape: Shape, values: List[ASTNode], start: int) -> RecordNode:
+        for index, value in enumerate(values):
+            if type(value) is RecordNode:
+                shape.children[index] = value.shape
+        node = RecordNode(shape, values)
+        node.start = start
+        node.end = self.consume('RIGHT_BRACE').end
+        return node
 
     def parse_array(self) -> ArrayNode:
-        self.consume('LEFT_BRACKET')
+        start = self.consume('LEFT_BRACKET').start
         elements = []
+        shape = None
         
         if self.current_token().type != 'RIGHT_BRACKET':
             while True:
                 if self.current_token().type == 'EOF':
                     raise ValueError("Unclosed array: expected ']'")
                     
-                elements.append(self.parse_value())
+                element = self.parse_value(shape)
+                if type(element) is RecordNode:
+                    shape = element.shape
+                elements.append(element)
                 
                 if self.current_token().type == 'RIGHT_BRACKET':
                     break
                     
                 self.consume('COMMA')
         
-        self.consume('RIGHT_BRACKET')
-        return ArrayNode(elements)
+        node = ArrayNode(elements)
+        node.start = start
+        node.end = self.consume('RIGHT_BRACKET').end
+        return node
+
+    def decode(self) -> Any:
+        """Build Python values directly, skipping the AST, like json.loads.
+
+        Integer literals become int (or parse_int's result) and the others
+        float (or parse_float's). Each object is passed to
+        object_pairs_hook or object_hook as soon as it closes, so no
+        second pass over the result is needed. The hook calls are chosen
+        once up front; with no hooks set, objects are plain dicts.
+        """
+        self.prepare_decode()
+        value = self.decode_value()
+        if self.current < len(self.tokens) - 1:  # -1 for EOF token
+            raise ValueError("Unexpected tokens after parsing completed")
+        return value
+
+    def prepare_decode(self) -> None:
+        """Choose the hook calls used by decode_value(); decode() does this itself."""
+        if self.object_pairs_hook is not None:
+            self._make_object = self.object_pairs_hook
+        elif self.object_hook is not None:
+            object_hook = self.object_hook
+            self._make_object = lambda pairs: object_hook(dict(pairs))
+        else:
+            self._make_object = dict
+        self._parse_float = self.parse_float or float
+        self._parse_int = self.parse_int or int
+
+    def decode_value(self) -> Any:
+        token = self.current_token()
+        kind = token.type
+        if kind == 'STRING':
+            self.current += 1
+            return token.value
+        if kind == 'NUMBER':
+            self.current += 1
+            text = token.value
+            if is_integer_literal(text):
+                return self._parse_int(text)
+            return self._parse_float(text)
+        if kind == 'LEFT_BRACE':
+            return self.decode_object()
+        if kind == 'LEFT_BRACKET':
+            return self.decode_array()
+        if kind == 'BOOLEAN':
+            self.current += 1
+            return token.value == 'true'
+        if kind == 'NULL':
+            self.current += 1
+            return None
+        raise ValueError(f"Unexpected token: {kind}")
+
+    def decode_object(self) -> Any:
+        self.consume('LEFT_BRACE')
+        pairs = []
+        if self.current_token().type != 'RIGHT_BRACE':
+            while True:
+                token = self.current_token()
+                if token.type == 'EOF':
+                    raise ValueError("Unclosed object: expected '}'")
+                if token.type != 'STRING':
+                    raise ValueError("Expected string key in object")
+                self.current += 1
+                self.consume('COLON')
+                pairs.append((token.value, self.decode_value()))
+                if self.current_token().type == 'RIGHT_BRACE':
+                    break
+                self.consume('COMMA')
+        self.current += 1
+        return self._make_object(pairs)
+
+    def decode_array(self) -> List[Any]:
+        self.consume('LEFT_BRACKET')
+        elements = []
+        if self.current_token().type != 'RIGHT_BRACKET':
+            while True:
+                if self.current_token().type == 'EOF':
+                    raise ValueError("Unclosed array: expected ']'")
+                elements.append(self.decode_value())
+                if self.current_token().type == 'RIGHT_BRACKET':
+                    break
+                self.consume('COMMA')
+        self.current += 1
+        return elements
 
     def current_token(self) -> Token:
         if self.current >= len(self.tokens):
@@ -97,3 +286,7 @@ class Parser:
             raise ValueError(f"Expected {expected_type}, but got {token.type}")
         self.advance()
         return token
+
+def loads(text: str, **hooks: Any) -> Any:
+    """Parse `text` to Python values; accepts the json.loads hooks."""
+    return Parser(lex(text), **hooks).decode()
@@ -0,0 +1,318 @@
+from __future__ import annotations
+from src.ast import ASTNode, ObjectNode, ArrayNode, StringNode, NumberNode, BooleanNode, NullNode
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+class PatchError(ValueError):
+    def __init__(self, message: str, index: Optional[int] = None, operation: Optional[Dict] = None):
+        super().__init__(message)
+        self.message = message
+        self.index = index
+        self.operation = operation
+
+    def __str__(self) -> str:
+        if self.index is None:
+            return self.message
+        return f"Patch operation {self.index} ({self.operation.get('op')} {self.operation.get('path')}): {self.message}"
+
+class UndoLog:
+    """Inverse of every in-place change made by a patch, newest last.
+
+    Pass one log to several apply_patch()/apply_merge_patch() calls to
+    roll them back together. Each entry undoes its change through the
+    container's own mutation methods, so cached values are invalidated
+    on the way back too.
+    """
+
+    def __init__(self):
+        self._entries: List[Tuple[Callable, tuple]] = []
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def record(self, undo: Callable, *args) -> None:
+        self._entries.append((undo, args))
+
+    def rollback(self, mark: int = 0) -> None:
+        """Undo every change recorded after the first `mark` entries."""
+        entries = self._entries
+        while len(entries) > mark:
+            undo, args = entries.pop()
+            undo(*args)
+
+def parse_pointer(pointer: str) -> List[str]:
+    """Split an RFC 6901 JSON Pointer into its unescaped reference tokens."""
+    if pointer == '':
+        return []
+    if not isinstance(pointer, str) or not pointer.startswith('/'):
+        raise PatchError(f"Invalid JSON pointer: {pointer!r}")
+    return [token.replace('~1', '/').replace('~0', '~') for token in pointer[1:].split('/')]
+
+def to_node(value: Any) -> ASTNode:
+    """Build an AST from a Python value (dict, list, str, int, float, bool or None).
+
+    Numbers are stored as floats, as the parser stores them, so a patched
+    tree evaluates and serializes the same as one parsed from text.
+    """
+    if isinstance(value, ASTNode):
+        return value
+    if isinstance(value, dict):
+        return ObjectNode({key: to_node(child) for key, child in value.items()})
+    if isinstance(value, (list, tuple)):
+        return ArrayNode([to_node(child) for child in value])
+    if isinstance(value, str):
+        return StringNode(value)
+    if isinstance(value, bool):
+        return BooleanNode(value)
+    if isinstance(value, (int, float)):
+        try:
+            return NumberNode(float(value))
+        except OverflowError:
+            raise PatchError(f"Number too large: {value!r}") from None
+    if value is None:
+        return NullNode()
+    raise PatchError(f"Unsupported JSON value: {value!r}")
+
+def _equal(a: Any, b: Any) -> bool:
+    # JSON equality: 1 == 1.0, but true is not 1
+    if isinstance(a, bool) or isinstance(b, bool):
+        return a is b
+    if isinstance(a, dict):
+        return isinstance(b, dict) and a.keys() == b.keys() and all(_equal(a[key], b[key]) for key in a)
+    if isinstance(a, list):
+        return isinstance(b, list) and len(a) == len(b) and all(map(_equal, a, b))
+    if isinstance(a, (int, float)):
+        return isinstance(b, (int, float)) and a == b
+    return type(a) is type(b) and a == b
+
+def _index(token: str, size: int, end: bool) -> int:
+    if token == '-' and end:
+        return size
+    if not (token.isascii() and token.isdigit()) or (len(token) > 1 and token[0] == '0'):
+        raise PatchError(f"Invalid array index: {token!r}")
+    index = int(token)
+    if index > size or (index == size and not end):
+        raise PatchError(f"Array index out of range: {index}")
+    return index
+
+def _resolve(root: ASTNode, tokens: List[str]) -> ASTNode:
+    node = root
+    for token in tokens:
+        if isinstance(node, ObjectNode):
+            node = node.pairs.get(token)
+            if node is None:
+                raise PatchError(f"Path not found: member {token!r} is missing")
+        elif isinstance(node, ArrayNode):
+            node = node.elements[_index(token, len(node.elements), False)]
+        else:
+            raise PatchError(f"Path not found: cannot index a {type(node).__name__} with {token!r}")
+    return node
+
+def _reinsert(pairs: Dict[str, ASTNode], position: int, key: str, node: ASTNode) -> None:
+    # Put a removed member back where it was, keeping the member order
+    items = list(pairs.items())
+    items.insert(position, (key, node))
+    pairs.clear()
+    pairs.update(items)
+
+def _setitem(container, key, node) -> None:
+    container[key] = node
+
+def _delitem(container, key) -> None:
+    del container[key]
+
+def _insert(elements: List[ASTNode], index: int, node: ASTNode) -> None:
+    elements.insert(index, node)
+
+# Each primitive changes one container through its pairs/elements, which
+# evaluate_cached() has made tracking containers wherever a cached value
+# exists, so only that container and its ancestors lose their caches.
+
+def _add(parent: ASTNode, token: str, node: ASTNode, log: UndoLog) -> None:
+    if isinstance(parent, ObjectNode):
+        pairs = parent.pairs
+        old = pairs.get(token)
+        pairs[token] = node
+        if old is None:
+            log.record(_delitem, pairs, token)
+        else:
+            log.record(_setitem, pairs, token, old)
+    elif isinstance(parent, ArrayNode):
+        elements = parent.elements
+        index = _index(token, len(elements), True)
+        if index == len(elements):
+            elements.append(node)
+        else:
+            elements.insert(index, node)
+        log.record(_delitem, elements, index)
+    else:
+        raise PatchError(f"Cannot add {token!r} to a {type(parent).__name__}")
+
+def _remove(parent: ASTNode, token: str, log: UndoLog) -> ASTNode:
+    if isinstance(parent, ObjectNode):
+        pairs = parent.pairs
+        if token not in pairs:
+            raise PatchError(f"Path not found: member {token!r} is missing")
+        if next(reversed(pairs)) == token:
+            # Re-adding the last member restores the order without a rebuild
+            node = pairs.pop(token)
+            log.record(_setitem, pairs, token, node)
+        else:
+            # The undo needs the member's position, and finding it is a scan
+            # of the keys: the one step that costs O(width) of the object
+            position = list(pairs).index(token)
+            node = pairs.pop(token)
+            log.record(_reinsert, pairs, position, token, node)
+        return node
+    if isinstance(parent, ArrayNode):
+        elements = parent.elements
+        index = _index(token, len(elements), False)
+        node = elements.pop(index)
+        log.record(_insert, elements, index, node)
+        return node
+    raise PatchError(f"Path not found: cannot index a {type(parent).__name__} with {token!r}")
+
+def _replace(parent: ASTNode, token: str, node: ASTNode, log: UndoLog) -> None:
+    if isinstance(parent, ObjectNode):
+        container = parent.pairs
+        if token not in container:
+            raise PatchError(f"Path not found: member {token!r} is missing")
+        key = token
+    elif isinstance(parent, ArrayNode):
+        container = parent.elements
+        key = _index(token, len(container), False)
+    else:
+        raise PatchError(f"Path not found: cannot index a {type(parent).__name__} with {token!r}")
+    old = container[key]
+    container[key] = node
+    log.record(_setitem, container, key, old)
+
+def _pointer_member(operation: Dict, name: str) -> List[str]:
+    pointer = operation.get(name)
+    if not isinstance(pointer, str):
+        raise PatchError(f"Missing or invalid {name!r}")
+    return parse_pointer(pointer)
+
+def _apply_operation(root: ASTNode, operation: Dict, log: UndoLog) -> ASTNode:
+    if not isinstance(operation, dict):
+        raise PatchError(f"Operation must be an object, got {type(operation).__name__}")
+    op = operation.get('op')
+    tokens = _pointer_member(operation, 'path')
+    if op in ('add', 'replace', 'test'):
+        if 'value' not in operation:
+            raise PatchError("Missing 'value'")
+        value = operation['value']
+        if op == 'test':
+            if not _equal(_resolve(root, tokens).evaluate(), value):
+                raise PatchError("Test failed: value differs")
+            return root
+        node = to_node(value)
+        if not tokens:
+            return node
+        parent = _resolve(root, tokens[:-1])
+        if op == 'add':
+            _add(parent, tokens[-1], node, log)
+        else:
+            _replace(parent, tokens[-1], node, log)
+        return root
+    if op == 'remove':
+        if not tokens:
+            raise PatchError("Cannot remove the whole document")
+        _remove(_resolve(root, tokens[:-1]), tokens[-1], log)
+        return root
+    if op in ('move', 'copy'):
+        source = _pointer_member(operation, 'from')
+        if op == 'move':
+            if source == tokens:
+                _resolve(root, source)
+                return root
+            if tokens[:len(source)] == source:
+                raise PatchError("Cannot move a value into one of its own children")
+            node = _remove(_resolve(root, source[:-1]), source[-1], log)
+        else:
+            node = to_node(_resolve(root, source).evaluate())
+        if not tokens:
+            return node
+        _add(_resolve(root, tokens[:-1]), tokens[-1], node, log)
+        return root
+    raise PatchError(f"Unknown operation: {op!r}")
+
+def apply_patch(root: ASTNode, patch: Union[str, ASTNode, List[Dict]], undo: Optional[UndoLog] = None) -> ASTNode:
+    """Apply an RFC 6902 JSON Patch to `root` in place and return the root.
+
+    `patch` is a list of operations, as Python values, JSON text or an
+    AST. Operations change the `pairs`/`elements` of the nodes along their
+    paths directly, so the cost depends on the patch, not the document,
+    and evaluate_cached() results are dropped only for the touched
+    containers and their ancestors. The exception is removing an object
+    member other than the last, which scans the object's keys to record
+    where the member was for rollback. The patch is atomic: if any operation
+    fails, every change it made is rolled back and PatchError is raised.
+    A different node is returned only when an operation replaces the
+    whole document (path ""). Changes are also recorded in `undo`, when
+    given, for a later UndoLog.rollback().
+    """
+    if isinstance(patch, str):
+        from src.parser import loads
+        patch = loads(patch)
+    operations = patch.evaluate() if isinstance(patch, ASTNode) else patch
+    if not isinstance(operations, list):
+        raise PatchError(f"Patch must be an array of operations, got {type(operations).__name__}")
+    log = UndoLog() if undo is None else undo
+    mark = len(log)
+    try:
+        for index, operation in enumerate(operations):
+            try:
+                root = _apply_operation(root, operation, log)
+            except PatchError as e:
+                if isinstance(operation, dict):
+                    e.index = index
+                    e.operation = operation
+                raise
+    except BaseException:
+        log.rollback(mark)
+        raise
+    return root
+
+def _strip_nulls(value: Any) -> Any:
+    if isinstance(value, dict):
+        return {key: _strip_nulls(child) for key, child in value.items() if child is not None}
+    return value
+
+def _merge(target: Optional[ASTNode], patch: Any, log: UndoLog) -> ASTNode:
+    if not isinstance(patch, dict):
+        return to_node(patch)
+    if not isinstance(target, ObjectNode):
+        return to_node(_strip_nulls(patch))
+    pairs = target.pairs
+    for key, value in patch.items():
+        child = pairs.get(key)
+        if value is None:
+            if child is not None:
+                _remove(target, key, log)
+        elif child is None:
+            _add(target, key, _merge(None, value, log), log)
+        else:
+            merged = _merge(child, value, log)
+            if merged is not child:
+                _replace(target, key, merged, log)
+    return target
+
+def apply_merge_patch(root: ASTNode, patch: Any, undo: Optional[UndoLog] = None) -> ASTNode:
+    """Apply an RFC 7386 JSON Merge Patch to `root` in place and return the root.
+
+    Objects in the patch are merged member by member into existing
+    objects and null removes a member; any other value replaces the
+    target. `patch` is a Python value or an AST; a str is a string value,
+    not JSON text. It is atomic and invalidates caches like apply_patch().
+    """
+    if isinstance(patch, ASTNode):
+        patch = patch.evaluate()
+    log = UndoLog() if undo is None else undo
+    mark = len(log)
+    try:
+        return _merge(root, patch, log)
+    except BaseException:
+        log.rollback(mark)
+        raise
@@ -0,0 +1,319 @@
+from __future__ import annotations
+import hashlib
+import io
+from src.lexer import Token
+from src.parser import Parser
+from src.ast import ASTNode, ObjectNode, ArrayNode
+from src.stream import iter_tokens, _VALUE, _FIRST_VALUE, _FIRST_KEY, _KEY, _COLON, _COMMA
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Any, Callable, Dict, FrozenSet, IO, Iterable, Optional, Tuple, Union
+
+_TYPE_NAMES = frozenset(['object', 'array', 'string', 'number', 'integer', 'boolean', 'null'])
+_TOKEN_TYPES = {
+    'LEFT_BRACE': 'object',
+    'LEFT_BRACKET': 'array',
+    'STRING': 'string',
+    'NUMBER': 'number',
+    'BOOLEAN': 'boolean',
+    'NULL': 'null',
+}
+_CLOSING = {'LEFT_BRACE': 'RIGHT_BRACE', 'LEFT_BRACKET': 'RIGHT_BRACKET'}
+_ANNOTATIONS = frozenset(['$schema', '$id', '$comment', 'title', 'description', 'default', 'examples'])
+_KEYWORDS = frozenset(['type', 'properties', 'required', 'additionalProperties', 'items', 'enum',
+                       'minLength', 'maxLength', 'minItems', 'maxItems']) | _ANNOTATIONS
+
+def format_path(path: Tuple[Union[str, int], ...]) -> str:
+    """Render ('hosts', 1, 'name') as $.hosts[1].name."""
+    parts = ['$']
+    for part in path:
+        if isinstance(part, int):
+            parts.append(f'[{part}]')
+        elif part.isidentifier():
+            parts.append('.' + part)
+        else:
+            from src.encoder import encode_string
+            parts.append(f'[{encode_string(part)}]')
+    return ''.join(parts)
+
+def skip_value(kind: str, advance: Callable[[], str]) -> None:
+    """Step over one value whose first token has type `kind`, building nothing.
+
+    `advance()` moves past the current token and returns the next one's
+    type; it has been called past the value's last token on return. The
+    value's grammar is checked with the same states as TokenFormatter, so
+    a skipped value is only accepted if the full parser would accept it.
+    """
+    closers = []
+    state = _VALUE
+    while True:
+        if kind == 'EOF':
+            raise ValueError("Unexpected end of input")
+        if state == _COMMA:
+            if kind == 'COMMA':
+                state = _KEY if closers[-1] == 'RIGHT_BRACE' else _VALUE
+                kind = advance()
+                continue
+            if kind != closers[-1]:
+                raise ValueError(f"Expected ',' or closing bracket, but got {kind}")
+        elif state == _COLON:
+            if kind != 'COLON':
+                raise ValueError(f"Expected COLON, but got {kind}")
+            state = _VALUE
+            kind = advance()
+            continue
+        elif state == _FIRST_KEY or state == _KEY:
+            if kind != 'RIGHT_BRACE' or state == _KEY:
+                if kind != 'STRING':
+                    raise ValueError("Expected string key in object")
+                state = _COLON
+                kind = advance()
+                continue
+        elif kind != 'RIGHT_BRACKET' or state == _VALUE:
+            # _VALUE or _FIRST_VALUE
+            if kind in _CLOSING:
+                closers.append(_CLOSING[kind])
+                state = _FIRST_KEY if kind == 'LEFT_BRACE' else _FIRST_VALUE
+                kind = advance()
+                continue
+            if kind not in _TOKEN_TYPES:
+                raise ValueError(f"Unexpected token: {kind}")
+            if not closers:
+                advance()
+                return
+            state = _COMMA
+            kind = advance()
+            continue
+        # A closing bracket that matches the innermost open container
+        closers.pop()
+        if not closers:
+            advance()
+            return
+        state = _COMMA
+        kind = advance()
+
+class SchemaError(ValueError):
+    def __init__(self, message: str, path: Tuple[Union[str, int], ...], line: int, column: int):
+        super().__init__(message)
+        self.message = message
+        self.path = path
+        self.line = line
+        self.column = column
+
+    def __str__(self) -> str:
+        # Formatted on demand: decoders prepend path components as the error propagates
+        return (f"{type(self).__name__} at {format_path(self.path)} "
+                f"(line {self.line}, column {self.column}): {self.message}")
+
+class CompiledSchema:
+    """One schema node, checked and flattened for SchemaParser.
+
+    `properties` maps each known key to its compiled schema (None accepts
+    anything); required keys are always known. `additional` is None to skip
+    unknown properties, False to reject them, or a compiled schema. Nothing
+    is skipped when no properties are declared or an enum needs the whole
+    value.
+    """
+
+    __slots__ = ('types', 'properties', 'required', 'additional', 'items', 'enum',
+                 'min_length', 'max_length', 'min_items', 'max_items', 'skip_unknown')
+
+    def __init__(self, schema: Dict[str, Any]):
+        unknown = set(schema) - _KEYWORDS
+        if unknown:
+            raise ValueError(f"Unsupported schema keyword: {sorted(unknown)[0]}")
+        types = schema.get('type')
+        if isinstance(types, str):
+            types = [types]
+        if types is not None and not set(types) <= _TYPE_NAMES:
+            raise ValueError(f"Unknown schema type: {sorted(set(types) - _TYPE_NAMES)[0]}")
+        self.types: Optional[FrozenSet[str]] = frozenset(types) if types is not None else None
+        self.properties: Dict[str, Optional[CompiledSchema]] = {
+            key: _compile(value) for key, value in schema.get('properties', {}).items()}
+        self.required: FrozenSet[str] = frozenset(schema.get('required', ()))
+        for key in self.required:
+            self.properties.setdefault(key, None)
+        additional = schema.get('additionalProperties', True)
+        self.additional = None if additional is True else (False if additional is False else _compile(additional))
+        self.items = _compile(schema.get('items', True))
+        self.enum: Optional[FrozenSet[str]] = None
+        if 'enum' in schema:
+            self.enum = frozenset(_canonical(_as_parsed(value)) for value in schema['enum'])
+        self.min_length: int = schema.get('minLength', 0)
+        self.max_length: Optional[int] = schema.get('maxLength')
+        self.min_items: int = schema.get('minItems', 0)
+        self.max_items: Optional[int] = schema.get('maxItems')
+        self.skip_unknown = bool(self.properties) and self.enum is None
+
+def _compile(schema: Union[bool, Dict[str, Any]]) -> Optional[CompiledSchema]:
+    if schema is True or schema == {}:
+        return None
+    if schema is False:
+        return CompiledSchema({'enum': []})
+    return CompiledSchema(schema)
+
+def _as_parsed(value: Any) -> Any:
+    # The parser turns every number into a float; enum values must compare the same way
+    if isinstance(value, bool) or value is None or isinstance(value, str):
+        return value
+    if isinstance(value, (int, float)):
+        return float(value)
+    if isinstance(value, dict):
+        return {key: _as_parsed(item) for key, item in value.items()}
+    return [_as_parsed(item) for item in value]
+
+def _canonical(value: Any) -> str:
+    from src.encoder import dumps
+    return dumps(value, sort_keys=True, separators=(',', ':'))
+
+_COMPILED: Dict[str, Optional[CompiledSchema]] = {}
+MAX_COMPILED = 256
+
+def compile_schema(schema: Union[bool, Dict[str, Any]]) -> Optional[CompiledSchema]:
+    """Compile `schema`, reusing an earlier result for an identical schema.
+
+    Schemas are keyed by a BLAKE2 hash of their canonical JSON encoding, so
+    equal schemas built separately share one compiled form.
+    """
+    key = hashlib.blake2b(_canonical(schema).encode('utf-8'), digest_size=16).hexdigest()
+    try:
+        return _COMPILED[key]
+    except KeyError:
+        pass
+    compiled = _compile(schema)
+    if len(_COMPILED) >= MAX_COMPILED:
+        _COMPILED.clear()
+    _COMPILED[key] = compiled
+    return compiled
+
+class SchemaParser(Parser):
+    """Parser that checks a JSON Schema subset while it builds the AST.
+
+    Tokens are pulled one at a time from a StreamLexer, so the first
+    violation raises SchemaError without reading the rest of the input.
+    Supported keywords are type, properties, required, additionalProperties,
+    items, enum, minLength, maxLength, minItems and maxItems. Properties an
+    object schema does not mention are skipped without building nodes and
+    left out of the result, unless `keep_unknown` is set.
+    """
+
+    def __init__(self, source: Union[str, IO[str], Iterable[Token]], schema: Union[bool, Dict[str, Any]],
+                 keep_unknown: bool = False, chunk_size: int = 65536):
+        super().__init__([])
+        if isinstance(source, str):
+            source = io.StringIO(source)
+        self._tokens = iter_tokens(source, chunk_size) if hasattr(source, 'read') else iter(source)
+        self._token = next(self._tokens)
+        self.schema = compile_schema(schema)
+        self.keep_unknown = keep_unknown
+
+    def parse(self) -> ASTNode:
+        value = self.parse_checked(self.schema, ())
+        if self._token.type != 'EOF':
+            raise ValueError("Unexpected tokens after parsing completed")
+        return value
+
+    def current_token(self) -> Token:
+        return self._token
+
+    def advance(self) -> None:
+        # Stays on the EOF token once the input is exhausted
+        self._token = next(self._tokens, self._token)
+        self.current += 1
+
+    def parse_checked(self, schema: Optional[CompiledSchema], path: Tuple[Union[str, int], ...]) -> ASTNode:
+        if schema is None:
+            return self.parse_value()
+        token = self._token
+        kind = _TOKEN_TYPES.get(token.type)
+        if kind is None:
+            return self.parse_value()  # raises the usual syntax error
+        types = schema.types
+        if types is not None and kind not in types:
+            if not (kind == 'number' and 'integer' in types and float(token.value).is_integer()):
+                self._fail(f"expected {' or '.join(sorted(types))}, got {kind}", path, token)
+        if kind == 'object':
+            node = self._parse_object(schema, path)
+        elif kind == 'array':
+            node = self._parse_array(schema, path)
+        else:
+            if kind == 'string':
+                length = len(token.value)
+                if length < schema.min_length:
+                    self._fail(f"string shorter than {schema.min_length}", path, token)
+                if schema.max_length is not None and length > schema.max_length:
+                    self._fail(f"string longer than {schema.max_length}", path, token)
+            node = self.parse_value()
+        if schema.enum is not None and _canonical(node) not in schema.enum:
+            self._fail("value is not one of the enum values", path, token)
+        return node
+
+    def _parse_object(self, schema: CompiledSchema, path: Tuple[Union[str, int], ...]) -> ObjectNode:
+        start = self.consume('LEFT_BRACE').start
+        pairs = {}
+        properties = schema.properties
+        if self._token.type != 'RIGHT_BRACE':
+            while True:
+                token = self._token
+                if token.type == 'EOF':
+                    raise ValueError("Unclosed object: expected '}'")
+                if token.type != 'STRING':
+                    raise ValueError("Expected string key in object")
+                self.advance()
+                self.consume('COLON')
+                key = token.value
+                if key in properties:
+                    pairs[key] = self.parse_checked(properties[key], path + (key,))
+                elif schema.additional is False:
+                    self._fail(f"unexpected property {key!r}", path + (key,), token)
+                elif schema.additional is not None:
+                    pairs[key] = self.parse_checked(schema.additional, path + (key,))
+                elif self.keep_unknown or not schema.skip_unknown:
+                    pairs[key] = self.parse_value()
+                else:
+                    self._skip_value()
+                if self._token.type == 'RIGHT_BRACE':
+                    break
+                self.consume('COMMA')
+        missing = schema.required.difference(pairs)
+        if missing:
+            self._fail(f"missing required property {sorted(missing)[0]!r}", path, self._token)
+        node = ObjectNode(pairs)
+        node.start = start
+        node.end = self.consume('RIGHT_BRACE').end
+        return node
+
+    def _parse_array(self, schema: CompiledSchema, path: Tuple[Union[str, int], ...]) -> ArrayNode:
+        start = self.consume('LEFT_BRACKET').start
+        elements = []
+        items = schema.items
+        if self._token.type != 'RIGHT_BRACKET':
+            while True:
+                if self._token.type == 'EOF':
+                    raise ValueError("Unclosed array: expected ']'")
+                if schema.max_items is not None and len(elements) == schema.max_items:
+                    self._fail(f"more than {schema.max_items} items", path, self._token)
+                elements.append(self.parse_checked(items, path + (len(elements),)))
+                if self._token.type == 'RIGHT_BRACKET':
+                    break
+                self.consume('COMMA')
+        if len(elements) < schema.min_items:
+            self._fail(f"fewer than {schema.min_items} items", path, self._token)
+        node = ArrayNode(elements)
+        node.start = start
+        node.end = self.consume('RIGHT_BRACKET').end
+        return node
+
+    def _skip_value(self) -> None:
+        skip_value(self._token.type, self._next_type)
+
+    def _next_type(self) -> str:
+        self.advance()
+        return self._token.type
+
+    def _fail(self, message: str, path: Tuple[Union[str, int], ...], token: Token) -> None:
+        raise SchemaError(message, path, token.line, token.column)
+
+def parse_with_schema(source: Union[str, IO[str], Iterable[Token]], schema: Union[bool, Dict[str, Any]],
+                      keep_unknown: bool = False, chunk_size: int = 65536) -> ASTNode:
+    return SchemaParser(source, schema, keep_unknown, chunk_size).parse()
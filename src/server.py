@@ -0,0 +1,195 @@
+import asyncio
+import io
+import os
+import socket
+import stat
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional, Tuple
+
+# The wire format and the client side live in src.client, which stays
+# light enough for the CLI to import on every --client call
+from src.client import _LENGTH, _OK, _ERROR, default_socket_path, request, request_many
+
+def _private_directory(directory: str) -> None:
+    # The shared temp dir lets anyone create names in it, so only use a
+    # directory that this user owns and nobody else can enter
+    try:
+        os.mkdir(directory, 0o700)
+    except FileExistsError:
+        pass
+    info = os.lstat(directory)
+    if not stat.S_ISDIR(info.st_mode) or info.st_uid != os.getuid() or info.st_mode & 0o077:
+        raise PermissionError(f"{directory} must be a directory private to this user")
+
+def _decode_header(header: bytes) -> Tuple[str, Optional[int], int, Optional[str]]:
+    mode, indent, chunk_size, path = header.decode('utf-8').split('\0')
+    return mode, int(indent) if indent else None, int(chunk_size), path or None
+
+def _work(mode: str, indent: Optional[int], chunk_size: int, path: Optional[str],
+          body: bytes) -> Tuple[bool, str]:
+    # Runs in the worker processes
+    from src.batch import convert, convert_file
+    from src.compression import open_input
+    if path is not None:
+        result = convert_file(path, mode, indent, chunk_size)
+        return (True, result.output) if result.ok else (False, result.error)
+    out = io.StringIO()
+    try:
+        convert(open_input(io.BytesIO(body), chunk_size), out.write, mode, indent, chunk_size)
+    except Exception as e:
+        return False, str(e)
+    return True, out.getvalue()
+
+async def _read_frame(reader: asyncio.StreamReader) -> Optional[bytes]:
+    try:
+        size, = _LENGTH.unpack(await reader.readexactly(_LENGTH.size))
+        return await reader.readexactly(size)
+    except asyncio.IncompleteReadError as e:
+        if e.partial:
+            raise
+        return None  # clean end of connection
+
+class ParseServer:
+    """Parse daemon listening on a Unix domain socket.
+
+    Requests are handled concurrently on a process pool of `jobs` workers,
+    and responses on one connection come back in request order, so a
+    client may pipeline many requests. Successful outputs are kept in an
+    LRU keyed by content hash (or path, size and mtime) and options. The
+    server stops by itself after `idle_timeout` seconds without requests.
+    """
+
+    def __init__(self, socket_path: Optional[str] = None, jobs: Optional[int] = None,
+                 idle_timeout: float = 300.0, max_entries: int = 256, max_bytes: int = 64 * 1024 * 1024):
+        self.socket_path = socket_path or default_socket_path()
+        self.jobs = jobs or os.cpu_count() or 1
+        self.idle_timeout = idle_timeout
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.requests = 0
+        self.hits = 0
+        self._results: 'OrderedDict[str, str]' = OrderedDict()
+        self._bytes_used = 0
+        self._active = 0
+        self._last_activity = 0.0
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    def serve_forever(self) -> None:
+        asyncio.run(self.run())
+
+    async def run(self) -> None:
+        if self.socket_path == default_socket_path():
+            _private_directory(os.path.dirname(self.socket_path))
+        self._claim_socket()
+        loop = asyncio.get_running_loop()
+        self._last_activity = loop.time()
+        self._executor = ProcessPoolExecutor(max_workers=self.jobs)
+        server = await asyncio.start_unix_server(self._handle, path=self.socket_path)
+        try:
+            async with server:
+                await self._watch_idle()
+        finally:
+            self._executor.shutdown(cancel_futures=True)
+            try:
+                os.unlink(self.socket_path)
+            except OSError:
+                pass
+
+    def _claim_socket(self) -> None:
+        if not os.path.exists(self.socket_path):
+            return
+        probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            probe.connect(self.socket_path)
+        except OSError:
+            os.unlink(self.socket_path)  # left behind by a server that died
+            return
+        finally:
+            probe.close()
+        raise RuntimeError(f"A server is already listening on {self.socket_path}")
+
+    async def _watch_idle(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            remaining = self._last_activity + self.idle_timeout - loop.time()
+            if remaining <= 0 and not self._active:
+                return
+            await asyncio.sleep(max(remaining, 0.05))
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        responses: asyncio.Queue = asyncio.Queue()
+        sender = asyncio.create_task(self._send(writer, responses))
+        try:
+            while True:
+                header = await _read_frame(reader)
+                if header is None:
+                    break
+                body = await _read_frame(reader)
+                if body is None:
+                    break
+                responses.put_nowait(asyncio.ensure_future(self._process(header, body)))
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            responses.put_nowait(None)
+            await sender
+            writer.close()
+
+    async def _send(self, writer: asyncio.StreamWriter, responses: asyncio.Queue) -> None:
+        while True:
+            future = await responses.get()
+            if future is None:
+                return
+            ok, output = await future
+            payload = (_OK if ok else _ERROR) + output.encode('utf-8')
+            try:
+                writer.write(_LENGTH.pack(len(payload)) + payload)
+                await writer.drain()
+            except ConnectionError:
+                pass  # the client went away; keep draining so tasks finish
+
+    async def _process(self, header: bytes, body: bytes) -> Tuple[bool, str]:
+        loop = asyncio.get_running_loop()
+        self._active += 1
+        self.requests += 1
+        try:
+            try:
+                mode, indent, chunk_size, path = _decode_header(header)
+                key = self._key(mode, indent, path, body)
+            except (ValueError, OSError) as e:
+                return False, str(e)
+            output = self._results.get(key)
+            if output is not None:
+                self._results.move_to_end(key)
+                self.hits += 1
+                return True, output
+            ok, output = await loop.run_in_executor(self._executor, _work, mode, indent,
+                                                    chunk_size, path, body)
+            if ok:
+                self._store(key, output)
+            return ok, output
+        finally:
+            self._active -= 1
+            self._last_activity = loop.time()
+
+    @staticmethod
+    def _key(mode: str, indent: Optional[int], path: Optional[str], body: bytes) -> str:
+        from src.cache import ParseCache
+        if path is not None:
+            info = os.stat(path)
+            return ParseCache.key(path.encode('utf-8'), mode=mode, indent=indent,
+                                  size=info.st_size, mtime_ns=info.st_mtime_ns)
+        return ParseCache.key(body, mode=mode, indent=indent)
+
+    def _store(self, key: str, output: str) -> None:
+        if len(output) > self.max_bytes:
+            return
+        self._results[key] = output
+        self._bytes_used += len(output)
+        while len(self._results) > self.max_entries or self._bytes_used > self.max_bytes:
+            _, evicted = self._results.popitem(last=False)
+            self._bytes_used -= len(evicted)
+
+def serve(socket_path: Optional[str] = None, jobs: Optional[int] = None, idle_timeout: float = 300.0) -> None:
+    ParseServer(socket_path, jobs, idle_timeout).serve_forever()
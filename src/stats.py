@@ -0,0 +1,135 @@
+import time
+import tracemalloc
+from collections import Counter
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from src.lexer import lex
+from src.parser import Parser
+from src.ast import ASTNode, ObjectNode, ArrayNode
+
+PHASES = ('lex', 'parse', 'evaluate', 'encode')
+
+class PhaseStats:
+    def __init__(self, name: str, wall: float = 0.0, cpu: float = 0.0, peak_bytes: Optional[int] = None):
+        self.name = name
+        self.wall = wall
+        self.cpu = cpu
+        # Peak memory allocated during the phase, above what was live when it started
+        self.peak_bytes = peak_bytes
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {'wall': self.wall, 'cpu': self.cpu, 'peak_bytes': self.peak_bytes}
+
+class ParseStats:
+    """Where the time and memory of one parse went.
+
+    Filled in by collect_stats(). `phases` maps each phase name in PHASES
+    that was run to its PhaseStats.
+    """
+
+    def __init__(self, size: int = 0):
+        self.bytes = size
+        self.phases: Dict[str, PhaseStats] = {}
+        self.tokens: Dict[str, int] = {}
+        self.nodes: Dict[str, int] = {}
+        self.max_depth = 0
+
+    @property
+    def wall(self) -> float:
+        return sum(phase.wall for phase in self.phases.values())
+
+    @property
+    def cpu(self) -> float:
+        return sum(phase.cpu for phase in self.phases.values())
+
+    @property
+    def throughput(self) -> float:
+        # MB/s of input over the wall time of all phases
+        return self.bytes / 1e6 / self.wall if self.wall else 0.0
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            'bytes': self.bytes,
+            'wall': self.wall,
+            'cpu': self.cpu,
+            'mb_per_s': self.throughput,
+            'phases': {name: phase.as_dict() for name, phase in self.phases.items()},
+            'tokens': dict(self.tokens),
+            'nodes': dict(self.nodes),
+            'max_depth': self.max_depth,
+        }
+
+    def to_json(self) -> str:
+        import json
+        return json.dumps(self.as_dict(), indent=2)
+
+    def format_text(self) -> str:
+        lines = [f"bytes: {self.bytes}  wall: {self.wall * 1000:.3f} ms  cpu: {self.cpu * 1000:.3f} ms"
+                 f"  throughput: {self.throughput:.2f} MB/s"]
+        for name, phase in self.phases.items():
+            line = f"  {name:<9} wall {phase.wall * 1000:10.3f} ms  cpu {phase.cpu * 1000:10.3f} ms"
+            if phase.peak_bytes is not None:
+                line += f"  peak {phase.peak_bytes / 1024:10.1f} KiB"
+            lines.append(line)
+        lines.append("tokens: " + ', '.join(f"{kind}={count}" for kind, count in sorted(self.tokens.items())))
+        lines.append("nodes: " + ', '.join(f"{kind}={count}" for kind, count in sorted(self.nodes.items())))
+        lines.append(f"max depth: {self.max_depth}")
+        return '\n'.join(lines)
+
+    def __str__(self):
+        return self.format_text()
+
+def _measure(stats: ParseStats, name: str, memory: bool, func: Callable, *args) -> Any:
+    if memory:
+        tracemalloc.reset_peak()
+        baseline = tracemalloc.get_traced_memory()[0]
+    cpu = time.process_time()
+    wall = time.perf_counter()
+    result = func(*args)
+    wall = time.perf_counter() - wall
+    cpu = time.process_time() - cpu
+    peak = tracemalloc.get_traced_memory()[1] - baseline if memory else None
+    stats.phases[name] = PhaseStats(name, wall, cpu, peak)
+    return result
+
+def count_nodes(root: ASTNode) -> Tuple[Dict[str, int], int]:
+    """Count nodes by class name and find the maximum nesting depth."""
+    counts: Counter = Counter()
+    max_depth = 0
+    stack: List[Tuple[ASTNode, int]] = [(root, 1)]
+    while stack:
+        node, depth = stack.pop()
+        counts[type(node).__name__] += 1
+        if depth > max_depth:
+            max_depth = depth
+        if isinstance(node, ObjectNode):
+            stack.extend((child, depth + 1) for child in node.pairs.values())
+        elif isinstance(node, ArrayNode):
+            stack.extend((child, depth + 1) for child in node.elements)
+    return dict(counts), max_depth
+
+def collect_stats(text: str, encode: Optional[Callable[[Any], str]] = None,
+                  memory: bool = True) -> Tuple[Any, ParseStats]:
+    """Lex, parse and evaluate `text`, timing each phase.
+
+    If `encode` is given the evaluated value is passed through it as a
+    fourth phase, and its result is returned instead of the value. With
+    memory=True each phase's peak allocation is traced with tracemalloc,
+    which also slows every phase down; pass memory=False for timings
+    that are comparable with an untraced run.
+    """
+    stats = ParseStats(len(text.encode('utf-8')))
+    started = memory and not tracemalloc.is_tracing()
+    if started:
+        tracemalloc.start()
+    try:
+        tokens = _measure(stats, 'lex', memory, lex, text)
+        root = _measure(stats, 'parse', memory, lambda: Parser(tokens).parse())
+        result = _measure(stats, 'evaluate', memory, root.evaluate)
+        if encode is not None:
+            result = _measure(stats, 'encode', memory, encode, result)
+    finally:
+        if started:
+            tracemalloc.stop()
+    stats.tokens = dict(Counter(token.type for token in tokens))
+    stats.nodes, stats.max_depth = count_nodes(root)
+    return result, stats
@@ -0,0 +1,449 @@
+from __future__ import annotations
+import re
+from src.lexer import Token, LexerError
+from src.ast import ASTNode, ObjectNode, ArrayNode, StringNode, NumberNode, BooleanNode, NullNode
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Callable, IO, Iterable, Iterator, List, Optional, Tuple
+
+_TOKEN = re.compile(r'''[ \t\n\r]*(?:
+    (?P<punct>[{}\[\],:])
+  | "(?P<string>(?:[^"\\\x00-\x1f]|\\["\\/bfnrt]|\\u[0-9a-fA-F]{4})*)"
+  | (?P<number>-?(?:0|[1-9][0-9]*)(?:\.[0-9]+)?(?:[eE][+-]?[0-9]+)?)
+  | (?P<literal>true|false|null)
+)?''', re.VERBOSE)
+# What may still turn into a valid token once more input arrives
+_PARTIAL = re.compile(r'''
+    "(?:[^"\\\x00-\x1f]|\\["\\/bfnrt]|\\u[0-9a-fA-F]{4})*(?:\\(?:u[0-9a-fA-F]{0,3})?)?
+  | t(?:r(?:ue?)?)? | f(?:a(?:l(?:se?)?)?)? | n(?:u(?:ll?)?)?
+  | -?(?:0|[1-9][0-9]*)?(?:\.[0-9]*)?(?:[eE][+-]?[0-9]*)?
+''', re.VERBOSE)
+_ESCAPE = re.compile(r'\\(?:u(d[89ab][0-9a-f]{2})\\u(d[c-f][0-9a-f]{2})|u([0-9a-f]{4})|(.))', re.IGNORECASE)
+_ESCAPES = {'"': '"', '\\': '\\', '/': '/', 'b': '\b', 'f': '\f', 'n': '\n', 'r': '\r', 't': '\t'}
+_PUNCTUATION = {
+    '{': 'LEFT_BRACE',
+    '}': 'RIGHT_BRACE',
+    '[': 'LEFT_BRACKET',
+    ']': 'RIGHT_BRACKET',
+    ',': 'COMMA',
+    ':': 'COLON'
+}
+_LITERALS = {'true': 'BOOLEAN', 'false': 'BOOLEAN', 'null': 'NULL'}
+
+def _unescape(match) -> str:
+    high, low, code, char = match.groups()
+    if high:
+        return chr(0x10000 + ((int(high, 16) - 0xD800) << 10) + (int(low, 16) - 0xDC00))
+    if code:
+        return chr(int(code, 16))
+    return _ESCAPES[char]
+
+class StreamLexer:
+    """Incremental lexer: feed text in chunks and get tokens as they complete.
+
+    Produces the same Token objects as lex(), with offsets counted from the
+    start of the stream. Only the unfinished tail of the input is buffered,
+    so memory stays bounded by the longest single token. With raw=True,
+    STRING tokens keep their source text (quotes and escapes included)
+    instead of being decoded.
+    """
+
+    def __init__(self, raw: bool = False):
+        self.raw = raw
+        self._buffer = ''
+        self._offset = 0       # stream offset of _buffer[0]
+        self._line = 1
+        self._line_start = 0   # stream offset where the current line starts
+
+    def feed(self, chunk: str) -> List[Token]:
+        self._buffer += chunk
+        return self._scan(final=False)
+
+    def close(self) -> List[Token]:
+        tokens = self._scan(final=True)
+        end = self._offset
+        tokens.append(Token('EOF', '', self._line, end - self._line_start + 1, end, end))
+        return tokens
+
+    def _scan(self, final: bool) -> List[Token]:
+        buf = self._buffer
+        length = len(buf)
+        tokens = []
+        append = tokens.append
+        line = self._line
+        line_start = self._line_start - self._offset  # buffer index, may be negative
+        offset = self._offset
+        pos = 0
+        while True:
+            match = _TOKEN.match(buf, pos)
+            kind = match.lastgroup
+            if kind is None:
+                start = match.end()
+            elif kind == 'string':
+                start = match.start(kind) - 1  # the group excludes the opening quote
+            else:
+                start = match.start(kind)
+            if start != pos:
+                newlines = buf.count('\n', pos, start)
+                if newlines:
+                    line += newlines
+                    line_start = buf.rfind('\n', pos, start) + 1
+            if kind is None and start == length:
+                pos = start
+                break
+            end = match.end()
+            if not final and (kind is None or (kind == 'number' and end + 2 >= length) or
+                              (kind == 'literal' and end == length)):
+                if _PARTIAL.match(buf, start).end() == length:
+                    pos = start
+                    break  # wait for the rest of this token
+            column = start - line_start + 1
+            if kind is None:
+                self._line, self._line_start = line, offset + line_start
+                raise self._error(buf, start, column, final, tokens)
+            if kind == 'punct':
+                char = match.group(kind)
+                append(Token(_PUNCTUATION[char], char, line, column, offset + start, offset + end))
+            elif kind == 'string':
+                if self.raw:
+                    value = buf[start:end]
+                else:
+                    value = match.group(kind)
+                    if '\\' in value:
+                        value = _ESCAPE.sub(_unescape, value)
+                append(Token('STRING', value, line, column, offset + start, offset + end))
+            elif kind == 'number':
+                if end < length and buf[end].isdigit():
+                    error = LexerError("Numbers cannot have leading zeros", line, column)
+                    error.tokens = tokens
+                    raise error
+                append(Token('NUMBER', match.group(kind), line, column, offset + start, offset + end))
+            else:
+                literal = match.group(kind)
+                append(Token(_LITERALS[literal], literal, line, column, offset + start, offset + end))
+            pos = end
+        self._line = line
+        self._line_start = offset + line_start
+        self._buffer = buf[pos:]
+        self._offset = offset + pos
+        return tokens
+
+    def _error(self, buf: str, pos: int, column: int, final: bool, tokens: List[Token]) -> LexerError:
+        char = buf[pos]
+        if char == '"':
+            if final and _PARTIAL.match(buf, pos).end() == len(buf):
+                message = "Unterminated string"
+            else:
+                message = "Invalid escape or control character in string"
+        elif char == '-' or char.isdigit():
+            message = "Invalid number format"
+        else:
+            message = f"Unexpected character: {char}"
+        error = LexerError(message, self._line, column)
+        # The tokens completed earlier in this chunk, so callers can still use them
+        error.tokens = tokens
+        return error
+
+def iter_tokens(stream: IO[str], chunk_size: int = 65536) -> Iterator[Token]:
+    lexer = StreamLexer()
+    while True:
+        chunk = stream.read(chunk_size)
+        if not chunk:
+            break
+        yield from lexer.feed(chunk)
+    yield from lexer.close()
+
+def parse_stream(source: IO[str], chunk_size: int = 65536) -> ASTNode:
+    """Parse one document from a text stream, lexing and parsing chunk by chunk.
+
+    Only the AST and the current chunk are held, never the whole text.
+    """
+    lexer = StreamLexer()
+    parser = StreamParser()
+    while True:
+        chunk = source.read(chunk_size)
+        if not chunk:
+            break
+        parser.feed(lexer.feed(chunk))
+    parser.feed(lexer.close())
+    return parser.close()
+
+def _discard(text: str) -> None:
+    pass
+
+def _identity(text: str) -> str:
+    return text
+
+# Formatter and parser states: what the next token is allowed to be
+_VALUE, _FIRST_VALUE, _FIRST_KEY, _KEY, _COLON, _COMMA, _DONE = range(7)
+_ITEM = object()  # path component of an array element, spelled 'item' in prefixes
+
+class TokenFormatter:
+    """Re-emit a token stream as compact or indented JSON while checking it.
+
+    Only a stack of open containers is kept, so memory is bounded by the
+    nesting depth. Output matches json.dumps(value, indent=indent,
+    separators=separators), except that number lexemes are copied through
+    unchanged. With raw=True, STRING token values are taken to be source
+    slices (see StreamLexer) and copied as well; with output=False nothing
+    is emitted and only the structure is checked.
+    """
+
+    def __init__(self, indent: Optional[int] = None, separators: Optional[Tuple[str, str]] = None,
+                 raw: bool = False, output: bool = True):
+        self.indent = indent
+        self.raw = raw
+        self.output = output
+        self._stack: List[str] = []
+        self._state = _VALUE
+        if separators is None:
+            separators = (',', ': ') if indent is not None else (', ', ': ')
+        self._item_separator, self._key_separator = separators
+
+    def _newline(self, depth: int) -> str:
+        return '\n' + ' ' * (self.indent * depth)
+
+    def format(self, tokens: Iterable[Token]) -> str:
+        out = []
+        emit = out.append if self.output else _discard
+        if self.raw or not self.output:
+            encode = _identity
+        else:
+            from json.encoder import encode_basestring_ascii as encode
+        stack = self._stack
+        state = self._state
+        pretty = self.indent is not None and self.output
+        for token in tokens:
+            kind = token.type
+            if state == _COMMA:
+                if kind == 'COMMA':
+                    emit(self._item_separator)
+                    if pretty:
+                        emit(self._newline(len(stack)))
+                    state = _KEY if stack[-1] == '{' else _VALUE
+                    continue
+                if kind == ('RIGHT_BRACE' if stack[-1] == '{' else 'RIGHT_BRACKET'):
+                    stack.pop()
+                    if pretty:
+                        emit(self._newline(len(stack)))
+                    emit(token.value)
+                    state = _COMMA if stack else _DONE
+                    continue
+                self._fail(token, "Expected ',' or closing bracket")
+            elif state == _COLON:
+                if kind != 'COLON':
+                    self._fail(token, "Expected COLON")
+                emit(self._key_separator)
+                state = _VALUE
+                continue
+            elif state == _FIRST_KEY or state == _KEY:
+                if kind == 'RIGHT_BRACE' and state == _FIRST_KEY:
+                    stack.pop()
+                    emit('}')
+                    state = _COMMA if stack else _DONE
+                    continue
+                if kind != 'STRING':
+                    self._fail(token, "Expected string key in object")
+                if state == _FIRST_KEY and pretty:
+                    emit(self._newline(len(stack)))
+                emit(encode(token.value))
+                state = _COLON
+                continue
+            elif state == _DONE:
+                if kind != 'EOF':
+                    self._fail(token, "Unexpected tokens after parsing completed")
+                continue
+
+            # _VALUE or _FIRST_VALUE
+            if kind == 'RIGHT_BRACKET' and state == _FIRST_VALUE:
+                stack.pop()
+                emit(']')
+                state = _COMMA if stack else _DONE
+                continue
+            if state == _FIRST_VALUE and pretty and kind != 'EOF':
+                emit(self._newline(len(stack)))
+            if kind == 'LEFT_BRACE' or kind == 'LEFT_BRACKET':
+                emit(token.value)
+                stack.append(token.value)
+                state = _FIRST_KEY if kind == 'LEFT_BRACE' else _FIRST_VALUE
+                continue
+            if kind == 'STRING':
+                emit(encode(token.value))
+            elif kind == 'NUMBER' or kind == 'BOOLEAN' or kind == 'NULL':
+                emit(token.value)
+            elif kind == 'EOF':
+                self._fail(token, "Unexpected end of input")
+            else:
+                self._fail(token, f"Unexpected token: {kind}")
+            state = _COMMA if stack else _DONE
+        self._state = state
+        return ''.join(out)
+
+    def finish(self) -> None:
+        if self._state != _DONE:
+            raise ValueError("Unexpected end of input")
+
+    def _fail(self, token: Token, message: str) -> None:
+        raise ValueError(f"{message} at line {token.line}, column {token.column}")
+
+def reformat_stream(source: IO[str], write: Callable[[str], object], indent: Optional[int] = None,
+                    chunk_size: int = 65536, separators: Optional[Tuple[str, str]] = None,
+                    raw: bool = False) -> None:
+    """Copy JSON from `source` to `write`, reformatting chunk by chunk.
+
+    With raw=True strings are copied from the source without being decoded
+    and re-escaped, so the output keeps their original spelling.
+    """
+    lexer = StreamLexer(raw=raw)
+    formatter = TokenFormatter(indent, separators, raw=raw)
+    while True:
+        chunk = source.read(chunk_size)
+        if not chunk:
+            break
+        output = formatter.format(lexer.feed(chunk))
+        if output:
+            write(output)
+    output = formatter.format(lexer.close())
+    if output:
+        write(output)
+    formatter.finish()
+
+def validate_stream(source: IO[str], chunk_size: int = 65536) -> None:
+    """Raise LexerError/ValueError unless `source` holds exactly one JSON value."""
+    lexer = StreamLexer(raw=True)
+    formatter = TokenFormatter(raw=True, output=False)
+    while True:
+        chunk = source.read(chunk_size)
+        if not chunk:
+            break
+        formatter.format(lexer.feed(chunk))
+    formatter.format(lexer.close())
+    formatter.finish()
+
+class StreamParser:
+    """Push parser: feed it tokens in batches and it builds the same AST as Parser.
+
+    Without a prefix the finished tree is in `root` after close(). With a
+    prefix, every value found at that path is returned from feed() as soon
+    as it is complete and is not kept in the tree, so memory stays bounded
+    by one item. Paths are dotted: '' is the top-level value, 'item' each
+    element of a top-level array, and 'rows.item' each element of the
+    array under the "rows" key.
+    """
+
+    def __init__(self, prefix: Optional[str] = None):
+        self.prefix = None
+        if prefix is not None:
+            self.prefix = [_ITEM if part == 'item' else part for part in prefix.split('.')] if prefix else []
+        self.root: Optional[ASTNode] = None
+        self._stack: List[list] = []   # open containers: [children, start]
+        self._path: List[Optional[str]] = []
+        self._state = _VALUE
+        self._error: Optional[Exception] = None
+
+    def feed(self, tokens: Iterable[Token]) -> List[ASTNode]:
+        if self._error is not None:
+            raise self._error
+        items: List[ASTNode] = []
+        try:
+            self._feed(tokens, items)
+        except ValueError as e:
+            if not items:
+                raise
+            # Hand out the items finished before the error; raise it next time
+            self._error = e
+        return items
+
+    def _feed(self, tokens: Iterable[Token], items: List[ASTNode]) -> None:
+        stack = self._stack
+        path = self._path
+        state = self._state
+        for token in tokens:
+            kind = token.type
+            if state == _COMMA:
+                if kind == 'COMMA':
+                    state = _KEY if path[-1] is not _ITEM else _VALUE
+                    continue
+                if kind == ('RIGHT_BRACKET' if path[-1] is _ITEM else 'RIGHT_BRACE'):
+                    state = self._complete(self._close(token), items)
+                    continue
+                self._fail(token, "Expected ',' or closing bracket")
+            elif state == _COLON:
+                if kind != 'COLON':
+                    self._fail(token, f"Expected COLON, but got {kind}")
+                state = _VALUE
+                continue
+            elif state == _FIRST_KEY or state == _KEY:
+                if kind == 'RIGHT_BRACE' and state == _FIRST_KEY:
+                    state = self._complete(self._close(token), items)
+                    continue
+                if kind != 'STRING':
+                    self._fail(token, "Expected string key in object")
+                path[-1] = token.value
+                state = _COLON
+                continue
+            elif state == _DONE:
+                if kind != 'EOF':
+                    self._fail(token, "Unexpected tokens after parsing completed")
+                continue
+
+            # _VALUE or _FIRST_VALUE
+            if kind == 'RIGHT_BRACKET' and state == _FIRST_VALUE:
+                state = self._complete(self._close(token), items)
+                continue
+            if kind == 'LEFT_BRACE':
+                stack.append([{}, token.start])
+                path.append(None)
+                state = _FIRST_KEY
+                continue
+            if kind == 'LEFT_BRACKET':
+                stack.append([[], token.start])
+                path.append(_ITEM)
+                state = _FIRST_VALUE
+                continue
+            if kind == 'STRING':
+                node = StringNode(token.value)
+            elif kind == 'NUMBER':
+                node = NumberNode(float(token.value))
+            elif kind == 'BOOLEAN':
+                node = BooleanNode(token.value == 'true')
+            elif kind == 'NULL':
+                node = NullNode()
+            elif kind == 'EOF':
+                self._fail(token, "Unexpected end of input")
+            else:
+                self._fail(token, f"Unexpected token: {kind}")
+            node.start = token.start
+            node.end = token.end
+            state = self._complete(node, items)
+        self._state = state
+
+    def close(self) -> Optional[ASTNode]:
+        if self._error is not None:
+            raise self._error
+        if self._state != _DONE:
+            raise ValueError("Unexpected end of input")
+        return self.root
+
+    def _close(self, token: Token) -> ASTNode:
+        children, start = self._stack.pop()
+        self._path.pop()
+        node = ObjectNode(children) if type(children) is dict else ArrayNode(children)
+        node.start = start
+        node.end = token.end
+        return node
+
+    def _complete(self, node: ASTNode, items: List[ASTNode]) -> int:
+        stack = self._stack
+        if self.prefix is not None and self._path == self.prefix:
+            items.append(node)
+        elif not stack:
+            self.root = node
+        elif self._path[-1] is _ITEM:
+            stack[-1][0].append(node)
+        else:
+            stack[-1][0][self._path[-1]] = node  # a repeated key keeps the last value
+        return _COMMA if stack else _DONE
+
+    def _fail(self, token: Token, message: str) -> None:
+        raise ValueError(f"{message} at line {token.line}, column {token.column}")
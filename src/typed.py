@@ -0,0 +1,346 @@
+from __future__ import annotations
+import dataclasses
+import threading
+import types
+import typing
+from typing import Any, Callable, Dict, List, Tuple, Type, TypeVar, Union
+from src.lexer import Token
+from src.parser import Parser
+from src.schema import SchemaError, skip_value
+from src.stream import StreamLexer
+
+T = TypeVar('T')
+# A decoder reads the value starting at tokens[index] and returns it with the index just past it
+Decoder = Callable[[List[Token], int], Tuple[Any, int]]
+
+_KINDS = {
+    'LEFT_BRACE': 'object',
+    'LEFT_BRACKET': 'array',
+    'STRING': 'string',
+    'NUMBER': 'number',
+    'BOOLEAN': 'boolean',
+    'NULL': 'null',
+    'EOF': 'end of input',
+}
+_NoneType = type(None)
+# `int | None` (PEP 604) has its own origin type on Python 3.10+
+_UNION_ORIGINS = (Union, getattr(types, 'UnionType', Union))
+# Decoders compiled while a class decoder is being built, published together
+# once it is complete so other threads never see a half-built field table
+_building = threading.local()
+
+class DecodeError(SchemaError):
+    """A value did not match the annotated type; `path` leads to the field."""
+
+def _mismatch(expected: str, token: Token) -> DecodeError:
+    return DecodeError(f"expected {expected}, got {_KINDS.get(token.type, token.type)}", (),
+                       token.line, token.column)
+
+def _decode_str(tokens: List[Token], index: int) -> Tuple[Any, int]:
+    token = tokens[index]
+    if token.type != 'STRING':
+        raise _mismatch('str', token)
+    return token.value, index + 1
+
+def _decode_int(tokens: List[Token], index: int) -> Tuple[Any, int]:
+    token = tokens[index]
+    if token.type == 'NUMBER':
+        try:
+            return int(token.value), index + 1
+        except ValueError:
+            value = float(token.value)
+            if value.is_integer():
+                return int(value), index + 1
+    raise _mismatch('int', token)
+
+def _decode_float(tokens: List[Token], index: int) -> Tuple[Any, int]:
+    token = tokens[index]
+    if token.type != 'NUMBER':
+        raise _mismatch('float', token)
+    return float(token.value), index + 1
+
+def _decode_bool(tokens: List[Token], index: int) -> Tuple[Any, int]:
+    token = tokens[index]
+    if token.type != 'BOOLEAN':
+        raise _mismatch('bool', token)
+    return token.value == 'true', index + 1
+
+def _decode_none(tokens: List[Token], index: int) -> Tuple[Any, int]:
+    token = tokens[index]
+    if token.type != 'NULL':
+        raise _mismatch('null', token)
+    return None, index + 1
+
+def _decode_any(tokens: List[Token], index: int) -> Tuple[Any, int]:
+    parser = Parser(tokens)
+    parser.current = index
+    return parser.parse_value().evaluate(), parser.current
+
+def _skip(tokens: List[Token], index: int) -> int:
+    position = index
+
+    def advance() -> str:
+        nonlocal position
+        position += 1
+        return tokens[position].type
+
+    skip_value(tokens[index].type, advance)
+    return position
+
+def _expect_separator(tokens: List[Token], index: int, closing: str) -> Tuple[bool, int]:
+    kind = tokens[index].type
+    if kind == closing:
+        return True, index + 1
+    if kind != 'COMMA':
+        raise ValueError(f"Expected COMMA, but got {kind}")
+    return False, index + 1
+
+def _list_decoder(item: Decoder, factory: Callable = list) -> Decoder:
+    def decode(tokens: List[Token], index: int) -> Tuple[Any, int]:
+        token = tokens[index]
+        if token.type != 'LEFT_BRACKET':
+            raise _mismatch('array', token)
+        index += 1
+        values = []
+        if tokens[index].type == 'RIGHT_BRACKET':
+            return factory(values), index + 1
+        append = values.append
+        while True:
+            try:
+                value, index = item(tokens, index)
+            except DecodeError as error:
+                error.path = (len(values),) + error.path
+                raise
+            append(value)
+            done, index = _expect_separator(tokens, index, 'RIGHT_BRACKET')
+            if done:
+                return factory(values), index
+    return decode
+
+def _dict_decoder(item: Decoder) -> Decoder:
+    def decode(tokens: List[Token], index: int) -> Tuple[Any, int]:
+        token = tokens[index]
+        if token.type != 'LEFT_BRACE':
+            raise _mismatch('object', token)
+        index += 1
+        values = {}
+        if tokens[index].type == 'RIGHT_BRACE':
+            return values, index + 1
+        while True:
+            key = _read_key(tokens, index)
+            try:
+                values[key], index = item(tokens, index + 2)
+            except DecodeError as error:
+                error.path = (key,) + error.path
+                raise
+            done, index = _expect_separator(tokens, index, 'RIGHT_BRACE')
+            if done:
+                return values, index
+    return decode
+
+def _read_key(tokens: List[Token], index: int) -> str:
+    token = tokens[index]
+    if token.type != 'STRING':
+        raise ValueError("Expected string key in object")
+    if tokens[index + 1].type != 'COLON':
+        raise ValueError(f"Expected COLON, but got {tokens[index + 1].type}")
+    return token.value
+
+def _literal_decoder(values: Tuple[Any, ...]) -> Decoder:
+    # bool is checked apart from int so Literal[1] does not accept true
+    allowed = {(type(value) is bool, value) for value in values}
+    expected = ' or '.join(repr(value) for value in values)
+
+    def decode(tokens: List[Token], index: int) -> Tuple[Any, int]:
+        token = tokens[index]
+        kind = token.type
+        if kind == 'STRING':
+            value = token.value
+        elif kind == 'NUMBER':
+            value = float(token.value)
+            if value.is_integer():
+                value = int(value)
+        elif kind == 'BOOLEAN':
+            value = token.value == 'true'
+        elif kind == 'NULL':
+            value = None
+        else:
+            raise _mismatch(expected, token)
+        if (type(value) is bool, value) not in allowed:
+            raise DecodeError(f"expected {expected}, got {value!r}", (), token.line, token.column)
+        return value, index + 1
+    return decode
+
+def _union_decoder(options: List[Decoder], names: str) -> Decoder:
+    # Decoders never mutate shared state, so a failed option can simply be retried with the next
+    def decode(tokens: List[Token], index: int) -> Tuple[Any, int]:
+        for option in options:
+            try:
+                return option(tokens, index)
+            except DecodeError:
+                pass
+        raise _mismatch(names, tokens[index])
+    return decode
+
+def _optional_decoder(inner: Decoder) -> Decoder:
+    def decode(tokens: List[Token], index: int) -> Tuple[Any, int]:
+        if tokens[index].type == 'NULL':
+            return None, index + 1
+        return inner(tokens, index)
+    return decode
+
+def _class_decoder(cls: type) -> Decoder:
+    """Build instances of a dataclass, or of a plain class with annotated __slots__.
+
+    Dataclasses are constructed through their __init__ so defaults and
+    __post_init__ apply. Slotted classes are created with __new__ and
+    their slots assigned directly; Optional slots default to None.
+    Unknown keys are skipped without building anything.
+    """
+    fields: Dict[str, Decoder] = {}
+    hints = typing.get_type_hints(cls)
+    if dataclasses.is_dataclass(cls):
+        names = [field.name for field in dataclasses.fields(cls) if field.init]
+        required = frozenset(field.name for field in dataclasses.fields(cls) if field.init
+                             and field.default is dataclasses.MISSING
+                             and field.default_factory is dataclasses.MISSING)
+        defaults: Dict[str, Any] = {}
+        build = None
+    else:
+        names = [name for name in _slots(cls) if name in hints]
+        defaults = {name: None for name in names if _is_optional(hints[name])}
+        required = frozenset(names) - defaults.keys()
+        new = cls.__new__
+
+        def build(values: Dict[str, Any]) -> Any:
+            instance = new(cls)
+            for name, value in values.items():
+                setattr(instance, name, value)
+            return instance
+
+    def decode(tokens: List[Token], index: int) -> Tuple[Any, int]:
+        token = tokens[index]
+        if token.type != 'LEFT_BRACE':
+            raise _mismatch(cls.__name__, token)
+        index += 1
+        values = dict(defaults) if defaults else {}
+        if tokens[index].type == 'RIGHT_BRACE':
+            index += 1
+        else:
+            while True:
+                key = _read_key(tokens, index)
+                field = fields.get(key)
+                if field is None:
+                    index = _skip(tokens, index + 2)
+                else:
+                    try:
+                        values[key], index = field(tokens, index + 2)
+                    except DecodeError as error:
+                        error.path = (key,) + error.path
+                        raise
+                done, index = _expect_separator(tokens, index, 'RIGHT_BRACE')
+                if done:
+                    break
+        if not required.issubset(values):
+            closing = tokens[index - 1]
+            missing = sorted(required.difference(values))[0]
+            raise DecodeError(f"missing field {missing!r} of {cls.__name__}", (), closing.line, closing.column)
+        if build is None:
+            return cls(**values), index
+        return build(values), index
+
+    pending = getattr(_building, 'decoders', None)
+    outermost = pending is None
+    if outermost:
+        pending = _building.decoders = {}
+    # Visible to this thread before the fields are compiled so recursive types find it
+    pending[cls] = decode
+    try:
+        for name in names:
+            fields[name] = decoder_for(hints[name])
+        if outermost:
+            _DECODERS.update(pending)
+    finally:
+        if outermost:
+            del _building.decoders
+    return decode
+
+def _slots(cls: type) -> List[str]:
+    slots = []
+    for klass in reversed(cls.__mro__):
+        declared = vars(klass).get('__slots__', ())
+        slots.extend((declared,) if isinstance(declared, str) else declared)
+    return slots
+
+def _is_optional(annotation: Any) -> bool:
+    return typing.get_origin(annotation) in _UNION_ORIGINS and _NoneType in typing.get_args(annotation)
+
+_DECODERS: Dict[Any, Decoder] = {
+    str: _decode_str,
+    int: _decode_int,
+    float: _decode_float,
+    bool: _decode_bool,
+    None: _decode_none,
+    _NoneType: _decode_none,
+    Any: _decode_any,
+    object: _decode_any,
+    list: _decode_any,
+    dict: _decode_any,
+}
+
+def decoder_for(annotation: Any) -> Decoder:
+    """Return the cached decoder for a type annotation, compiling it on first use."""
+    decoder = _DECODERS.get(annotation)
+    if decoder is not None:
+        return decoder
+    pending = getattr(_building, 'decoders', None)
+    if pending is not None:
+        decoder = pending.get(annotation)
+        if decoder is not None:
+            return decoder
+    origin = typing.get_origin(annotation)
+    args = typing.get_args(annotation)
+    if origin in (list, List):
+        decoder = _list_decoder(decoder_for(args[0]) if args else _decode_any)
+    elif origin is tuple and len(args) == 2 and args[1] is Ellipsis:
+        decoder = _list_decoder(decoder_for(args[0]), tuple)
+    elif origin in (dict, Dict):
+        if args and args[0] is not str:
+            raise TypeError(f"Dict keys must be str, not {args[0]!r}")
+        decoder = _dict_decoder(decoder_for(args[1]) if args else _decode_any)
+    elif origin is typing.Literal:
+        decoder = _literal_decoder(args)
+    elif origin in _UNION_ORIGINS:
+        options = [arg for arg in args if arg is not _NoneType]
+        if len(options) == 1:
+            decoder = decoder_for(options[0])
+        else:
+            names = ' or '.join(getattr(arg, '__name__', repr(arg)) for arg in options)
+            decoder = _union_decoder([decoder_for(arg) for arg in options], names)
+        if len(options) < len(args):
+            decoder = _optional_decoder(decoder)
+    elif isinstance(annotation, type) and (dataclasses.is_dataclass(annotation) or hasattr(annotation, '__slots__')):
+        return _class_decoder(annotation)
+    else:
+        raise TypeError(f"Unsupported type for parse_as: {annotation!r}")
+    (_DECODERS if pending is None else pending)[annotation] = decoder
+    return decoder
+
+def decode_tokens(tokens: List[Token], annotation: Type[T]) -> T:
+    value, index = decoder_for(annotation)(tokens, 0)
+    if tokens[index].type != 'EOF':
+        raise ValueError("Unexpected tokens after parsing completed")
+    return value
+
+def parse_as(text: str, annotation: Type[T]) -> T:
+    """Parse `text` straight into `annotation` without building an AST.
+
+    Supports dataclasses, classes with annotated __slots__, str, int,
+    float, bool, None, Any, List/list, Tuple[T, ...], Dict[str, T],
+    Optional, Union and Literal. A value that does not fit raises
+    DecodeError, whose path leads to the offending field.
+    """
+    lexer = StreamLexer()
+    tokens = lexer.feed(text)
+    tokens += lexer.close()
+    return decode_tokens(tokens, annotation)
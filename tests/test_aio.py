@@ -0,0 +1,98 @@
+import asyncio
+import pytest
+from src.lexer import lex, LexerError
+from src.parser import Parser
+from src.stream import StreamParser
+from src.aio import aiter_items, parse_stream
+
+TEXT = '{"meta": {"n": 2}, "rows": [{"a": 1, "s": "h\\u00e9"}, [2, "x"], null], "z": []}'
+
+def _reader(data, limit=None):
+    reader = asyncio.StreamReader(limit=limit or 2 ** 16)
+    reader.feed_data(data)
+    reader.feed_eof()
+    return reader
+
+def test_stream_parser_matches_parser():
+    parser = StreamParser()
+    tokens = lex(TEXT)
+    for i in range(0, len(tokens), 3):
+        assert parser.feed(tokens[i:i + 3]) == []
+    root = parser.close()
+    expected = Parser(lex(TEXT)).parse()
+    assert root.evaluate() == expected.evaluate()
+    assert (root.start, root.end) == (expected.start, expected.end)
+    assert root.pairs['rows'].elements[1].start == expected.pairs['rows'].elements[1].start
+
+def test_stream_parser_prefix_items_are_not_kept():
+    parser = StreamParser('rows.item')
+    items = parser.feed(lex(TEXT))
+    assert [item.evaluate() for item in items] == [{"a": 1, "s": "hé"}, [2, "x"], None]
+    assert parser.close().evaluate() == {"meta": {"n": 2}, "rows": [], "z": []}
+
+@pytest.mark.parametrize('text', ['[1,]', '{"a" 1}', '[1', '{"a":1,}', '1 2', '{1:2}', ''])
+def test_stream_parser_errors(text):
+    parser = StreamParser()
+    with pytest.raises(ValueError):
+        parser.feed(lex(text))
+        parser.close()
+
+def test_parse_stream_small_chunks():
+    data = TEXT.encode('utf-8')
+    root = asyncio.run(parse_stream(_reader(data), chunk_size=5))
+    assert root.evaluate() == Parser(lex(TEXT)).parse().evaluate()
+
+def test_aiter_items_with_offload():
+    data = ('[' + ', '.join(f'{{"id": {i}}}' for i in range(200)) + ']').encode('utf-8')
+
+    async def collect():
+        return [item.evaluate()['id'] async for item in aiter_items(_reader(data), chunk_size=64, offload_size=32)]
+
+    assert asyncio.run(collect()) == list(range(200))
+
+def test_aiter_items_yields_before_error():
+    async def collect(seen):
+        async for item in aiter_items(_reader(b'[1, 2, }'), chunk_size=4):
+            seen.append(item.evaluate())
+
+    seen = []
+    with pytest.raises(ValueError):
+        asyncio.run(collect(seen))
+    assert seen == [1, 2]
+
+@pytest.mark.parametrize('data, chunk_size', [
+    (b'[1, 2, 3, @]', 65536),
+    (b'[1, 2, 3, 01]', 65536),
+    (b'[1, 2, 3, "\x01"]', 4),
+    (b'[1, 2, 3, "open', 65536),
+])
+def test_aiter_items_yields_before_lexer_error_in_the_same_chunk(data, chunk_size):
+    async def collect(seen):
+        async for item in aiter_items(_reader(data), chunk_size=chunk_size):
+            seen.append(item.evaluate())
+
+    seen = []
+    with pytest.raises(LexerError):
+        asyncio.run(collect(seen))
+    assert seen == [1, 2, 3]
+
+def test_parse_stream_yields_to_other_tasks():
+    data = ('[' + ', '.join(['"abcdefgh"'] * 2000) + ']').encode('utf-8')
+
+    async def main():
+        ticks = 0
+        done = False
+
+        async def ticker():
+            nonlocal ticks
+            while not done:
+                ticks += 1
+                await asyncio.sleep(0)
+
+        task = asyncio.ensure_future(ticker())
+        await parse_stream(_reader(data), chunk_size=1024)
+        done = True
+        await task
+        return ticks
+
+    assert asyncio.run(main()) > 5
@@ -0,0 +1,103 @@
+import subprocess
+import sys
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+import src.batch
+from src.batch import BatchSummary, FileResult, convert_file, expand_paths, parse_many, run_batch
+
+def _cli(*args):
+    return subprocess.run([sys.executable, '-c', 'from src import main; main()'] + list(args),
+                          capture_output=True, text=True)
+
+def _write(tmp_path, count):
+    paths = []
+    for i in range(count):
+        path = tmp_path / f'doc{i:02}.json'
+        path.write_text(f'{{"id": {i}, "tags": ["a", "b"]}}')
+        paths.append(str(path))
+    return paths
+
+def test_convert_file_modes(tmp_path):
+    path, = _write(tmp_path, 1)
+    assert convert_file(path).output == '{"id": 0.0, "tags": ["a", "b"]}\n'
+    assert convert_file(path, mode='minify').output == '{"id":0,"tags":["a","b"]}\n'
+    result = convert_file(path, mode='validate')
+    assert result.ok and result.output == '' and result.size > 0
+
+def test_convert_file_reports_errors(tmp_path):
+    bad = tmp_path / 'bad.json'
+    bad.write_text('{"a": ')
+    result = convert_file(str(bad))
+    assert not result.ok and result.error
+    missing = convert_file(str(tmp_path / 'missing.json'))
+    assert not missing.ok and missing.size == 0
+
+def test_expand_paths_keeps_order_and_unmatched_patterns(tmp_path):
+    paths = _write(tmp_path, 3)
+    (tmp_path / 'sub').mkdir()
+    expanded = expand_paths([paths[2], str(tmp_path / '*.json'), str(tmp_path / '*.none')])
+    assert expanded == [paths[2]] + paths + [str(tmp_path / '*.none')]
+
+def test_run_batch_ordered_and_unordered(tmp_path):
+    paths = _write(tmp_path, 6)
+    ordered = list(run_batch(paths, jobs=3, mode='minify'))
+    assert [result.path for result in ordered] == paths
+    assert ordered[4].output == '{"id":4,"tags":["a","b"]}\n'
+    unordered = list(run_batch(paths, jobs=3, ordered=False, mode='minify'))
+    assert sorted(result.path for result in unordered) == paths
+
+def test_summary():
+    summary = BatchSummary()
+    summary.add(FileResult('a', 100, '{}'))
+    summary.add(FileResult('b', 50, error='boom'))
+    stats = summary.as_dict()
+    assert (stats['files'], stats['failed'], stats['bytes']) == (2, 1, 150)
+    assert '2 files (1 failed), 150 bytes' in str(summary)
+
+def test_cli_many_files(tmp_path):
+    paths = _write(tmp_path, 4)
+    result = _cli('--minify', '-j', '2', str(tmp_path / '*.json'))
+    assert result.returncode == 0
+    assert result.stdout.splitlines() == [f'{{"id":{i},"tags":["a","b"]}}' for i in range(4)]
+    assert '4 files (0 failed)' in result.stderr and 'MB/s' in result.stderr
+
+def test_cli_batch_failure_sets_exit_status(tmp_path):
+    paths = _write(tmp_path, 2)
+    bad = tmp_path / 'bad.json'
+    bad.write_text('[1, 2')
+    result = _cli('--validate', paths[0], str(bad), paths[1])
+    assert result.returncode == 1
+    assert f'Error: {bad}:' in result.stderr
+    assert '3 files (1 failed)' in result.stderr
+
+DOCUMENTS = ['{"id": %d, "tags": ["a", "b"]}' % i for i in range(40)] + ['[1,', b'[true, null]', '"x"']
+EXPECTED = [{'id': float(i), 'tags': ['a', 'b']} for i in range(40)]
+
+@pytest.mark.parametrize('executor', ['auto', 'thread', 'process'])
+def test_parse_many_keeps_order_and_errors(executor):
+    results = parse_many(iter(DOCUMENTS), executor, jobs=2, chunk_bytes=100, evaluate=True)
+    assert [result.value for result in results[:40]] == EXPECTED
+    assert not results[40].ok and 'Unclosed array' in results[40].error
+    assert results[41].value == [True, None] and results[42].value == 'x'
+
+def test_parse_many_returns_asts_and_accepts_executors():
+    with ThreadPoolExecutor(4) as pool:
+        results = parse_many(DOCUMENTS[:40], pool, chunk_bytes=1)
+    assert [result.value.evaluate() for result in results] == EXPECTED
+    assert parse_many([], 'thread') == []
+    with pytest.raises(ValueError):
+        parse_many(DOCUMENTS, 'fiber')
+
+def test_parse_many_auto_prefers_threads_without_gil(monkeypatch):
+    chosen = []
+    monkeypatch.setattr(src.batch, 'gil_enabled', lambda: False)
+    original = src.batch._chunks
+    monkeypatch.setattr(src.batch, '_chunks', lambda docs, size: chosen.append(size) or original(docs, size))
+    assert [result.value for result in parse_many(DOCUMENTS[:40], evaluate=True)] == EXPECTED
+    assert chosen == [64 * 1024]
+
+def test_parse_many_threads_match_serial():
+    documents = ['{"n": [%s]}' % ', '.join(str(j) for j in range(i % 50)) for i in range(400)]
+    serial = [result.value for result in parse_many(documents, 'auto', evaluate=True)]
+    threaded = [result.value for result in parse_many(documents, 'thread', jobs=8, chunk_bytes=64, evaluate=True)]
+    assert threaded == serial
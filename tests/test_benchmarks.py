@@ -0,0 +1,38 @@
+import json
+import pytest
+from benchmarks.corpus import CORPORA, build, parse_size
+from benchmarks.suite import compare, percentile, run
+
+@pytest.mark.parametrize('name', list(CORPORA))
+def test_corpora_are_valid_and_sized(name):
+    text = build(name, 8192, seed=1)
+    assert len(text.encode('utf-8')) >= 8192
+    json.loads(text)
+    assert build(name, 8192, seed=1) == text
+
+def test_parse_size():
+    assert parse_size('128KB') == 128 * 1024
+    assert parse_size('1.5mb') == 3 * 512 * 1024
+    assert parse_size('1GB') == 1 << 30
+    assert parse_size('100') == 100
+
+def test_percentile():
+    assert percentile([3, 1, 2], 50) == 2
+    assert percentile([1, 2, 3, 4], 50) == 2.5
+    assert percentile([5], 90) == 5
+    assert percentile([0, 10], 10) == pytest.approx(1.0)
+
+def test_run_and_compare():
+    results = run(['numbers'], 2048, warmup=0, repeat=2)
+    corpus = results['corpora']['numbers']
+    assert set(corpus['phases']) == {'lex', 'parse', 'evaluate', 'serialize'}
+    assert set(corpus['stdlib']) == {'loads', 'dumps'}
+    assert corpus['phases']['lex']['p10'] <= corpus['phases']['lex']['median'] <= corpus['phases']['lex']['p90']
+
+    assert compare(results, results, 0.1) == []
+    faster = json.loads(json.dumps(results))
+    faster['corpora']['numbers']['phases']['parse']['mb_per_s'] *= 2
+    regressions = compare(results, faster, 0.1)
+    assert len(regressions) == 1 and regressions[0].startswith('numbers/parse')
+    assert compare(results, faster, 0.6) == []
+    assert compare(results, {'corpora': {}}, 0.1) == []
@@ -0,0 +1,43 @@
+import json
+import pytest
+from src.lexer import lex
+from src.parser import Parser
+from src.ast import parse_json, ObjectNode, StringNode
+from src.binary import dump_binary, load_binary, load_binary_file
+
+def test_roundtrip_all_types():
+    data = {"a": [1, -2, 3.5, -0.25, 10 ** 20, True, False, None, "x", {}, []], "b": "x", "ü": "♥"}
+    ast = parse_json(json.dumps(data))
+    assert load_binary(dump_binary(ast)).evaluate() == data
+
+def test_roundtrip_parser_output():
+    with open('128KB.json', encoding='utf-8') as f:
+        text = f.read()
+    ast = Parser(lex(text)).parse()
+    loaded = load_binary(dump_binary(ast))
+    assert loaded.evaluate() == ast.evaluate()
+    assert loaded.elements[3].pairs['name'].evaluate() == ast.elements[3].pairs['name'].evaluate()
+
+def test_strings_are_deduplicated():
+    ast = parse_json(json.dumps([{"language": "Sindhi"} for _ in range(100)]))
+    snapshot = dump_binary(ast)
+    assert snapshot.count(b'Sindhi') == 1
+    assert snapshot.count(b'language') == 1
+
+def test_lazy_nodes_support_mutation():
+    loaded = load_binary(dump_binary(parse_json('{"a": {"b": 1}, "c": [1, 2]}')))
+    assert isinstance(loaded, ObjectNode)
+    loaded.pairs['a'].pairs['b'] = StringNode("changed")
+    loaded.pairs['c'].elements.append(StringNode("x"))
+    assert loaded.evaluate() == {"a": {"b": "changed"}, "c": [1, 2, "x"]}
+
+def test_load_from_memoryview_and_file(tmp_path):
+    snapshot = dump_binary(parse_json('[1, "two", {"three": 3}]'))
+    assert load_binary(memoryview(bytearray(snapshot))).evaluate() == [1, "two", {"three": 3}]
+    path = tmp_path / 'doc.jpb'
+    path.write_bytes(snapshot)
+    assert load_binary_file(str(path)).evaluate() == [1, "two", {"three": 3}]
+
+def test_rejects_foreign_data():
+    with pytest.raises(ValueError):
+        load_binary(b'{"not": "a snapshot"}')
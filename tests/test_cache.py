@@ -0,0 +1,42 @@
+from src.ast import StringNode
+from src.cache import ParseCache
+
+def test_hits_and_misses():
+    cache = ParseCache()
+    first = cache.parse('{"a": [1, 2]}')
+    second = cache.parse(b'{"a": [1, 2]}')
+    assert first.evaluate() == second.evaluate() == {"a": [1, 2]}
+    assert (cache.stats.hits, cache.stats.misses) == (1, 1)
+
+def test_results_are_isolated_from_mutation():
+    cache = ParseCache()
+    cache.parse('{"a": "b"}').pairs['a'] = StringNode("mutated")
+    assert cache.parse('{"a": "b"}').evaluate() == {"a": "b"}
+
+def test_lru_eviction_by_count_and_bytes():
+    cache = ParseCache(max_entries=2)
+    for doc in ('[1]', '[2]', '[1]', '[3]'):
+        cache.parse(doc)
+    assert len(cache) == 2
+    assert cache.stats.evictions == 1
+    assert ParseCache.key('[1]') in cache
+    assert ParseCache.key('[2]') not in cache
+
+    small = ParseCache(max_bytes=100)
+    small.parse('["%s"]' % ('x' * 60))
+    small.parse('["%s"]' % ('y' * 60))
+    assert len(small) == 1 and small.bytes_used <= 100
+
+def test_disk_tier_survives_new_instance(tmp_path):
+    ParseCache(directory=str(tmp_path)).parse('{"persisted": true}')
+    cache = ParseCache(directory=str(tmp_path))
+    assert cache.parse('{"persisted": true}').evaluate() == {"persisted": True}
+    assert (cache.stats.disk_hits, cache.stats.misses) == (1, 0)
+
+def test_corrupt_disk_entry_is_reparsed(tmp_path):
+    ParseCache(directory=str(tmp_path)).parse('[1, 2, 3]')
+    for path in tmp_path.glob('*.jpb'):
+        path.write_bytes(b'JPB')
+    cache = ParseCache(directory=str(tmp_path))
+    assert cache.parse('[1, 2, 3]').evaluate() == [1, 2, 3]
+    assert cache.stats.misses == 1
@@ -0,0 +1,60 @@
+import json
+from array import array
+import pytest
+from src.lexer import LexerError
+from src.columns import parse_columns
+
+def test_128kb_records():
+    with open('128KB.json', encoding='utf-8') as f:
+        text = f.read()
+    records = json.loads(text)
+    columns = parse_columns(text)
+    assert list(columns) == ['name', 'language', 'id', 'bio', 'version']
+    assert columns['version'].kind == 'float'
+    assert isinstance(columns['version'].data, array)
+    assert columns['name'].to_list() == [record['name'] for record in records]
+    assert columns['version'].to_list() == [record['version'] for record in records]
+
+def test_nulls_missing_fields_and_promotion():
+    records = [
+        {"id": 1, "score": 2, "flag": True, "tag": None},
+        {"id": 2, "score": 2.5, "extra": "late"},
+        {"id": 3, "score": None, "flag": False, "tag": "x"},
+        {"id": 2 ** 70, "flag": 1, "tag": [1, {"a": 2}]},
+    ]
+    columns = parse_columns(json.dumps(records))
+    assert columns['score'].kind == 'float'
+    assert columns['score'].to_list() == [2.0, 2.5, None, None]
+    assert columns['id'].kind == 'object'
+    assert columns['id'].to_list() == [1, 2, 3, 2 ** 70]
+    assert columns['flag'].kind == 'object'
+    assert columns['flag'].to_list() == [True, None, False, 1]
+    assert columns['extra'].to_list() == [None, "late", None, None]
+    assert columns['tag'].to_list() == [None, None, "x", [1, {"a": 2}]]
+    nested = columns['tag'][3]
+    assert type(nested[0]) is int and type(nested[1]['a']) is int
+    assert bytes(columns['extra'].mask) == b'\x00\x01\x00\x00'
+
+def test_integers_too_large_for_a_float_column():
+    text = '[{"a": 1.5}, {"a": 1%s}]' % ('0' * 400)
+    columns = parse_columns(text)
+    assert columns['a'].kind == 'object'
+    assert columns['a'].to_list() == [record['a'] for record in json.loads(text)]
+
+def test_duplicate_keys_last_value_wins():
+    columns = parse_columns('[{"a": 1, "a": 2}, {"a": 3}]')
+    assert columns['a'].to_list() == [2, 3]
+
+def test_empty_array():
+    assert parse_columns('[]') == {}
+
+@pytest.mark.parametrize("text", ['{"a": 1}', '[1, 2]', '[{"a": 1},]', '[{"a": 1}] []', '[{"a" 1}]', '[{"a": 1}'])
+def test_rejects_non_record_arrays(text):
+    with pytest.raises((LexerError, ValueError)):
+        parse_columns(text)
+
+def test_to_numpy():
+    numpy = pytest.importorskip("numpy")
+    columns = parse_columns('[{"n": 1, "x": 1.5}, {"n": 2}]')
+    assert columns['n'].to_numpy().dtype == numpy.int64
+    assert columns['x'].to_numpy().mask.tolist() == [False, True]
@@ -0,0 +1,123 @@
+import bz2
+import gzip
+import io
+import lzma
+import subprocess
+import sys
+import pytest
+from src.compression import DecompressingReader, detect_compression, open_input, parse_file
+
+TEXT = '[' + ', '.join('{"id": %d, "name": "café %d"}' % (i, i) for i in range(2000)) + ']'
+COMPRESSORS = {'gzip': gzip.compress, 'bz2': bz2.compress, 'xz': lzma.compress}
+
+@pytest.mark.parametrize('name', list(COMPRESSORS))
+def test_detects_and_streams_each_format(name):
+    data = COMPRESSORS[name](TEXT.encode('utf-8'))
+    assert detect_compression(data[:6]) == name
+    with open_input(io.BytesIO(data), chunk_size=7) as reader:
+        assert isinstance(reader, DecompressingReader) and reader.compression == name
+        chunks = []
+        while True:
+            chunk = reader.read(100)
+            if not chunk:
+                break
+            assert len(chunk) <= 100
+            chunks.append(chunk)
+    assert ''.join(chunks) == TEXT
+    assert parse_file(io.BytesIO(data), chunk_size=50).evaluate()[1999]['name'] == 'café 1999'
+
+def test_plain_input_passes_through(tmp_path):
+    assert detect_compression(b'[1, 2]') is None
+    path = tmp_path / 'plain.json'
+    path.write_text(TEXT, encoding='utf-8')
+    with open_input(str(path)) as reader:
+        assert not isinstance(reader, DecompressingReader)
+        assert reader.read() == TEXT
+
+def test_readline_and_iteration():
+    lines = ''.join('{"n": %d}\n' % i for i in range(500))
+    with open_input(io.BytesIO(bz2.compress(lines.encode())), chunk_size=64) as reader:
+        assert reader.readline() == '{"n": 0}\n'
+        assert list(reader) == lines.splitlines(keepends=True)[1:]
+
+def test_errors_reach_the_reader():
+    truncated = gzip.compress(TEXT.encode())[:-20]
+    with pytest.raises(EOFError):
+        open_input(io.BytesIO(truncated)).read()
+    with pytest.raises(UnicodeDecodeError):
+        open_input(io.BytesIO(gzip.compress(b'["\xff"]'))).read()
+
+def test_close_stops_the_producer_early():
+    data = gzip.compress(TEXT.encode() * 20)
+    reader = open_input(io.BytesIO(data), chunk_size=16, queue_size=1)
+    assert reader.read(10) == TEXT[:10]
+    reader.close()
+    assert not reader._thread.is_alive()
+
+def _cli(*args, stdin=None):
+    return subprocess.run([sys.executable, '-c', 'from src import main; main()'] + list(args),
+                          input=stdin, capture_output=True, check=True).stdout
+
+@pytest.mark.parametrize('mode', [[], ['--minify'], ['--validate']])
+def test_cli_reads_compressed_files_and_stdin(tmp_path, mode):
+    path = tmp_path / 'data.json.xz'
+    path.write_bytes(lzma.compress(TEXT.encode()))
+    plain = tmp_path / 'data.json'
+    plain.write_text(TEXT, encoding='utf-8')
+    expected = _cli(*mode, str(plain))
+    assert _cli(*mode, str(path)) == expected
+    assert _cli(*mode, stdin=gzip.compress(TEXT.encode())) == expected
+
+@pytest.mark.parametrize('text', ['[1]\u00a0', '\x0c[1]', '[1,\u2028 2]', '[1\u0661]', '[1, 2]\r\n'])
+def test_compression_does_not_change_what_parses(text):
+    from src.batch import convert
+    from src.lexer import LexerError
+
+    def outcome(data):
+        out = io.StringIO()
+        try:
+            with open_input(io.BytesIO(data)) as source:
+                convert(source, out.write)
+        except (LexerError, ValueError):
+            return None
+        return out.getvalue()
+
+    data = text.encode('utf-8')
+    assert outcome(gzip.compress(data)) == outcome(data)
+
+def test_short_reads_are_sniffed_correctly():
+    class Trickle(io.RawIOBase):
+        # Hands out one byte per read, like a slow pipe
+        def __init__(self, data):
+            self._data = data
+        def readable(self):
+            return True
+        def readinto(self, buffer):
+            if not self._data:
+                return 0
+            buffer[0:1], self._data = self._data[:1], self._data[1:]
+            return 1
+    for name, compress in COMPRESSORS.items():
+        with open_input(Trickle(compress(TEXT.encode()))) as reader:
+            assert isinstance(reader, DecompressingReader) and reader.compression == name
+            assert reader.read() == TEXT
+    with open_input(Trickle(b'[1]')) as reader:
+        assert reader.read() == '[1]'
+
+def test_close_early_on_a_stalled_pipe():
+    import os
+    import time
+    read_fd, write_fd = os.pipe()
+    text = '[' + ', '.join('"%s"' % os.urandom(32).hex() for _ in range(8000)) + ']'
+    data = gzip.compress(text.encode())
+    # Fits in the pipe buffer; the producer then blocks waiting for the rest
+    os.write(write_fd, data[:60000])
+    reader = open_input(os.fdopen(read_fd, 'rb'))
+    assert reader.read(10) == text[:10]
+    started = time.monotonic()
+    reader.close()
+    assert time.monotonic() - started < 5
+    # Once the stalled read returns, the producer finishes and closes the pipe itself
+    os.close(write_fd)
+    reader._thread.join(5)
+    assert not reader._thread.is_alive() and reader._raw.closed
@@ -0,0 +1,97 @@
+import io
+import json
+import pytest
+from src.lexer import lex
+from src.parser import Parser
+from src.binary import dump_binary, load_binary
+from src.encoder import Encoder, dump, dumps, encode_string, iterencode
+
+VALUE = {
+    "name": "café \U0001f600 \"quoted\" \\ tab\t bell\x07 del\x7f",
+    "numbers": [0, -1, 2.5, 1e300, -0.0, 12345678901234567890],
+    "flags": [True, False, None],
+    "nested": {"empty_object": {}, "empty_array": [], "deep": [[[{"z": 1, "a": 2}]]]},
+    "tuple": (1, "two"),
+}
+OPTIONS = [
+    {},
+    {'indent': 2},
+    {'indent': 0},
+    {'ensure_ascii': False},
+    {'sort_keys': True, 'indent': 4},
+    {'separators': (',', ':')},
+]
+
+def _ast(text, **options):
+    return Parser(lex(text), **options).parse()
+
+@pytest.mark.parametrize('options', OPTIONS)
+def test_matches_json_dumps(options):
+    assert dumps(VALUE, **options) == json.dumps(VALUE, **options)
+    for scalar in ['', 'x', 0, 1.5, True, None, '\U0010ffff ']:
+        assert dumps(scalar, **options) == json.dumps(scalar, **options)
+
+@pytest.mark.parametrize('options', OPTIONS)
+def test_encodes_ast_nodes_directly(options):
+    text = json.dumps(VALUE, ensure_ascii=False)
+    expected = json.dumps(_ast(text).evaluate(), **options)
+    assert dumps(_ast(text), **options) == expected
+    assert dumps(_ast(text, shapes=True), **options) == expected
+    assert dumps(load_binary(dump_binary(_ast(text))), **options) == expected
+
+def test_records_and_lazy_nodes_after_mutation():
+    records = _ast('[{"a": 1, "b": "x"}, {"a": 2, "b": "y"}]', shapes=True)
+    records.elements[1].pairs['b'].value = 'changed'
+    assert dumps(records) == '[{"a": 1.0, "b": "x"}, {"a": 2.0, "b": "changed"}]'
+    snapshot = load_binary(dump_binary(_ast('{"list": [1, 2], "keep": true}')))
+    snapshot.pairs['list'].elements.pop()
+    assert dumps(snapshot) == '{"list": [1.0], "keep": true}'
+
+def test_key_types_and_cache():
+    keys = {1: 'int', 2.5: 'float', True: 'bool', None: 'null', 'str': 'str'}
+    assert dumps(keys) == json.dumps(keys)
+    encoder = Encoder()
+    assert encoder.encode({1: 'a'}) == '{"1": "a"}'
+    assert encoder.encode({1.0: 'a', 'k': 'b'}) == '{"1.0": "a", "k": "b"}'
+    assert encoder.encode({True: 'a'}) == '{"true": "a"}'
+    assert list(encoder._keys) == ['k']
+    with pytest.raises(TypeError):
+        dumps({(1, 2): 'tuple key'})
+
+def test_string_escaping():
+    for value in ['plain', 'a"b\\c', '\x00\x1f\x7f', 'é中', '\U0001d11e', '\ud800']:
+        assert encode_string(value) == json.dumps(value)
+        assert encode_string(value, ensure_ascii=False) == json.dumps(value, ensure_ascii=False)
+
+def test_iterencode_chunks_and_dump():
+    big = {'rows': [list(range(50)) for _ in range(50)]}
+    chunks = list(iterencode(big, chunk_size=64))
+    assert len(chunks) > 10
+    assert ''.join(chunks) == json.dumps(big)
+    out = io.StringIO()
+    dump(big, out, chunk_size=16, indent=1)
+    assert out.getvalue() == json.dumps(big, indent=1)
+
+def test_deep_nesting_does_not_recurse():
+    deep = []
+    for _ in range(50000):
+        deep = [deep]
+    assert dumps(deep) == '[' * 50000 + '[]' + ']' * 50000
+
+def test_special_floats():
+    assert dumps([float('nan'), float('inf'), -float('inf')]) == '[NaN, Infinity, -Infinity]'
+    with pytest.raises(ValueError):
+        dumps([1.0, float('inf')], allow_nan=False)
+
+def test_circular_references_and_default():
+    loop = []
+    loop.append(loop)
+    with pytest.raises(ValueError, match='Circular'):
+        dumps(loop)
+    with pytest.raises(TypeError):
+        dumps({1, 2})
+    assert dumps({'set': {2, 1}}, default=sorted) == '{"set": [1, 2]}'
+    with pytest.raises(ValueError, match='Circular'):
+        dumps(object(), default=lambda value: value)
+    shared = [1]
+    assert dumps([shared, shared]) == '[[1], [1]]'
@@ -0,0 +1,106 @@
+import pytest
+from src.lexer import lex
+from src.parser import Parser
+from src.ast import ArrayNode, StringNode, NumberNode
+
+SOURCE = '{"db": {"hosts": ["a", "b"], "port": 5432}, "debug": false, "tags": [[1], [2]]}'
+
+def parse(text):
+    return Parser(lex(text)).parse()
+
+def test_cached_result_matches_evaluate_and_is_reused():
+    ast = parse(SOURCE)
+    first = ast.evaluate_cached()
+    assert first == ast.evaluate()
+    assert ast.evaluate_cached() is first
+    assert ast.pairs['db'].evaluate_cached() is first['db']
+
+def test_mutation_invalidates_only_the_touched_path():
+    ast = parse(SOURCE)
+    before = ast.evaluate_cached()
+    tags = before['tags']
+    ast.pairs['db'].pairs['hosts'].elements.append(StringNode("c"))
+    after = ast.evaluate_cached()
+    assert after is not before
+    assert after['db']['hosts'] == ["a", "b", "c"]
+    assert after['tags'] is tags
+
+@pytest.mark.parametrize("mutate", [
+    lambda node: node.pairs.__setitem__('port', NumberNode(1)),
+    lambda node: node.pairs.pop('port'),
+    lambda node: node.pairs.update({'user': StringNode("root")}),
+    lambda node: node.pairs['hosts'].elements.__setitem__(0, StringNode("z")),
+    lambda node: node.pairs['hosts'].elements.reverse(),
+    lambda node: node.pairs['hosts'].elements.__delitem__(slice(0, 1)),
+])
+def test_every_container_mutation_is_tracked(mutate):
+    ast = parse(SOURCE)
+    ast.evaluate_cached()
+    mutate(ast.pairs['db'])
+    assert ast.evaluate_cached() == ast.evaluate()
+
+def test_scalar_reassignment_needs_explicit_invalidate():
+    ast = parse(SOURCE)
+    ast.evaluate_cached()
+    port = ast.pairs['db'].pairs['port']
+    port.value = 6543
+    port.invalidate()
+    assert ast.evaluate_cached()['db']['port'] == 6543
+
+def test_deep_nesting_is_not_recursive():
+    depth = 5000
+    ast = ArrayNode([])
+    for _ in range(depth - 1):
+        ast = ArrayNode([ast])
+    value = ast.evaluate_cached()
+    for _ in range(depth - 1):
+        value = value[0]
+    assert value == []
+
+def test_views_are_live_and_read_only():
+    ast = parse(SOURCE)
+    view = ast.view()
+    assert view['db']['hosts'][1] == "b"
+    assert view['tags'] == [[1], [2]]
+    assert dict(view['db'])['port'] == 5432
+    with pytest.raises(TypeError):
+        view['debug'] = True
+    ast.pairs['debug'] = StringNode("on")
+    assert view['debug'] == "on"
+
+def test_cached_tree_round_trips_through_pickle():
+    import pickle
+    ast = parse(SOURCE)
+    ast.evaluate_cached()
+    copy = pickle.loads(pickle.dumps(ast))
+    assert type(copy.pairs) is dict and type(copy.pairs['tags'].elements) is list
+    assert copy.evaluate() == ast.evaluate()
+    before = copy.evaluate_cached()
+    copy.pairs['db'].pairs['hosts'].elements.append(StringNode("c"))
+    assert copy.evaluate_cached() is not before
+    assert copy.evaluate_cached()['db']['hosts'] == ["a", "b", "c"]
+
+def test_removed_elements_are_detached():
+    ast = parse(SOURCE)
+    before = ast.evaluate_cached()
+    tags = ast.pairs['tags'].elements
+    first, second = tags[0], tags[1]
+    assert tags.pop() is second and second._parent is None
+    del tags[0]
+    assert first._parent is None
+    after = ast.evaluate_cached()
+    assert after is not before and after['tags'] == []
+
+def test_removed_members_are_detached():
+    ast = parse(SOURCE)
+    before = ast.evaluate_cached()
+    db = ast.pairs['db']
+    hosts, port = db.pairs['hosts'], db.pairs['port']
+    assert db.pairs.pop('missing', None) is None
+    assert ast.evaluate_cached() is before
+    assert db.pairs.pop('port') is port and port._parent is None
+    del db.pairs['hosts']
+    assert hosts._parent is None
+    assert ast.pairs['debug']._parent is not None
+    after = ast.evaluate_cached()
+    assert after is not before and after['db'] == {}
@@ -0,0 +1,116 @@
+import os
+import signal
+import subprocess
+import sys
+import time
+from src.follow import Checkpoint, follow
+
+def _values(results):
+    return [result.value.evaluate() if result.ok else result.error for result in results]
+
+def _follow(path, checkpoint=None):
+    return follow(str(path), checkpoint, poll_interval=0.01, idle_timeout=0.2)
+
+def test_reads_complete_lines_and_holds_back_a_partial_one(tmp_path):
+    path = tmp_path / 'log.ndjson'
+    path.write_bytes(b'{"n": 1}\n\n[2, 3]\n{"n": ')
+    checkpoint = Checkpoint()
+    assert _values(_follow(path, checkpoint)) == [{'n': 1}, [2, 3]]
+    assert checkpoint.offset == len(b'{"n": 1}\n\n[2, 3]\n')
+    with open(path, 'ab') as f:
+        f.write('4}\n{"bad"\n"é"\n'.encode())
+    results = list(_follow(path, checkpoint))
+    assert results[0].value.evaluate() == {'n': 4}
+    assert not results[1].ok and results[1].error
+    assert results[2].value.evaluate() == 'é'
+
+def test_picks_up_appends_while_following(tmp_path):
+    path = tmp_path / 'log.ndjson'
+    path.write_bytes(b'1\n')
+    records = _follow(path)
+    assert next(records).value.evaluate() == 1
+    with open(path, 'ab') as f:
+        f.write(b'2\n')
+    assert next(records).value.evaluate() == 2
+    assert list(records) == []
+
+def test_resumes_from_a_saved_checkpoint(tmp_path):
+    path = tmp_path / 'log.ndjson'
+    state = str(tmp_path / 'state.json')
+    path.write_bytes(b'1\n2\n')
+    assert _values(_follow(path, Checkpoint(state))) == [1, 2]
+    with open(path, 'ab') as f:
+        f.write(b'3\n')
+    resumed = Checkpoint(state)
+    assert resumed.offset == 4 and resumed.matches(os.stat(path))
+    assert _values(_follow(path, resumed)) == [3]
+    assert _values(_follow(path, Checkpoint(state))) == []
+
+def test_unconsumed_records_are_delivered_again(tmp_path):
+    path = tmp_path / 'log.ndjson'
+    state = str(tmp_path / 'state.json')
+    path.write_bytes(b'1\n2\n')
+    records = _follow(path, Checkpoint(state))
+    next(records)
+    records.close()
+    assert _values(_follow(path, Checkpoint(state))) == [1, 2]
+
+def test_restarts_after_truncation(tmp_path):
+    path = tmp_path / 'log.ndjson'
+    state = str(tmp_path / 'state.json')
+    path.write_bytes(b'"old record"\n')
+    assert _values(_follow(path, Checkpoint(state))) == ['old record']
+    path.write_bytes(b'1\n')
+    assert _values(_follow(path, Checkpoint(state))) == [1]
+    with open(path, 'ab') as f:
+        f.write(b'20\n30\n')
+    records = _follow(path, Checkpoint(state))
+    assert next(records).value.evaluate() == 20
+    with open(path, 'wb') as f:
+        f.write(b'4\n')
+    assert _values(records) == [30, 4]
+
+def test_follows_rotation(tmp_path):
+    path = tmp_path / 'log.ndjson'
+    path.write_bytes(b'1\n')
+    records = _follow(path)
+    assert next(records).value.evaluate() == 1
+    with open(path, 'ab') as f:
+        f.write(b'2\n3')
+    os.rename(path, tmp_path / 'log.ndjson.1')
+    path.write_bytes(b'4\n')
+    assert _values(records) == [2, 3, 4]
+
+def test_waits_for_a_missing_file(tmp_path):
+    path = tmp_path / 'later.ndjson'
+    records = follow(str(path), poll_interval=0.01, idle_timeout=1.0)
+    path.write_bytes(b'{"ready": true}\n')
+    assert next(records).value.evaluate() == {'ready': True}
+
+def test_corrupt_checkpoint_starts_from_the_beginning(tmp_path):
+    state = tmp_path / 'state.json'
+    state.write_text('{"offset": ')
+    checkpoint = Checkpoint(str(state))
+    assert (checkpoint.device, checkpoint.inode, checkpoint.offset) == (0, 0, 0)
+
+def test_cli_follow(tmp_path):
+    path = tmp_path / 'log.ndjson'
+    state = tmp_path / 'state.json'
+    path.write_bytes(b'{"a": [1, 2]}\nnope\n')
+    process = subprocess.Popen([sys.executable, '-c', 'from src import main; main()', '--follow', str(path),
+                                '--checkpoint', str(state), '--poll-interval', '0.01'],
+                               stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
+    try:
+        assert process.stdout.readline() == '{"a": [1.0, 2.0]}\n'
+        with open(path, 'ab') as f:
+            f.write(b'"next"\n')
+        assert process.stdout.readline() == '"next"\n'
+        deadline = time.monotonic() + 5
+        while Checkpoint(str(state)).offset != os.path.getsize(path) and time.monotonic() < deadline:
+            time.sleep(0.01)
+    finally:
+        process.send_signal(signal.SIGINT)
+        _, stderr = process.communicate(timeout=10)
+    assert process.returncode == 0
+    assert stderr.startswith('Error: ')
+    assert Checkpoint(str(state)).offset == os.path.getsize(path)
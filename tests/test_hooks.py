@@ -0,0 +1,52 @@
+import json
+from collections import OrderedDict
+from decimal import Decimal
+import pytest
+from src.lexer import lex
+from src.parser import Parser, loads
+
+TEXT = '{"a": [1, 2.5, -3e2, {"b": null}], "c": {"d": true, "e": "x"}, "a": 0}'
+
+def test_matches_json_loads_without_hooks():
+    assert loads(TEXT) == json.loads(TEXT)
+    assert type(loads('[1, 1.0]')[0]) is int and type(loads('[1, 1.0]')[1]) is float
+    for text in ['[]', '{}', '"s"', '0', 'null', '[[[]], {"k": {}}]']:
+        assert loads(text) == json.loads(text)
+
+def test_hooks_match_json_loads():
+    seen = []
+
+    def object_hook(value):
+        seen.append(sorted(value))
+        return ('obj', sorted(value.items(), key=repr))
+
+    for hooks in [
+        {'object_hook': object_hook},
+        {'object_pairs_hook': list},
+        {'object_pairs_hook': OrderedDict, 'object_hook': object_hook},
+        {'parse_float': Decimal, 'parse_int': str},
+    ]:
+        assert loads(TEXT, **hooks) == json.loads(TEXT, **hooks)
+    # Inner objects are passed to the hook before the objects that contain them
+    assert seen[:3] == [['b'], ['d', 'e'], ['a', 'c']]
+
+def test_object_pairs_hook_sees_duplicates_in_order():
+    assert loads('{"k": 1, "k": 2}', object_pairs_hook=list) == [('k', 1), ('k', 2)]
+
+def test_parse_float_keeps_source_text():
+    assert loads('[0.1, 1E400]', parse_float=Decimal) == [Decimal('0.1'), Decimal('1E400')]
+
+def test_decode_on_parser():
+    parser = Parser(lex('{"n": 10}'), parse_int=lambda text: int(text) * 2)
+    assert parser.decode() == {'n': 20}
+    assert Parser(lex('[1]')).parse().evaluate() == [1.0]
+
+def test_decode_errors():
+    with pytest.raises(ValueError, match='Unexpected tokens'):
+        loads('[1] 2')
+    with pytest.raises(ValueError, match='Expected string key'):
+        loads('{1: 2}')
+    with pytest.raises(ValueError):
+        loads('[1, 2')
+    with pytest.raises(ValueError, match='Unexpected token'):
+        loads(']')
@@ -0,0 +1,94 @@
+import json
+import pytest
+from src.lexer import lex, LexerError
+from src.parser import Parser
+from src.incremental import reparse, diff
+
+def parse(text):
+    return Parser(lex(text)).parse()
+
+def check_spans(node, source):
+    # Every node's span must re-parse to the same value on its own
+    fragment = '[' + source[node.start:node.end] + ']'
+    assert parse(fragment).evaluate() == [node.evaluate()]
+    for child in getattr(node, 'pairs', {}).values():
+        check_spans(child, source)
+    for child in getattr(node, 'elements', []):
+        check_spans(child, source)
+
+def test_parser_records_spans():
+    source = ' {"a": [1, "two"], "b": null} '
+    ast = parse(source)
+    assert (ast.start, ast.end) == (1, 29)
+    assert source[ast.pairs['a'].start:ast.pairs['a'].end] == '[1, "two"]'
+    check_spans(ast, source)
+
+def test_reparse_splices_smallest_container():
+    source = '{"config": {"retries": 3, "hosts": ["a", "b"]}, "name": "svc"}'
+    ast = parse(source)
+    name_node = ast.pairs['name']
+    config = ast.pairs['config']
+    offset = source.index('"b"')
+    new_source, new_ast = reparse(source, ast, offset, 3, '"b", "c"')
+
+    assert new_ast is ast
+    assert new_ast.pairs['config'] is config
+    assert new_ast.pairs['name'] is name_node
+    assert new_ast.evaluate() == json.loads(new_source)
+    check_spans(new_ast, new_source)
+
+def test_reparse_matches_full_parse():
+    source = json.dumps({"items": [{"id": i, "tags": ["x"] * (i % 3)} for i in range(20)]})
+    ast = parse(source)
+    edits = [('"x"', 0, '"y", '), ('"id": 7,', 7, '"id": 700'), ('"items"', 0, ' ')]
+    for anchor, deleted, inserted in edits:
+        source, ast = reparse(source, ast, source.index(anchor), deleted, inserted)
+        assert ast.evaluate() == json.loads(source)
+        check_spans(ast, source)
+
+def test_reparse_outside_root_reparses_everything():
+    source = '[1, 2]'
+    ast = parse(source)
+    new_source, new_ast = reparse(source, ast, 0, 6, '{"k": [1, 2]}')
+    assert new_ast is not ast
+    assert new_ast.evaluate() == {"k": [1, 2]}
+    check_spans(new_ast, new_source)
+
+@pytest.mark.parametrize('source, anchor, deleted, inserted', [
+    ('[[1, 2]]', ',', 1, '], ['),
+    ('{"a": [[1], [2]], "b": 3}', '], [', 4, ', '),
+    ('{"a": {"b": [1, 2]}, "c": 4}', ', 2]}', 5, ']}, "d": {"e": [2]}'),
+    ('[[[1, 2]]]', ', 2', 3, '], [], [2'),
+])
+def test_reparse_splitting_or_merging_containers(source, anchor, deleted, inserted):
+    ast = parse(source)
+    new_source, new_ast = reparse(source, ast, source.index(anchor), deleted, inserted)
+    assert new_ast.evaluate() == json.loads(new_source)
+    check_spans(new_ast, new_source)
+
+def test_reparse_error_leaves_tree_untouched():
+    source = '{"a": [1, 2], "b": 3}'
+    ast = parse(source)
+    with pytest.raises((LexerError, ValueError)):
+        reparse(source, ast, source.index('2'), 1, '2,')
+    assert ast.evaluate() == {"a": [1, 2], "b": 3}
+    check_spans(ast, source)
+
+def test_diff_reports_paths():
+    old = parse('{"a": 1, "b": [1, 2, 3], "c": {"d": true}, "e": "x"}')
+    new = parse('{"a": 1, "b": [1, 5], "c": {"d": true, "f": null}, "g": "x"}')
+    assert diff(old, new) == [
+        (('b', 1), 'changed'),
+        (('b', 2), 'removed'),
+        (('c', 'f'), 'added'),
+        (('e',), 'removed'),
+        (('g',), 'added'),
+    ]
+    assert diff(old, old) == []
+
+def test_diff_after_reparse_only_sees_spliced_subtree():
+    source = '{"keep": {"x": [1, 2, 3]}, "edit": [true, false]}'
+    old = parse(source)
+    new = parse(source)
+    new_source, new = reparse(source, new, source.index('false'), 5, 'null')
+    assert diff(old, new) == [(('edit', 1), 'changed')]
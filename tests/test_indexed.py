@@ -0,0 +1,73 @@
+import json
+import os
+import pytest
+from src.indexed import IndexedDocument
+
+def write(tmp_path, text, name='doc.json'):
+    path = tmp_path / name
+    path.write_text(text, encoding='utf-8')
+    return str(path)
+
+def test_array_elements(tmp_path):
+    data = [{"a": [1, "]"]}, "x,y", 3, None, [[], {}], "♥"]
+    doc = IndexedDocument(write(tmp_path, json.dumps(data, indent=2)))
+    assert doc.kind == 'array'
+    assert len(doc) == len(data)
+    assert [node.evaluate() for node in doc] == data
+    assert doc[-1].evaluate() == "♥"
+    with pytest.raises(IndexError):
+        doc[len(data)]
+
+def test_object_members(tmp_path):
+    text = '{"first": {"nested": {"k": 1}}, "second": [1, 2], "q\\"k": true, "first": "again"}'
+    doc = IndexedDocument(write(tmp_path, text))
+    assert doc.kind == 'object'
+    assert doc.keys() == ['first', 'second', 'q"k']
+    assert doc['second'].evaluate() == [1, 2]
+    assert doc['q"k'].evaluate() is True
+    assert doc['first'].evaluate() == "again"
+    with pytest.raises(KeyError):
+        doc['missing']
+    with pytest.raises(TypeError):
+        doc[0]
+
+def test_128kb_matches_full_parse():
+    with open('128KB.json', encoding='utf-8') as f:
+        records = json.load(f)
+    with IndexedDocument('128KB.json', persist=False) as doc:
+        assert len(doc) == len(records)
+        assert doc[17].evaluate() == records[17]
+
+def test_index_is_persisted_and_validated(tmp_path):
+    path = write(tmp_path, '[1, 2, 3]')
+    IndexedDocument(path)
+    assert os.path.exists(path + '.idx')
+
+    reloaded = IndexedDocument(path)
+    assert reloaded._load_index()
+    assert reloaded[2].evaluate() == 3
+
+    with open(path, 'w') as f:
+        f.write('[10, 20, 30, 40]')
+    os.utime(path, ns=(0, 0))
+    assert len(IndexedDocument(path)) == 4
+
+@pytest.mark.parametrize("text", ['', '42', '[1, 2', '[1,, 2]', '[1,]', '[1] [2]', '{"a": 1,}',
+                                  '[1] 2', '2 [1]', '{"a": 1} "x"', '[1]\n\x0c', '{"a": 1 "b": 2}',
+                                  '{"a" "b": 1}', '{"a", "b": 1}', '{"a"}', '{: 1}', '[1: 2]', '{"a" [1]}'])
+def test_malformed_documents(tmp_path, text):
+    with pytest.raises(ValueError):
+        IndexedDocument(write(tmp_path, text), persist=False)
+
+def test_empty_containers(tmp_path):
+    assert len(IndexedDocument(write(tmp_path, ' [ ] '), persist=False)) == 0
+    assert IndexedDocument(write(tmp_path, '{}', 'obj.json'), persist=False).keys() == []
+
+def test_wide_object_indexes_in_linear_time(tmp_path):
+    # Quadratic key lookups would make this take minutes
+    count = 50000
+    members = ', '.join(f'"k{i}": {i}' for i in range(count))
+    doc = IndexedDocument(write(tmp_path, '{' + members + ', "k7": "last"}'), persist=False)
+    assert len(doc) == count
+    assert doc['k49999'].evaluate() == 49999
+    assert doc['k7'].evaluate() == "last"
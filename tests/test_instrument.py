@@ -0,0 +1,39 @@
+from src.lexer import lex
+from src.parser import Parser
+from src.instrument import Counters, Hooks, InstrumentedParser, evaluate, make_parser, parse
+
+TEXT = '{"a\\n": [1, 2.5, "\\u00e9\\t"], "b": {"c": null}, "d": [true]}'
+
+def test_counters():
+    hooks = Counters()
+    node = parse(TEXT, hooks)
+    assert evaluate(node, hooks) == {"a\n": [1, 2.5, "é\t"], "b": {"c": None}, "d": [True]}
+    counts = hooks.counts
+    assert counts['tokens.STRING'] == 5 and counts['tokens.NUMBER'] == 2 and counts['tokens.EOF'] == 1
+    assert counts['lexer.escapes'] == 3
+    assert counts['parser.objects'] == 2 and counts['parser.arrays'] == 2
+    assert counts['parser.numbers'] == 2 and counts['parser.values'] == 9
+    assert counts['evaluate.nodes'] == 9
+    assert set(hooks.seconds) == {'lex', 'parse', 'evaluate'}
+
+def test_timing_spans_per_container():
+    hooks = Counters(timing=True)
+    parse(TEXT, hooks, shapes=True)
+    assert hooks.calls['parser.object'] == 2 and hooks.calls['parser.array'] == 2
+    assert hooks.as_dict()['seconds']['parser.object'] >= 0
+
+def test_no_hooks_selects_plain_parser():
+    assert type(make_parser(lex('[]'))) is Parser
+    assert isinstance(make_parser(lex('[]'), Hooks()), InstrumentedParser)
+    assert parse('[1]').evaluate() == evaluate(parse('[1]')) == [1]
+
+def test_custom_hooks_receive_callbacks():
+    events = []
+
+    class Recorder(Hooks):
+        def count(self, name, n=1):
+            events.append((name, n))
+
+    parse('[1, 2]', Recorder())
+    assert ('tokens.NUMBER', 2) in events
+    assert events.count(('parser.numbers', 1)) == 2
@@ -0,0 +1,120 @@
+import pytest
+from src.lexer import lex
+from src.parser import Parser
+from src.encoder import dumps
+from src.patch import PatchError, UndoLog, apply_merge_patch, apply_patch, parse_pointer
+
+def _parse(text):
+    return Parser(lex(text)).parse()
+
+@pytest.mark.parametrize('document, patch, expected', [
+    ({'foo': 'bar'}, [{'op': 'add', 'path': '/baz', 'value': 'qux'}], {'foo': 'bar', 'baz': 'qux'}),
+    ({'foo': ['bar', 'baz']}, [{'op': 'add', 'path': '/foo/1', 'value': 'qux'}], {'foo': ['bar', 'qux', 'baz']}),
+    ({'baz': 'qux', 'foo': 'bar'}, [{'op': 'remove', 'path': '/baz'}], {'foo': 'bar'}),
+    ({'foo': ['bar', 'qux', 'baz']}, [{'op': 'remove', 'path': '/foo/1'}], {'foo': ['bar', 'baz']}),
+    ({'baz': 'qux', 'foo': 'bar'}, [{'op': 'replace', 'path': '/baz', 'value': 'boo'}], {'baz': 'boo', 'foo': 'bar'}),
+    ({'foo': {'bar': 'baz', 'waldo': 'fred'}, 'qux': {'corge': 'grault'}},
+     [{'op': 'move', 'from': '/foo/waldo', 'path': '/qux/thud'}],
+     {'foo': {'bar': 'baz'}, 'qux': {'corge': 'grault', 'thud': 'fred'}}),
+    ({'foo': ['all', 'grass', 'cows', 'eat']}, [{'op': 'move', 'from': '/foo/1', 'path': '/foo/3'}],
+     {'foo': ['all', 'cows', 'eat', 'grass']}),
+    ({'foo': 'bar'}, [{'op': 'add', 'path': '/child', 'value': {'grandchild': {}}}],
+     {'foo': 'bar', 'child': {'grandchild': {}}}),
+    ({'foo': ['bar']}, [{'op': 'add', 'path': '/foo/-', 'value': ['abc', 'def']}], {'foo': ['bar', ['abc', 'def']]}),
+    ({'/': 1, 'm~n': 2}, [{'op': 'copy', 'from': '/~1', 'path': '/m~0n'}], {'/': 1, 'm~n': 1}),
+    ({'baz': 'qux', 'foo': ['a', 2, 'c']},
+     [{'op': 'test', 'path': '/baz', 'value': 'qux'}, {'op': 'test', 'path': '/foo/1', 'value': 2}],
+     {'baz': 'qux', 'foo': ['a', 2, 'c']}),
+    ({'a': 1}, [{'op': 'replace', 'path': '', 'value': [1]}], [1]),
+])
+def test_rfc6902_examples(document, patch, expected):
+    root = _parse(dumps(document))
+    assert apply_patch(root, patch).evaluate() == expected
+
+@pytest.mark.parametrize('patch', [
+    [{'op': 'add', 'path': '/baz/bat', 'value': 'qux'}],
+    [{'op': 'remove', 'path': '/missing'}],
+    [{'op': 'add', 'path': '/list/5', 'value': 1}],
+    [{'op': 'add', 'path': '/list/01', 'value': 1}],
+    [{'op': 'test', 'path': '/flag', 'value': 1}],
+    [{'op': 'move', 'from': '/list', 'path': '/list/0'}],
+    [{'op': 'frobnicate', 'path': '/list'}],
+    [{'op': 'add', 'path': 'list'}],
+])
+def test_invalid_operations_raise(patch):
+    root = _parse('{"list": [1], "flag": true}')
+    with pytest.raises(PatchError):
+        apply_patch(root, patch)
+
+def test_failed_patch_is_rolled_back():
+    text = '{"a": {"x": 1, "y": 2, "z": 3}, "b": [1, 2, 3], "c": "keep"}'
+    root = _parse(text)
+    before = root.evaluate_cached()
+    patch = [
+        {'op': 'remove', 'path': '/a/y'},
+        {'op': 'add', 'path': '/b/0', 'value': 0},
+        {'op': 'move', 'from': '/b/3', 'path': '/a/moved'},
+        {'op': 'replace', 'path': '/c', 'value': 'changed'},
+        {'op': 'test', 'path': '/c', 'value': 'nope'},
+    ]
+    with pytest.raises(PatchError) as info:
+        apply_patch(root, patch)
+    assert info.value.index == 4
+    assert str(info.value).startswith('Patch operation 4 (test /c)')
+    assert dumps(root) == dumps(_parse(text))
+    assert root.evaluate_cached() == before
+
+def test_undo_log_spans_several_patches():
+    root = _parse('{"n": 1, "tags": ["a"]}')
+    undo = UndoLog()
+    apply_patch(root, '[{"op": "replace", "path": "/n", "value": 2}]', undo)
+    apply_merge_patch(root, {'tags': None, 'extra': {'deep': None, 'kept': True}}, undo)
+    assert root.evaluate() == {'n': 2, 'extra': {'kept': True}}
+    undo.rollback()
+    assert root.evaluate() == {'n': 1.0, 'tags': ['a']}
+    assert len(undo) == 0
+
+def test_only_touched_paths_lose_their_cache():
+    root = _parse('{"left": {"items": [1, 2]}, "right": {"items": [3, 4]}}')
+    cached = root.evaluate_cached()
+    left, right = root.pairs['left'], root.pairs['right']
+    untouched = right.evaluate_cached()
+    apply_patch(root, [{'op': 'add', 'path': '/left/items/-', 'value': 5}])
+    assert right.evaluate_cached() is untouched
+    assert left.evaluate_cached() == {'items': [1, 2, 5]}
+    value = root.evaluate_cached()
+    assert value is not cached and value['right'] is untouched
+
+@pytest.mark.parametrize('target, patch, expected', [
+    ({'a': 'b'}, {'a': 'c'}, {'a': 'c'}),
+    ({'a': 'b'}, {'b': 'c'}, {'a': 'b', 'b': 'c'}),
+    ({'a': 'b'}, {'a': None}, {}),
+    ({'a': 'b', 'b': 'c'}, {'a': None}, {'b': 'c'}),
+    ({'a': ['b']}, {'a': 'c'}, {'a': 'c'}),
+    ({'a': 'c'}, {'a': ['b']}, {'a': ['b']}),
+    ({'a': {'b': 'c'}}, {'a': {'b': 'd', 'c': None}}, {'a': {'b': 'd'}}),
+    ({'a': [{'b': 'c'}]}, {'a': [1]}, {'a': [1]}),
+    (['a', 'b'], ['c', 'd'], ['c', 'd']),
+    ({'a': 'b'}, ['c'], ['c']),
+    ({'a': 'foo'}, None, None),
+    ({'a': 'foo'}, 'bar', 'bar'),
+    ({'e': None}, {'a': 1}, {'e': None, 'a': 1}),
+    ([1, 2], {'a': 'b', 'c': None}, {'a': 'b'}),
+    ({}, {'a': {'bb': {'ccc': None}}}, {'a': {'bb': {}}}),
+])
+def test_rfc7386_examples(target, patch, expected):
+    root = _parse(dumps(target))
+    assert apply_merge_patch(root, patch).evaluate() == expected
+
+def test_parse_pointer():
+    assert parse_pointer('') == []
+    assert parse_pointer('/a~1b/~01/') == ['a/b', '~1', '']
+    with pytest.raises(PatchError):
+        parse_pointer('a/b')
+
+def test_added_numbers_match_parsed_ones():
+    root = apply_patch(_parse('{"a": 2}'), [{'op': 'add', 'path': '/c', 'value': 5}])
+    assert type(root.pairs['c'].value) is type(root.pairs['a'].value) is float
+    assert dumps(root) == dumps(_parse('{"a": 2, "c": 5}'))
+    with pytest.raises(PatchError):
+        apply_patch(root, [{'op': 'add', 'path': '/d', 'value': 10 ** 400}])
@@ -0,0 +1,105 @@
+import io
+import pytest
+from src.lexer import LexerError
+from src.schema import SchemaError, SchemaParser, compile_schema, format_path, parse_with_schema
+
+SCHEMA = {
+    'type': 'object',
+    'required': ['name', 'ports'],
+    'properties': {
+        'name': {'type': 'string', 'minLength': 1, 'maxLength': 8},
+        'ports': {'type': 'array', 'items': {'type': 'integer'}, 'minItems': 1, 'maxItems': 3},
+        'mode': {'enum': ['fast', 1, None, {'custom': True}]},
+        'owner': {'type': ['string', 'null']},
+    },
+}
+
+def test_valid_document_is_parsed():
+    root = parse_with_schema('{"name": "web", "ports": [80, 443], "mode": {"custom": true}, "owner": null}', SCHEMA)
+    assert root.evaluate() == {'name': 'web', 'ports': [80, 443], 'mode': {'custom': True}, 'owner': None}
+    assert root.pairs['ports'].elements[1].start == 30
+
+@pytest.mark.parametrize('text, path, message', [
+    ('[]', (), 'expected object, got array'),
+    ('{"name": "", "ports": [1]}', ('name',), 'string shorter than 1'),
+    ('{"name": "much too long", "ports": [1]}', ('name',), 'string longer than 8'),
+    ('{"name": "a", "ports": [1, 2.5]}', ('ports', 1), 'expected integer, got number'),
+    ('{"name": "a", "ports": []}', ('ports',), 'fewer than 1 items'),
+    ('{"name": "a", "ports": [1, 2, 3, 4]}', ('ports',), 'more than 3 items'),
+    ('{"name": "a", "ports": [1], "mode": true}', ('mode',), 'not one of the enum values'),
+    ('{"name": "a", "ports": [1], "owner": 5}', ('owner',), 'expected null or string, got number'),
+    ('{"name": "a"}', (), "missing required property 'ports'"),
+])
+def test_violations_report_path_and_position(text, path, message):
+    with pytest.raises(SchemaError, match=message) as info:
+        parse_with_schema(text, SCHEMA)
+    assert info.value.path == path
+    assert info.value.line == 1 and info.value.column > 0
+
+def test_rejects_without_reading_the_rest():
+    text = '{"name": 5, "ports": [' + ', '.join(['1'] * 100000) + ']}'
+    stream = io.StringIO(text)
+    with pytest.raises(SchemaError):
+        parse_with_schema(stream, SCHEMA, chunk_size=256)
+    assert stream.tell() <= 256
+
+def test_unknown_properties_are_skipped():
+    text = '{"name": "a", "extra": {"deep": [1, {"x": null}]}, "ports": [1], "tag": "t"}'
+    assert parse_with_schema(text, SCHEMA).evaluate() == {'name': 'a', 'ports': [1]}
+    assert parse_with_schema(text, {'type': 'object'}).evaluate()['tag'] == 't'
+    kept = parse_with_schema(text, SCHEMA, keep_unknown=True).evaluate()
+    assert kept['extra'] == {'deep': [1, {'x': None}]} and kept['tag'] == 't'
+    with pytest.raises(ValueError):
+        parse_with_schema('{"name": "a", "ports": [1], "extra": [1}', SCHEMA)
+
+@pytest.mark.parametrize('extra', [
+    '[1 2 3]',
+    '{"k" "v"}',
+    '{"k": "v" 1 : ,}',
+    '[1, , 2]',
+    '{"k": 1,}',
+])
+def test_skipped_values_are_still_checked(extra):
+    with pytest.raises(ValueError):
+        parse_with_schema('{"name": "a", "ports": [1], "extra": %s}' % extra, SCHEMA)
+
+def test_additional_properties():
+    closed = dict(SCHEMA, additionalProperties=False)
+    with pytest.raises(SchemaError, match="unexpected property 'extra'") as info:
+        parse_with_schema('{"name": "a", "ports": [1], "extra": 1}', closed)
+    assert info.value.path == ('extra',)
+    typed = {'additionalProperties': {'type': 'number'}}
+    assert parse_with_schema('{"a": 1, "b": 2}', typed).evaluate() == {'a': 1, 'b': 2}
+    with pytest.raises(SchemaError):
+        parse_with_schema('{"a": 1, "b": "2"}', typed)
+
+def test_syntax_errors_are_still_reported():
+    with pytest.raises(ValueError, match='Unexpected tokens'):
+        parse_with_schema('{"name": "a", "ports": [1]} []', SCHEMA)
+    with pytest.raises(LexerError):
+        parse_with_schema('{"name": "a", "ports": [1, @]}', SCHEMA)
+    with pytest.raises(ValueError, match='got EOF'):
+        parse_with_schema('{"name": "a", "ports": [1', SCHEMA)
+
+def test_true_and_empty_schemas_accept_anything():
+    for schema in (True, {}):
+        assert parse_with_schema('[1, {"a": "b"}]', schema).evaluate() == [1, {'a': 'b'}]
+    with pytest.raises(SchemaError):
+        parse_with_schema('{"a": 1}', {'properties': {'a': False}})
+
+def test_compiled_schemas_are_cached_by_content():
+    first = compile_schema(SCHEMA)
+    assert compile_schema({key: SCHEMA[key] for key in reversed(list(SCHEMA))}) is first
+    assert compile_schema(dict(SCHEMA, required=['name'])) is not first
+    assert SchemaParser('{}', SCHEMA).schema is first
+
+def test_unsupported_keywords_are_rejected():
+    with pytest.raises(ValueError, match='pattern'):
+        compile_schema({'type': 'string', 'pattern': '^a'})
+    with pytest.raises(ValueError, match='decimal'):
+        compile_schema({'type': 'decimal'})
+
+def test_format_path():
+    assert format_path(()) == '$'
+    assert format_path(('hosts', 1, 'name')) == '$.hosts[1].name'
+    assert format_path(('a b',)) == '$["a b"]'
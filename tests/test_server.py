@@ -0,0 +1,111 @@
+import asyncio
+import os
+import subprocess
+import sys
+import time
+import pytest
+from src.server import ParseServer, request, request_many
+
+pytestmark = pytest.mark.skipif(not hasattr(__import__('socket'), 'AF_UNIX'), reason="needs Unix sockets")
+
+def _wait_for(path, timeout=10.0):
+    deadline = time.monotonic() + timeout
+    while not os.path.exists(path):
+        if time.monotonic() > deadline:
+            raise AssertionError("server did not start")
+        time.sleep(0.05)
+
+def test_daemon_pipelines_requests_and_exits_when_idle(tmp_path):
+    socket_path = str(tmp_path / 'p.sock')
+    document = tmp_path / 'doc.json'
+    document.write_text('{"a": [1, true]}')
+    daemon = subprocess.Popen([sys.executable, '-c', 'from src import main; main()', '--serve',
+                               '--socket', socket_path, '--idle-timeout', '1', '-j', '2'])
+    try:
+        _wait_for(socket_path)
+        items = [(None, b'[1, 2]'), (str(document), b''), (None, b'[1,'), (None, b'"x"')]
+        results = list(request_many(items, socket_path, mode='minify'))
+        assert results[0] == (True, '[1,2]\n')
+        assert results[1] == (True, '{"a":[1,true]}\n')
+        assert results[2][0] is False and results[2][1]
+        assert results[3] == (True, '"x"\n')
+        assert request(b'{"b": null}', socket_path=socket_path, indent=2) == (True, '{\n  "b": null\n}\n')
+        assert daemon.wait(timeout=10) == 0
+    finally:
+        daemon.kill()
+    assert not os.path.exists(socket_path)
+
+def test_results_are_cached(tmp_path):
+    socket_path = str(tmp_path / 'p.sock')
+    server = ParseServer(socket_path, jobs=1, idle_timeout=0.5)
+
+    async def scenario():
+        task = asyncio.ensure_future(server.run())
+        loop = asyncio.get_running_loop()
+        while not os.path.exists(socket_path):
+            await asyncio.sleep(0.01)
+        for _ in range(3):
+            assert await loop.run_in_executor(None, lambda: request(b'[true]', socket_path=socket_path)) \
+                == (True, '[true]\n')
+        await task
+
+    asyncio.run(scenario())
+    assert server.requests == 3 and server.hits == 2
+
+def test_client_falls_back_without_daemon(tmp_path):
+    result = subprocess.run([sys.executable, '-c', 'from src import main; main()', '--client',
+                             '--socket', str(tmp_path / 'missing.sock'), '--minify'],
+                            input='[1, 2]', capture_output=True, text=True)
+    assert result.returncode == 0
+    assert result.stdout == '[1,2]\n'
+
+def test_client_stays_light(tmp_path):
+    socket_path = str(tmp_path / 'p.sock')
+    daemon = subprocess.Popen([sys.executable, '-c', 'from src import main; main()', '--serve',
+                               '--socket', socket_path, '--idle-timeout', '5'])
+    code = 'import sys; from src import main; main(); print(" ".join(sys.modules), file=sys.stderr)'
+    try:
+        _wait_for(socket_path)
+        result = subprocess.run([sys.executable, '-c', code, '--client', '--socket', socket_path, '--minify'],
+                                input='[1, 2]', capture_output=True, text=True)
+    finally:
+        daemon.kill()
+        daemon.wait()
+    assert result.stdout == '[1,2]\n'
+    loaded = set(result.stderr.split())
+    assert 'src.client' in loaded
+    assert not loaded & {'asyncio', 'concurrent.futures', 'multiprocessing', 'src.server'}
+
+def test_second_server_refuses_live_socket(tmp_path):
+    socket_path = str(tmp_path / 'p.sock')
+    daemon = subprocess.Popen([sys.executable, '-c', 'from src import main; main()', '--serve',
+                               '--socket', socket_path, '--idle-timeout', '5'])
+    try:
+        _wait_for(socket_path)
+        with pytest.raises(RuntimeError):
+            ParseServer(socket_path)._claim_socket()
+    finally:
+        daemon.kill()
+        daemon.wait()
+
+def test_default_socket_is_private(tmp_path, monkeypatch):
+    from src.server import _private_directory, default_socket_path
+    monkeypatch.setenv('XDG_RUNTIME_DIR', str(tmp_path))
+    assert default_socket_path() == str(tmp_path / 'jsonparse.sock')
+    monkeypatch.delenv('XDG_RUNTIME_DIR')
+    monkeypatch.setattr('tempfile.tempdir', str(tmp_path))
+    path = default_socket_path()
+    assert os.path.dirname(path) == str(tmp_path / f'jsonparse-{os.getuid()}')
+    _private_directory(os.path.dirname(path))
+    assert os.stat(os.path.dirname(path)).st_mode & 0o777 == 0o700
+    shared = tmp_path / 'shared'
+    shared.mkdir(mode=0o777)
+    os.chmod(shared, 0o777)
+    with pytest.raises(PermissionError):
+        _private_directory(str(shared))
+
+def test_client_refuses_what_is_not_its_own_socket(tmp_path):
+    impostor = tmp_path / 'p.sock'
+    impostor.write_text('')
+    with pytest.raises(PermissionError):
+        request(b'[1]', socket_path=str(impostor))
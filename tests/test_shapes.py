@@ -0,0 +1,53 @@
+import json
+import pytest
+from src.lexer import lex, LexerError
+from src.parser import Parser
+from src.ast import ObjectNode, RecordNode, StringNode
+
+def parse(text):
+    return Parser(lex(text), shapes=True).parse()
+
+def test_records_share_one_shape():
+    with open('128KB.json', encoding='utf-8') as f:
+        text = f.read()
+    ast = parse(text)
+    assert ast.evaluate() == Parser(lex(text)).parse().evaluate()
+    shapes = {id(element.shape) for element in ast.elements}
+    assert len(shapes) == 1
+    first, second = ast.elements[0], ast.elements[1]
+    assert first.shape.keys == ('name', 'language', 'id', 'bio', 'version')
+    assert second.shape.keys[0] is first.shape.keys[0]
+
+def test_mismatched_shapes_fall_back():
+    docs = [{"a": 1, "b": 2}, {"a": 1}, {"a": 1, "b": 2, "c": 3}, {"b": 1, "a": 2}, {}, {"a": {"x": [1]}}, {"a": {"x": [2], "y": None}}]
+    ast = parse(json.dumps(docs))
+    assert ast.evaluate() == docs
+    assert all(isinstance(element, RecordNode) for element in ast.elements)
+
+def test_nested_shapes_are_predicted():
+    ast = parse(json.dumps([{"user": {"id": i, "name": "n"}} for i in range(3)]))
+    outer = ast.elements[0].shape
+    assert outer.children[0] is ast.elements[2].values[0].shape
+
+def test_duplicate_keys_last_value_wins():
+    ast = parse('{"key": 1, "key": 2}')
+    assert isinstance(ast, ObjectNode) and not isinstance(ast, RecordNode)
+    assert ast.evaluate() == {"key": 2}
+
+@pytest.mark.parametrize("text", [
+    '[{"a": 1, "b": 2}, {"a": 1,}]',
+    '[{"a": 1, "b": 2}, {"a": 1 "b": 2}]',
+    '[{"a": 1}, {"a": 1, "b": 2]',
+    '[{"a": 1}, {"a" 1}]',
+])
+def test_errors_match_plain_parser(text):
+    with pytest.raises((LexerError, ValueError)):
+        parse(text)
+
+def test_records_and_mutation():
+    ast = parse('[{"name": "a", "id": 1}, {"name": "b", "id": 2}]')
+    record = ast.elements[1].evaluate_record()
+    assert record.name == "b" and record == ("b", 2)
+    ast.elements[1].pairs['name'] = StringNode("c")
+    assert ast.evaluate() == [{"name": "a", "id": 1}, {"name": "c", "id": 2}]
+    assert ast.elements[1].evaluate_record().name == "c"
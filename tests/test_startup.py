@@ -0,0 +1,47 @@
+import os
+import subprocess
+import sys
+import pytest
+
+ROOT = os.path.join(os.path.dirname(__file__), '..')
+
+def _run(*args, stdin=''):
+    return subprocess.run([sys.executable] + list(args), cwd=ROOT, input=stdin,
+                          capture_output=True, text=True, check=True)
+
+def _new_modules(statement):
+    code = f'import sys; before = set(sys.modules); {statement}; print(" ".join(set(sys.modules) - before))'
+    return set(_run('-c', code).stdout.split())
+
+def test_import_src_is_lazy():
+    loaded = _new_modules('import src')
+    assert not loaded & {'argparse', 'json', 'typing', 're', 'src.lexer', 'src.parser', 'src.ast', 'src.cli'}
+
+def test_core_modules_skip_heavy_imports():
+    loaded = _new_modules('import src.parser')
+    assert {'src.lexer', 'src.ast'} <= loaded
+    assert not loaded & {'argparse', 'json', 'typing', 're'}
+
+def test_lazy_exports():
+    output = _run('-c', 'import src; print(src.lex("[]")[0].type, src.Parser.__name__, src.main.__module__)').stdout
+    assert output.split() == ['LEFT_BRACKET', 'Parser', 'src.cli']
+    import src
+    with pytest.raises(AttributeError):
+        src.does_not_exist
+
+def test_cli_modes_load_only_what_they_need():
+    code = 'import sys; from src.cli import main; main(); print(" ".join(sys.modules), file=sys.stderr)'
+    validate = set(_run('-c', code, '--validate', stdin='[1]').stderr.split())
+    assert not validate & {'json', 'typing', 'concurrent.futures', 'src.parser', 'src.server'}
+    parse = set(_run('-c', code, stdin='[1]').stderr.split())
+    assert 'json' in parse and not parse & {'src.encoder', 'src.stream'}
+
+def test_python_m_src():
+    assert _run('-m', 'src', '--minify', stdin='[1, 2]').stdout == '[1,2]\n'
+
+def test_library_use_stays_off_the_cli_path():
+    # Wall-clock import budgets are checked by benchmarks/bench_startup.py, not here
+    loaded = _new_modules('import src; src.Parser(src.lex("[1]")).parse().evaluate()')
+    assert {'src.lexer', 'src.parser', 'src.ast'} <= loaded
+    assert not loaded & {'argparse', 'json', 'typing', 're', 'src.cli', 'src.batch', 'src.server',
+                         'concurrent.futures', 'multiprocessing'}
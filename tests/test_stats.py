@@ -0,0 +1,50 @@
+import json
+import subprocess
+import sys
+from src.lexer import lex
+from src.parser import Parser
+from src.stats import PHASES, ParseStats, collect_stats, count_nodes
+
+TEXT = '{"a": [1, "x", {"b": null}], "c": true}'
+
+def test_collect_stats_counts_tokens_and_nodes():
+    value, stats = collect_stats(TEXT)
+    assert value == {"a": [1, "x", {"b": None}], "c": True}
+    assert stats.bytes == len(TEXT)
+    assert list(stats.phases) == ['lex', 'parse', 'evaluate']
+    assert stats.tokens['STRING'] == 4 and stats.tokens['LEFT_BRACE'] == 2 and stats.tokens['EOF'] == 1
+    assert stats.nodes == {'ObjectNode': 2, 'ArrayNode': 1, 'NumberNode': 1, 'StringNode': 1,
+                           'NullNode': 1, 'BooleanNode': 1}
+    assert stats.max_depth == 4
+    assert all(phase.peak_bytes is not None and phase.peak_bytes >= 0 for phase in stats.phases.values())
+
+def test_encode_phase_and_untraced_run():
+    output, stats = collect_stats('[1, 2]', encode=json.dumps, memory=False)
+    assert output == '[1.0, 2.0]'
+    assert tuple(stats.phases) == PHASES
+    assert all(phase.peak_bytes is None for phase in stats.phases.values())
+    assert stats.wall == sum(phase.wall for phase in stats.phases.values())
+
+def test_report_formats():
+    _, stats = collect_stats(TEXT)
+    report = json.loads(stats.to_json())
+    assert set(report['phases']) == {'lex', 'parse', 'evaluate'}
+    assert report['max_depth'] == 4 and report['bytes'] == len(TEXT)
+    text = stats.format_text()
+    assert 'lex' in text and 'MB/s' in text and 'max depth: 4' in text
+    assert ParseStats().throughput == 0.0
+
+def test_count_nodes_scalar():
+    assert count_nodes(Parser(lex('"x"')).parse()) == ({'StringNode': 1}, 1)
+
+def test_cli_stats(tmp_path):
+    path = tmp_path / 'in.json'
+    path.write_text(TEXT)
+    result = subprocess.run([sys.executable, '-c', 'from src import main; main()', '--stats',
+                             '--stats-format', 'json', str(path)], capture_output=True, text=True)
+    assert result.returncode == 0
+    assert json.loads(result.stdout) == {"a": [1, "x", {"b": None}], "c": True}
+    assert set(json.loads(result.stderr)['phases']) == set(PHASES)
+    result = subprocess.run([sys.executable, '-c', 'from src import main; main()', '--stats', '--minify'],
+                            input='[]', capture_output=True, text=True)
+    assert result.returncode == 2
@@ -0,0 +1,104 @@
+import io
+import json
+import subprocess
+import sys
+import tracemalloc
+import pytest
+from src.lexer import lex, LexerError
+from src.stream import StreamLexer, TokenFormatter, iter_tokens, reformat_stream, validate_stream
+
+def token_tuples(tokens):
+    return [(t.type, t.value, t.line, t.column, t.start, t.end) for t in tokens]
+
+def feed_in_chunks(text, size):
+    lexer = StreamLexer()
+    tokens = []
+    for i in range(0, len(text), size):
+        tokens += lexer.feed(text[i:i + size])
+    return tokens + lexer.close()
+
+@pytest.mark.parametrize("size", [1, 2, 7, 4096])
+def test_chunked_tokens_match_lex(size):
+    text = '{\n  "a": [1, -2.5e+3, true, false, null],\n\t"b\\n\\u00e9": {"c": "\\"q\\""}\n}\n'
+    assert token_tuples(feed_in_chunks(text, size)) == token_tuples(lex(text))
+
+def test_surrogate_pairs_are_joined():
+    assert feed_in_chunks('"\\ud83d\\ude00"', 3)[0].value == "😀"
+
+@pytest.mark.parametrize("text", ['"unterminated', '[1, 2] @', '01', '[-]', '"bad \\x escape"', '[1.]', 'nul', '"\x01"'])
+def test_invalid_input_raises(text):
+    with pytest.raises(LexerError):
+        feed_in_chunks(text, 2)
+
+@pytest.mark.parametrize("indent", [None, 2, 4])
+def test_formatter_matches_json_dumps(indent):
+    data = {"a": [1, {"b": None, "c": []}, {}], "d": "é\"\n", "e": {"f": [[True]]}}
+    out = io.StringIO()
+    reformat_stream(io.StringIO(json.dumps(data)), out.write, indent=indent, chunk_size=5)
+    assert out.getvalue() == json.dumps(data, indent=indent)
+
+def test_number_lexemes_are_preserved():
+    out = io.StringIO()
+    reformat_stream(io.StringIO('[1.50, 1E+2, -0]'), out.write)
+    assert out.getvalue() == '[1.50, 1E+2, -0]'
+
+@pytest.mark.parametrize("text", ['[1 2]', '{"a" 1}', '{"a": 1,}', '[1,]', '[1]]', '{1: 2}', '[1', '', '[1] 2'])
+def test_formatter_rejects_invalid_structure(text):
+    with pytest.raises((ValueError, LexerError)):
+        formatter = TokenFormatter()
+        formatter.format(iter_tokens(io.StringIO(text), chunk_size=2))
+        formatter.finish()
+
+def test_memory_is_bounded_by_depth():
+    text = json.dumps([{"id": i, "name": "x" * 20} for i in range(20000)])
+    source = io.StringIO(text)
+    written = []
+    tracemalloc.start()
+    reformat_stream(source, lambda chunk: written.append(len(chunk)), chunk_size=1024)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    assert sum(written) == len(text)
+    assert peak < len(text) // 4
+
+def test_cli_stream_mode(tmp_path):
+    path = tmp_path / 'in.json'
+    path.write_text('{"a": [1, 2.0]}')
+    result = subprocess.run([sys.executable, '-c', 'from src import main; main()', '--stream', '--pretty', str(path)],
+                            capture_output=True, text=True)
+    assert result.returncode == 0
+    assert result.stdout == '{\n  "a": [\n    1,\n    2.0\n  ]\n}\n'
+    result = subprocess.run([sys.executable, '-c', 'from src import main; main()', '--stream'],
+                            input='[1, 2', capture_output=True, text=True)
+    assert result.returncode == 1 and 'Error' in result.stderr
+
+def test_raw_strings_are_copied_verbatim():
+    text = '{"k\\u00e9y" : ["\\/escaped\\n", 1.0E+2 ]}'
+    lexer = StreamLexer(raw=True)
+    tokens = lexer.feed(text) + lexer.close()
+    assert [t.value for t in tokens if t.type == 'STRING'] == ['"k\\u00e9y"', '"\\/escaped\\n"']
+    out = io.StringIO()
+    reformat_stream(io.StringIO(text), out.write, separators=(',', ':'), raw=True, chunk_size=3)
+    assert out.getvalue() == '{"k\\u00e9y":["\\/escaped\\n",1.0E+2]}'
+
+def test_validate_stream():
+    validate_stream(io.StringIO(' {"a": [1, "\\u00e9", {}]} \n'), chunk_size=4)
+    for text in ['{"a": [1, 2}', '[1] [2]', '"\\q"', '']:
+        with pytest.raises((ValueError, LexerError)):
+            validate_stream(io.StringIO(text))
+
+@pytest.mark.parametrize("args, expected", [
+    (['--validate'], ''),
+    (['--minify'], '{"a":[1.50,"\\u00e9"],"b":{}}\n'),
+    (['--reformat', '--indent', '1'], '{\n "a": [\n  1.50,\n  "\\u00e9"\n ],\n "b": {}\n}\n'),
+])
+def test_cli_token_modes(args, expected):
+    result = subprocess.run([sys.executable, '-c', 'from src import main; main()'] + args,
+                            input='{"a" : [1.50, "\\u00e9"], "b": {}}', capture_output=True, text=True)
+    assert result.returncode == 0
+    assert result.stdout == expected
+
+def test_cli_validate_failure():
+    result = subprocess.run([sys.executable, '-c', 'from src import main; main()', '--validate'],
+                            input='{"a": }', capture_output=True, text=True)
+    assert result.returncode == 1
+    assert result.stderr.startswith('Error:')
@@ -0,0 +1,118 @@
+from __future__ import annotations
+import dataclasses
+import json
+import sys
+from typing import Any, Dict, List, Literal, Optional, Tuple, Union
+import pytest
+from src.typed import _DECODERS, _building, DecodeError, decoder_for, parse_as
+
+@dataclasses.dataclass
+class Author:
+    name: str
+    language: str
+    version: float
+    tags: List[str] = dataclasses.field(default_factory=list)
+    level: Literal['junior', 'senior', 1] = 'junior'
+    mentor: Optional[Author] = None
+
+@dataclasses.dataclass
+class Point:
+    # dataclass(slots=True) needs Python 3.10
+    __slots__ = ('x', 'y')
+    x: int
+    y: int
+
+class Pixel:
+    __slots__ = ('point', 'label')
+    point: Point
+    label: Optional[str]
+
+@dataclasses.dataclass
+class Checked:
+    count: int
+
+    def __post_init__(self):
+        self.count *= 2
+
+def test_dataclasses_are_built_directly():
+    text = json.dumps([
+        {"name": "Ada", "language": "en", "version": 1, "bio": {"skipped": [1, 2, {"a": None}]}},
+        {"name": "Bo", "language": "fr", "version": 2.5, "tags": ["x"], "level": 1,
+         "mentor": {"name": "Ada", "language": "en", "version": 1.5, "level": "senior"}},
+    ])
+    first, second = parse_as(text, List[Author])
+    assert first == Author('Ada', 'en', 1.0)
+    assert second.tags == ['x'] and second.level == 1
+    assert second.mentor == Author('Ada', 'en', 1.5, level='senior')
+    assert parse_as('{"count": 2}', Checked).count == 4
+
+def test_slotted_classes():
+    pixel = parse_as('{"point": {"x": 1, "y": 2}}', Pixel)
+    assert pixel.point == Point(1, 2) and pixel.label is None
+    assert not hasattr(pixel, '__dict__')
+    assert parse_as('{"point": {"x": 1, "y": 2}, "label": "a"}', Pixel).label == 'a'
+
+def test_typing_constructs():
+    assert parse_as('{"a": [1, 2], "b": []}', Dict[str, List[int]]) == {'a': [1, 2], 'b': []}
+    assert parse_as('[1, "two", null, 3.5]', List[Union[int, str, None, float]]) == [1, 'two', None, 3.5]
+    assert parse_as('[1, 2]', Tuple[int, ...]) == (1, 2)
+    assert parse_as('{"k": [true, {"n": null}]}', Dict[str, Any]) == {'k': [True, {'n': None}]}
+    assert parse_as('1e2', int) == 100 and type(parse_as('3', float)) is float
+    assert parse_as('true', Literal[True, 'yes']) is True
+    with pytest.raises(DecodeError):
+        parse_as('true', Literal[1])
+
+@pytest.mark.parametrize('text, annotation, path, message', [
+    ('[{"name": "A", "language": "en", "version": "x"}]', List[Author], (0, 'version'), 'expected float, got string'),
+    ('{"a": {"name": "A", "language": "en"}}', Dict[str, Author], ('a',), "missing field 'version' of Author"),
+    ('{"name": "A", "language": "en", "version": 1, "mentor": {"name": "B", "language": "en", "version": 1,'
+     ' "level": "lead"}}', Author, ('mentor', 'level'), "expected 'junior' or 'senior' or 1, got 'lead'"),
+    ('{"point": {"x": 1.5, "y": 0}}', Pixel, ('point', 'x'), 'expected int, got number'),
+    ('[1, {}]', List[Union[int, str]], (1,), 'expected int or str, got object'),
+    ('[]', Point, (), 'expected Point, got array'),
+])
+def test_errors_carry_the_field_path(text, annotation, path, message):
+    with pytest.raises(DecodeError, match=message) as info:
+        parse_as(text, annotation)
+    assert info.value.path == path
+    assert str(info.value).startswith('DecodeError at $')
+
+def test_syntax_errors():
+    with pytest.raises(ValueError, match='Unexpected tokens'):
+        parse_as('{"x": 1, "y": 2} 3', Point)
+    with pytest.raises(ValueError, match='Expected COMMA'):
+        parse_as('[1 2]', List[int])
+    with pytest.raises(ValueError):
+        parse_as('{"x": 1, "y": 2, "z": [1}', Point)
+    for extra in ('[1 2 3]', '{"k" "v"}', '{"k": "v" 1 : ,}'):
+        with pytest.raises(ValueError):
+            parse_as('{"x": 1, "y": 2, "z": %s}' % extra, Point)
+
+def test_decoders_are_cached():
+    assert decoder_for(List[Author]) is decoder_for(List[Author])
+    assert decoder_for(Author) is decoder_for(Author)
+
+def test_unsupported_types():
+    with pytest.raises(TypeError):
+        parse_as('{}', Dict[int, str])
+    with pytest.raises(TypeError):
+        parse_as('1', complex)
+
+@pytest.mark.skipif(sys.version_info < (3, 10), reason='PEP 604 unions need Python 3.10')
+def test_pep604_unions():
+    assert parse_as('[1, null]', List[eval('int | None')]) == [1, None]
+    assert parse_as('null', eval('int | None')) is None
+    assert parse_as('["a", 2]', eval('list[str | int]')) == ['a', 2]
+    assert parse_as('{"point": {"x": 1, "y": 2}, "label": null}', eval('Pixel | None')).point == Point(1, 2)
+
+@dataclasses.dataclass
+class Broken:
+    children: List[Broken]
+    handle: complex
+
+def test_failed_class_is_never_published():
+    with pytest.raises(TypeError):
+        decoder_for(Broken)
+    assert Broken not in _DECODERS and List[Broken] not in _DECODERS
+    assert getattr(_building, 'decoders', None) is None
+    assert parse_as('{"name": "Ada", "language": "en", "version": 1, "mentor": null}', Author).name == 'Ada'
@@ -0,0 +1,44 @@
+import json
+import os
+import tracemalloc
+import pytest
+from benchmarks.workload import PROFILES, build, iter_workload, write_workload
+from src.lexer import lex
+from src.parser import Parser
+
+@pytest.mark.parametrize('profile', [name for name in PROFILES if name != 'ndjson'])
+def test_profiles_are_valid_and_reproducible(profile):
+    text = build(profile, 4096, seed=7)
+    assert len(text.encode('utf-8')) >= 4096
+    assert isinstance(json.loads(text), list)
+    assert build(profile, 4096, seed=7) == text
+    assert build(profile, 4096, seed=8) != text
+
+def test_size_overshoots_by_at_most_one_item():
+    pieces = list(iter_workload('records', 10000, seed=1))
+    size = sum(len(piece.encode('utf-8')) for piece in pieces)
+    largest = max(len(piece.encode('utf-8')) for piece in pieces)
+    assert 10000 <= size <= 10000 + largest
+
+def test_ndjson_lines():
+    lines = build('ndjson', 3000).splitlines()
+    assert len(lines) > 5
+    assert all(set(json.loads(line)) == {'name', 'language', 'id', 'bio', 'version'} for line in lines)
+
+def test_our_parser_reads_every_profile():
+    for profile in ('records', 'numbers', 'nested'):
+        text = build(profile, 2048, seed=3)
+        assert Parser(lex(text)).parse().evaluate() == json.loads(text, parse_int=float)
+
+def test_write_workload_streams(tmp_path):
+    path = str(tmp_path / 'big.json')
+    tracemalloc.start()
+    try:
+        size = write_workload(path, 'strings', 4 * 1024 * 1024, seed=2, buffer_size=64 * 1024)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    assert size == os.path.getsize(path) >= 4 * 1024 * 1024
+    assert peak < 1024 * 1024
+    with open(path, encoding='utf-8') as f:
+        assert f.read() == build('strings', 4 * 1024 * 1024, seed=2)